@@ -0,0 +1,351 @@
+"""Hardware-free benchmarks for the ingest, parse and render pipeline.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_pipeline                      # print results
+    python -m benchmarks.bench_pipeline -o results.json      # also save them
+    python -m benchmarks.bench_pipeline --compare old.json   # show the change per metric
+
+The Tk latency benchmark needs a display (use xvfb-run on headless machines)
+and is reported as skipped without one.
+"""
+import argparse
+import json
+import platform
+import random
+import selectors
+import subprocess
+import sys
+import threading
+import time
+
+from globalFuncionality.derived_metrics import DerivedMetrics
+from globalFuncionality.line_framer import LineFramer
+from globalFuncionality.serial_connection import SerialConnection
+from globalFuncionality.telemetry_bus import EVENT, SAMPLE, TelemetryBus
+from globalFuncionality.telemetry_fanout import FanoutClient
+
+GOOD_LINE = ("Vref: 3.30, Vout: 1.06, Average Altitude: {alt:.2f} m, Average Temperature: 24.85 C, "
+             "Average Pressure: 93425.10 Pa, Average Humidity: 19.30 %, Average Pitch: 1.34 degrees, "
+             "Average Velocity: 196.00 m/s")
+STATUS_LINE = "Airbrake Status: 1, Recovery Status: 0, Thruster Status: 1, Battery Status: 1"
+BAD_LINES = ["", "BMP280 init failed", "Vref: , Vout:", "\x00\x13garbage\xff", "Average Altitude: nan m"]
+
+
+def make_lines(count, bad_ratio, seed=1):
+    """Build a reproducible mix of telemetry, status and malformed lines."""
+    rng = random.Random(seed)
+    lines = []
+    for i in range(count):
+        r = rng.random()
+        if r < bad_ratio:
+            lines.append(rng.choice(BAD_LINES))
+        elif r < bad_ratio + (1 - bad_ratio) * 0.2:
+            lines.append(STATUS_LINE)
+        else:
+            lines.append(GOOD_LINE.format(alt=i * 0.5))
+    return lines
+
+
+def best_of(fn, repeat=5):
+    """Return the fastest of `repeat` runs of fn(), in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_framing(line_count=50000):
+    """LineFramer throughput for several read chunk sizes."""
+    data = ("\n".join(make_lines(line_count, 0.0)) + "\n").encode()
+    results = {}
+    for chunk_size in (64, 4096, 65536):
+        chunks = [data[i:i + chunk_size] for i in range(0, len(data), chunk_size)]
+
+        def run():
+            framer = LineFramer()
+            for chunk in chunks:
+                framer.feed(chunk)
+
+        results[f"lines_per_s_chunk_{chunk_size}"] = line_count / best_of(run)
+    results["mb_per_s_chunk_4096"] = len(data) / 1e6 * results["lines_per_s_chunk_4096"] / line_count
+    return results
+
+
+def bench_parse(line_count=20000):
+    """parse_serial_data and parse_lines throughput over realistic and malformed mixes."""
+    connection = SerialConnection()
+    results = {}
+    for label, bad_ratio in (("clean", 0.0), ("10pct_bad", 0.1), ("50pct_bad", 0.5)):
+        lines = make_lines(line_count, bad_ratio)
+        parse = connection.parse_serial_data
+        results[f"lines_per_s_{label}"] = line_count / best_of(lambda: [parse(line) for line in lines])
+        results[f"batch_lines_per_s_{label}"] = line_count / best_of(lambda: connection.parse_lines(lines))
+    return results
+
+
+def bench_fanout(sample_count=20000):
+    """Cost of publishing samples and draining them to N subscribers."""
+    sample = SerialConnection().parse_serial_data(GOOD_LINE.format(alt=1.0))
+    results = {}
+    for subscribers in (1, 8, 32):
+        for policy in ("queue", "latest"):
+            bus = TelemetryBus()
+            for _ in range(subscribers):
+                bus.subscribe(lambda message: None, kinds=(SAMPLE,), policy=policy, maxlen=sample_count)
+
+            def run():
+                for _ in range(sample_count):
+                    bus.publish(sample, SAMPLE)
+                bus.drain()
+
+            elapsed = best_of(run, repeat=3)
+            results[f"us_per_sample_{policy}_{subscribers}_subs"] = elapsed / sample_count * 1e6
+    return results
+
+
+def bench_derived(sample_count=50000):
+    """Per-sample cost of DerivedMetrics, alone and as part of publishing a sample."""
+    sample = SerialConnection().parse_serial_data(GOOD_LINE.format(alt=1.0))
+    samples = [dict(sample, **{"Avg Altitude": i * 0.5}) for i in range(sample_count)]
+    results = {}
+
+    def run():
+        engine = DerivedMetrics()
+        for i, s in enumerate(samples):
+            engine.update(s, i * 0.01)
+
+    results["us_per_sample"] = best_of(run, repeat=3) / sample_count * 1e6
+    for enabled in (False, True):
+        def publish():
+            connection = SerialConnection(derived_metrics=enabled)
+            for i, s in enumerate(samples):
+                connection._publish_sample(s, i * 0.01)
+
+        label = "with" if enabled else "without"
+        results[f"publish_us_per_sample_{label}_derived"] = best_of(publish, repeat=3) / sample_count * 1e6
+    return results
+
+
+class LoopbackSerial:
+    """In-memory serial-like object: bytes pushed by the benchmark are read by the reader thread."""
+
+    def __init__(self, timeout=0.1):
+        self.timeout = timeout
+        self.is_open = True
+        self.buffer = bytearray()
+        self.condition = threading.Condition()
+
+    def push(self, data):
+        with self.condition:
+            self.buffer += data
+            self.condition.notify()
+
+    @property
+    def in_waiting(self):
+        return len(self.buffer)
+
+    def read(self, size=1):
+        with self.condition:
+            if not self.buffer:
+                self.condition.wait(self.timeout)
+            data = bytes(self.buffer[:size])
+            del self.buffer[:size]
+            return data
+
+    def write(self, data):
+        return len(data)
+
+    def close(self):
+        self.is_open = False
+
+
+def bench_events(flights=20, frame_ms=33):
+    """Latency from the byte completing a launch to the event handler, draining once per UI frame."""
+    byte_to_decided = []
+    byte_to_handled = []
+    for _ in range(flights):
+        connection = SerialConnection(derived_metrics=False)
+        source = LoopbackSerial()
+        handled = []
+        connection.bus.subscribe(lambda event: handled.append(time.monotonic()), kinds=(EVENT,))
+        decided = []
+        connection.bus.subscribe(lambda event: decided.append(event.decided), kinds=(EVENT,), immediate=True)
+        connection.open_source(source, "benchmark loopback")
+        source.push(b"Thruster Status: 0\nThruster Status: 0\nThruster Status: 1\n")
+        time.sleep(0.05)
+        connection.bus.drain()
+        frame = frame_ms / 1000
+        tick = time.monotonic()  # Last UI frame; the next ones follow every frame_ms
+        # The launch is decided by the second consecutive "on" status line,
+        # arriving at a random point of the frame.
+        time.sleep(random.random() * frame)
+        pushed = time.monotonic()
+        source.push(b"Thruster Status: 1\n")
+        while not handled:
+            tick += frame
+            time.sleep(max(0.0, tick - time.monotonic()))
+            connection.bus.drain()
+        byte_to_decided.append((decided[0] - pushed) * 1000)
+        byte_to_handled.append((handled[0] - pushed) * 1000)
+        connection.stop()
+    byte_to_handled.sort()
+    return {
+        "detect_median_ms": sorted(byte_to_decided)[len(byte_to_decided) // 2],
+        "handled_median_ms": byte_to_handled[len(byte_to_handled) // 2],
+        "handled_max_ms": byte_to_handled[-1],
+        "frame_ms": frame_ms,
+    }
+
+
+def bench_network(rate=500, seconds=2):
+    """Localhost fan-out: publish cost and per-client lag from publishing to decoding, at `rate` samples/s."""
+    sample = SerialConnection().parse_serial_data(GOOD_LINE.format(alt=1.0))
+    count = rate * seconds
+    results = {}
+    for client_count in (1, 8, 32):
+        connection = SerialConnection(derived_metrics=False, detect_events=False)
+        fanout = connection.start_fanout(port=0)
+        clients = [FanoutClient(*fanout.address) for _ in range(client_count)]
+        selector = selectors.DefaultSelector()
+        for client in clients:
+            selector.register(client.sock, selectors.EVENT_READ, client)
+        lags = []
+        received = [0]
+
+        def read():
+            while received[0] < count * client_count:
+                events = selector.select(2)
+                if not events:
+                    break
+                for key, _ in events:
+                    for message in key.data.decoder.feed(key.fileobj.recv(1 << 20)):
+                        if message.kind == "sample":
+                            received[0] += 1
+                            lags.append((time.time() - message.sent) * 1000)
+
+        reader = threading.Thread(target=read)
+        reader.start()
+        time.sleep(0.1)
+        start = time.monotonic()
+        cost = 0.0
+        for i in range(count):
+            time.sleep(max(0.0, start + i / rate - time.monotonic()))
+            before = time.perf_counter()
+            connection._publish_sample(sample, time.monotonic())
+            cost += time.perf_counter() - before
+        reader.join()
+        connection.stop()
+        for client in clients:
+            client.close()
+        lags.sort()
+        results[f"publish_us_{client_count}_clients"] = cost / count * 1e6
+        results[f"lag_median_ms_{client_count}_clients"] = lags[len(lags) // 2] if lags else None
+        results[f"lag_p99_ms_{client_count}_clients"] = lags[int(len(lags) * 0.99)] if lags else None
+        results[f"lost_{client_count}_clients"] = count * client_count - received[0]
+    return results
+
+
+def bench_ui_latency(samples=50):
+    """Latency from bytes arriving to the DashTab1/DashTab2 label showing the value (needs Tk)."""
+    import tkinter
+    try:
+        root = tkinter.Tk()
+    except tkinter.TclError as e:
+        return {"skipped": f"no display: {e}"}
+    root.withdraw()
+    from dashwindow.tab_manager import TabManager
+
+    connection = SerialConnection()
+    source = LoopbackSerial()
+    connection.open_source(source, "benchmark loopback")
+    manager = TabManager(root, serial_connection=connection)
+    manager.pack(expand=True, fill="both")
+    results = {}
+    for index in (0, 1):
+        manager.switch_tab(index)
+        root.update()  # Builds the tab on first selection
+        tab = manager.dashtab1 if index == 0 else manager.dashtab2
+        label = tab.data_labels["Avg Altitude"]
+        latencies = []
+        for i in range(samples):
+            altitude = 1000.0 + index * samples + i
+            expected = f"Avg Altitude: {altitude}"
+            start = time.perf_counter()
+            source.push((GOOD_LINE.format(alt=altitude) + "\n").encode())
+            while label.cget("text") != expected:
+                root.update()
+                if time.perf_counter() - start > 2:
+                    break
+            latencies.append((time.perf_counter() - start) * 1000)
+        latencies.sort()
+        name = type(tab).__name__
+        results[f"{name}_median_ms"] = latencies[len(latencies) // 2]
+        results[f"{name}_p95_ms"] = latencies[int(len(latencies) * 0.95) - 1]
+        results[f"{name}_max_ms"] = latencies[-1]
+    manager.serial_connection.stop()
+    root.destroy()
+    return results
+
+
+BENCHMARKS = {
+    "framing": bench_framing,
+    "parse": bench_parse,
+    "fanout": bench_fanout,
+    "derived": bench_derived,
+    "events": bench_events,
+    "network": bench_network,
+    "ui_latency": bench_ui_latency,
+}
+
+
+def git_commit():
+    """Return the current commit hash, or None outside a git checkout."""
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(old, new):
+    """Print every metric present in both result sets with its relative change."""
+    for group, metrics in new["results"].items():
+        for name, value in metrics.items():
+            before = old.get("results", {}).get(group, {}).get(name)
+            if isinstance(value, (int, float)) and isinstance(before, (int, float)) and before:
+                print(f"{group}.{name}: {before:.4g} -> {value:.4g} ({(value - before) / before:+.1%})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-o", "--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", metavar="JSON", help="previous results to compare against")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="run only these benchmarks")
+    args = parser.parse_args(argv)
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "results": {},
+    }
+    for name in args.only or BENCHMARKS:
+        print(f"running {name}...", file=sys.stderr)
+        report["results"][name] = BENCHMARKS[name]()
+        for metric, value in report["results"][name].items():
+            print(f"{name}.{metric}: {value:.4g}" if isinstance(value, float) else f"{name}.{metric}: {value}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,21 +2,37 @@ from tkinter import ttk
 import tkinter as tk
 import sv_ttk
 from dashwindow.dashboard1.mode_section import ModeSelection
+from dashwindow.tick_scheduler import TickScheduler
+import logging
+import time
+from collections import deque
 from datetime import datetime
+from globalFuncionality.flight_events import LAUNCH, RECOVERY1, RECOVERY2
+from globalFuncionality.telemetry_bus import ERROR, EVENT, STATUS
+
+log = logging.getLogger(__name__)
 
 
 class DashTab1(ttk.Frame):
     """DashTab 1 containing the Serial Console, additional controls, and timers."""
 
-    def __init__(self, parent, serial_connection):
+    def __init__(self, parent, serial_connection, scheduler=None, theme_manager=None):
         super().__init__(parent)
         self.serial_connection = serial_connection
+        self.theme_manager = theme_manager  # Switches themes without restyling every widget at once
+        # Periodic updates run on the shared scheduler (TabManager's), or a private one
+        if scheduler is None:
+            scheduler = TickScheduler(self)
+            scheduler.start()
+        self.scheduler = scheduler
         self.info_visible = False
 
-        # Initialize timer start times (None means not activated)
+        # Initialize timer start times (time.monotonic() values; None means not activated)
         self.launch_time = None
         self.recovery1_time = None
         self.recovery2_time = None
+        # Delay from the arrival of the sample that decided an event to its timer starting, in ms
+        self.event_latencies = deque(maxlen=100)
 
         # Create a top frame for title, time, and mode selection
         top_frame = ttk.Frame(self, padding=10)
@@ -29,7 +45,8 @@ class DashTab1(ttk.Frame):
         # Time label (current time)
         self.time_label = ttk.Label(top_frame, text="", font=("Arial", 12))
         self.time_label.pack(side="top", anchor="w", padx=10, pady=5)
-        self.update_time()  # Start updating the current time
+        self.update_time()
+        self.scheduler.add("clock", self.update_time, 1.0, priority=2)  # Keep the current time updated
 
         # Timer frame for additional timers below current time
         timer_frame = ttk.Frame(top_frame)
@@ -77,7 +94,8 @@ class DashTab1(ttk.Frame):
         self.data_labels = {}
 
         # Define field names (match the keys returned by your SerialConnection parse function)
-        self.fields = ["Avg Altitude", "Avg Velocity", "AirBreakSTS", "RecSTS", "BatSTS"]
+        self.fields = ["Avg Altitude", "Avg Velocity", "Vertical Speed", "Max Altitude", "AirBreakSTS", "RecSTS",
+                       "BatSTS"]
 
         # Create labels for each field using grid inside data_frame
         for i, field in enumerate(self.fields):
@@ -85,85 +103,95 @@ class DashTab1(ttk.Frame):
             label.grid(row=i, column=0, sticky="w", padx=10, pady=5)
             self.data_labels[field] = label  # Store reference
 
-        # Persistent dictionary to store the latest values for all fields
-        self.latest_data = {}
+        # Latest values come from the shared store on the serial connection;
+        # the callback only logs status (INFO) and parse error (DEBUG) messages,
+        # and is not subscribed at all when those levels are disabled.
+        kinds = tuple(kind for kind, level in ((STATUS, logging.INFO), (ERROR, logging.DEBUG))
+                      if log.isEnabledFor(level))
+        if kinds:
+            self.serial_connection.bus.subscribe(self.handle_status, kinds=kinds)
+        # Flight events start the timers below from the moment the triggering sample arrived
+        self.serial_connection.bus.subscribe(self.handle_event, kinds=(EVENT,))
 
-        # Use the passed serial_connection and set this tab's callback
-        self.serial_connection.set_callback(self.store_latest_data)
+        # Connecting is left to the connection's LinkSupervisor (started by TabManager)
 
-        # Optionally, auto-connect if not already connected
-        if not self.serial_connection.serial_connection:
-            available_ports = self.serial_connection.detect_ports()
-            if available_ports:
-                self.serial_connection.connect(available_ports[0])
-            else:
-                print("No serial ports available!")
+        # Value labels are refreshed by the shared FieldRenderer (see TabManager)
 
-        # Start periodic UI update (every 100ms)
-        self.update_ui()
-        # Start timer updates every second
+        # Update the timers every second, in the same scheduler tick as the clock
         self.update_timers()
+        self.scheduler.add("timers", self.update_timers, 1.0, priority=2)
 
     def update_time(self):
         """Update the current time label every second."""
         current_time = datetime.now().strftime("%H:%M:%S")
         self.time_label.config(text=current_time)
-        self.after(1000, self.update_time)
 
     def update_timers(self):
         """Update the elapsed time for each timer every second."""
-        now = datetime.now()
+        now = time.monotonic()
 
         # Update launch timer if started
-        if self.launch_time:
+        if self.launch_time is not None:
             elapsed = now - self.launch_time
-            self.launch_timer_label.config(text=f"Time Since Launch: {self.format_timedelta(elapsed)}")
+            self.launch_timer_label.config(text=f"Time Since Launch: {self.format_elapsed(elapsed)}")
         else:
             self.launch_timer_label.config(text="Time Since Launch: N/A")
 
         # Update recovery1 timer if started
-        if self.recovery1_time:
+        if self.recovery1_time is not None:
             elapsed = now - self.recovery1_time
-            self.recovery1_timer_label.config(text=f"Time Since Recovery 1: {self.format_timedelta(elapsed)}")
+            self.recovery1_timer_label.config(text=f"Time Since Recovery 1: {self.format_elapsed(elapsed)}")
         else:
             self.recovery1_timer_label.config(text="Time Since Recovery 1: N/A")
 
         # Update recovery2 timer if started
-        if self.recovery2_time:
+        if self.recovery2_time is not None:
             elapsed = now - self.recovery2_time
-            self.recovery2_timer_label.config(text=f"Time Since Recovery 2: {self.format_timedelta(elapsed)}")
+            self.recovery2_timer_label.config(text=f"Time Since Recovery 2: {self.format_elapsed(elapsed)}")
         else:
             self.recovery2_timer_label.config(text="Time Since Recovery 2: N/A")
 
-        self.after(1000, self.update_timers)
-
-    def format_timedelta(self, td):
-        """Format a timedelta into HH:MM:SS."""
-        total_seconds = int(td.total_seconds())
+    def format_elapsed(self, seconds):
+        """Format a number of seconds into HH:MM:SS."""
+        total_seconds = max(0, int(seconds))
         hours, remainder = divmod(total_seconds, 3600)
         minutes, seconds = divmod(remainder, 60)
         return f"{hours:02}:{minutes:02}:{seconds:02}"
 
-    # Methods to start timers; these can be called when the event occurs.
-    def start_launch_timer(self):
-        self.launch_time = datetime.now()
-
-    def start_recovery1_timer(self):
-        self.recovery1_time = datetime.now()
-
-    def start_recovery2_timer(self):
-        self.recovery2_time = datetime.now()
+    # Methods to start timers; called for detected flight events, or by hand.
+    # timestamp is a time.monotonic() value and defaults to now.
+    def start_launch_timer(self, timestamp=None):
+        self.launch_time = time.monotonic() if timestamp is None else timestamp
+
+    def start_recovery1_timer(self, timestamp=None):
+        self.recovery1_time = time.monotonic() if timestamp is None else timestamp
+
+    def start_recovery2_timer(self, timestamp=None):
+        self.recovery2_time = time.monotonic() if timestamp is None else timestamp
+
+    def handle_event(self, event):
+        """Start the timer belonging to a detected flight event."""
+        start = {LAUNCH: self.start_launch_timer, RECOVERY1: self.start_recovery1_timer,
+                 RECOVERY2: self.start_recovery2_timer}.get(event.name)
+        if start is None:
+            return
+        start(event.timestamp)
+        self.event_latencies.append((time.monotonic() - event.decided) * 1000)
+        self.update_timers()
 
     def change_theme(self, theme_name):
         """Change the application theme based on user selection."""
-        if theme_name.lower() == "light":
+        if self.theme_manager is not None:
+            self.theme_manager.apply(theme_name)
+        elif theme_name.lower() == "light":
             sv_ttk.use_light_theme()
         elif theme_name.lower() == "dark":
             sv_ttk.use_dark_theme()
 
     def quit_app(self):
         """Handle application exit by stopping the serial connection."""
-        if hasattr(self, 'serial_connection') and self.serial_connection.serial_connection:
+        # Also stops the link supervisor, multiplexer and ingest process, if any
+        if hasattr(self, 'serial_connection'):
             self.serial_connection.stop()
         self.master.quit()
 
@@ -189,23 +217,9 @@ class DashTab1(ttk.Frame):
             self.info_frame.place(relx=1.0, rely=1.0, anchor="se", x=-10, y=-10)
             self.info_visible = True
 
-    def store_latest_data(self, parsed_data):
-        """Merge new parsed data into the persistent latest_data dictionary."""
-        print(f"Received data in callback: {parsed_data}")
-        if isinstance(parsed_data, dict):
-            self.latest_data.update(parsed_data)
+    def handle_status(self, message):
+        """Log status and error messages from the serial connection."""
+        if isinstance(message, str):
+            log.info("%s", message)
         else:
-            print(parsed_data)
-
-    def update_ui(self):
-        """Periodically update the UI with the aggregated serial data."""
-        if self.latest_data:
-            self._safe_update(self.latest_data)
-        self.after(100, self.update_ui)
-
-    def _safe_update(self, parsed_data):
-        """Safely updates the UI with new serial data."""
-        print(f"Updating UI with data: {parsed_data}")
-        for field, value in parsed_data.items():
-            if field in self.data_labels:
-                self.data_labels[field].config(text=f"{field}: {value}")
+            log.debug("%s", message)
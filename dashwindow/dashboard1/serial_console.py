@@ -1,16 +1,34 @@
 import tkinter as tk
+from collections import deque
 from tkinter import ttk
 from globalFuncionality.serial_connection import SerialConnection
+from globalFuncionality.telemetry_bus import PORTS
 
 
 class SerialConsole(ttk.Frame):
     """Serial console GUI for displaying and interacting with serial data."""
 
-    def __init__(self, parent, serial_connection=None):
+    def __init__(self, parent, serial_connection=None, max_lines=2000, flush_ms=50, scheduler=None,
+                 theme_manager=None):
         super().__init__(parent)
+        # Messages are buffered and written to the Text widget once per frame;
+        # the widget keeps at most max_lines lines of scrollback.
+        self.max_lines = max_lines
+        self.flush_ms = flush_ms
+        self.pending = deque(maxlen=max_lines)  # Older unflushed messages would be trimmed anyway
+        self.dropped_messages = 0
+        self._flush_scheduled = False
+        # With a TickScheduler, flushing is one of its jobs (idle while nothing arrives)
+        self.scheduler = scheduler
+        if scheduler is not None:
+            scheduler.add("console", self._flush, flush_ms / 1000, priority=3, idle_period=0.5)
         # Use the provided serial connection or create a new one if not provided.
         self.serial_connection = serial_connection if serial_connection is not None else SerialConnection()
         self.serial_connection.set_callback(self.append_to_console)
+        # Port discovery and connecting happen on the supervisor thread; the port
+        # list arrives on the bus whenever it changes.
+        self.supervisor = self.serial_connection.supervisor or self.serial_connection.supervise(auto_connect=False)
+        self.serial_connection.bus.subscribe(self.show_ports, kinds=(PORTS,), policy="latest")
 
         # UI for port selection
         self.port_label = ttk.Label(self, text="Select Serial Port:")
@@ -36,6 +54,9 @@ class SerialConsole(ttk.Frame):
         # Console display
         self.output_text = tk.Text(self, height=15, width=50, state="disabled", wrap="word")
         self.output_text.grid(row=2, column=0, columnspan=2, padx=5, pady=10)
+        # A Text is not a ttk widget: recolor it when the theme changes
+        if theme_manager is not None:
+            theme_manager.register(theme_manager.page_of(self), self.set_colors)
 
         # Create a frame for action buttons (Clear Console, Send, etc.)
         self.action_button_frame = ttk.Frame(self)
@@ -54,12 +75,14 @@ class SerialConsole(ttk.Frame):
         self.command_entry = ttk.Entry(self)
         self.command_entry.grid(row=4, column=0, columnspan=2, padx=5, pady=5, sticky="ew")
 
-        # Refresh the list of available ports
+        # Show the ports found so far and ask for a fresh scan
+        self.show_ports(self.supervisor.ports)
         self.refresh_ports()
 
-        # Logging state
-        self.logging_enabled = False
-        self.log_file = None
+        # Logging state (the session recorder lives on the serial connection)
+        self.logging_enabled = self.serial_connection.recorder is not None
+        if self.logging_enabled:
+            self.logging_button.config(text="Stop Logging")
 
         # Make the Text widget and command entry expand to fit the space
         self.grid_columnconfigure(0, weight=1)
@@ -67,51 +90,79 @@ class SerialConsole(ttk.Frame):
         self.grid_rowconfigure(2, weight=1)
 
     def refresh_ports(self):
-        """Refresh the list of available serial ports."""
-        ports = self.serial_connection.detect_ports()
+        """Ask the supervisor to rescan the serial ports; the list is shown when it arrives."""
+        self.supervisor.refresh()
+
+    def show_ports(self, ports):
+        """Fill the port selector with the latest port list."""
+        selected = self.port_combobox.get()
         if ports:
             self.port_combobox["values"] = ports
-            self.port_combobox.current(0)
+            self.port_combobox.current(ports.index(selected) if selected in ports else 0)
         else:
             self.port_combobox["values"] = ["No ports found"]
             self.port_combobox.current(0)
 
     def connect_to_port(self):
-        """Connect to the selected serial port."""
+        """Connect to the selected serial port (in the background; status arrives on the console)."""
         selected_port = self.port_combobox.get()
-        if selected_port == "No ports found":
+        if selected_port in ("", "No ports found"):
             self.append_to_console("No serial ports available.\n")
             return
 
-        try:
-            self.serial_connection.connect(selected_port)
-            self.append_to_console(f"Connected to {selected_port}\n")
-            self.connect_button["state"] = "disabled"
-            self.disconnect_button["state"] = "normal"
-        except Exception as e:
-            self.append_to_console(f"Error: {e}")
+        self.supervisor.request_connect(selected_port)
+        self.append_to_console(f"Connecting to {selected_port}...\n")
+        self.connect_button["state"] = "disabled"
+        self.disconnect_button["state"] = "normal"
 
     def disconnect_from_port(self):
-        """Disconnect from the serial port."""
-        self.serial_connection.disconnect()
-        self.append_to_console("Disconnected.\n")
+        """Disconnect from the serial port and stop reconnecting."""
+        self.supervisor.request_disconnect()
         self.connect_button["state"] = "normal"
         self.disconnect_button["state"] = "disabled"
 
     def append_to_console(self, message):
-        """Schedule appending a message to the console in the main thread."""
-        self.after(0, self._append_text, message)
-
-    def _append_text(self, message):
-        """Append a message to the console (runs on main thread)."""
-        self.output_text.config(state="normal")
-        self.output_text.insert("end", message)  # Newline should be included by caller if needed.
-        self.output_text.see("end")
-        self.output_text.config(state="disabled")
-
-        # Log the message if logging is enabled
-        if self.logging_enabled and self.log_file:
-            self.log_file.write(message + "\n")
+        """Queue a message for the console; pending messages are flushed once per frame."""
+        if len(self.pending) == self.pending.maxlen:
+            self.dropped_messages += 1
+        self.pending.append(str(message))
+        if self.scheduler is not None:
+            self.scheduler.wake("console")
+        elif not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.after(self.flush_ms, self._flush)
+
+    def _flush(self):
+        """Write all pending messages to the console in one batch (runs on main thread).
+
+        Returns False when there was nothing to write.
+        """
+        self._flush_scheduled = False
+        if not self.pending:
+            return False
+        messages = list(self.pending)
+        self.pending.clear()
+        text = "".join(m if m.endswith("\n") else m + "\n" for m in messages)
+
+        output = self.output_text
+        # Only follow new output if the user has not scrolled up to read older lines.
+        at_bottom = output.yview()[1] >= 0.999
+        output.config(state="normal")
+        output.insert("end", text)
+        # Trim old lines in bulk once the scrollback exceeds its limit by 10%.
+        line_count = int(output.index("end-1c").split(".")[0])
+        if line_count > self.max_lines * 1.1:
+            output.delete("1.0", f"{line_count - self.max_lines + 1}.0")
+        output.config(state="disabled")
+        if at_bottom:
+            output.see("end")
+
+    def set_colors(self, palette):
+        """Recolor the console text with a ThemeManager palette."""
+        self.output_text.configure(background=palette["background"], foreground=palette["foreground"],
+                                   insertbackground=palette["foreground"],
+                                   selectbackground=palette["select_background"],
+                                   selectforeground=palette["select_foreground"])
 
     def clear_console(self):
         """Clear the console."""
@@ -119,31 +170,29 @@ class SerialConsole(ttk.Frame):
         self.output_text.delete("1.0", "end")
         self.output_text.config(state="disabled")
 
-        # Clear the log file if logging is enabled
-        if self.logging_enabled and self.log_file:
-            self.log_file.close()
-            self.log_file = open("serial_log.txt", "a")  # Reopen the log file in append mode
-
     def send_command(self):
-        """Send a command to the serial port."""
+        """Queue a command for the uplink's writer thread; "Sent"/"Acked"/"failed" arrive on the console."""
         command = self.command_entry.get().strip()
         if command:
-            try:
-                self.serial_connection.write(command)
-                self.append_to_console(f"Sent: {command}\n")
+            uplink = self.serial_connection.uplink or self.serial_connection.start_uplink()
+            if uplink.send(command) is not None:
                 self.command_entry.delete(0, "end")
-            except Exception as e:
-                self.append_to_console(f"Error sending command: {e}")
 
     def toggle_logging(self):
-        """Toggle logging state."""
+        """Toggle recording of the session to disk.
+
+        The recording (raw bytes, samples and messages) can be replayed; the
+        columnar session next to it answers time-range queries.
+        """
         if self.logging_enabled:
             self.logging_button.config(text="Start Logging")
-            if self.log_file:
-                self.log_file.close()
-            self.log_file = None
+            # The writer thread finishes the file in the background.
+            self.serial_connection.stop_recording(wait=False)
+            self.serial_connection.stop_session_store()
             self.logging_enabled = False
         else:
             self.logging_button.config(text="Stop Logging")
-            self.log_file = open("serial_log.txt", "a")  # Open the log file in append mode
+            recorder = self.serial_connection.start_recording()
+            session = self.serial_connection.start_session_store()
+            self.append_to_console(f"Recording to {recorder.directory} and {session.directory}\n")
             self.logging_enabled = True
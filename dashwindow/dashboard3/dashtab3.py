@@ -1,9 +1,37 @@
 from tkinter import ttk
+from dashwindow.dashboard3.strip_chart import WINDOW_SECONDS, StripChart
 
 
 class DashTab3(ttk.Frame):
-    """DashTab 3 with custom content."""
+    """DashTab 3 with live strip charts of the main telemetry fields."""
 
-    def __init__(self, parent):
+    def __init__(self, parent, serial_connection, window_seconds=WINDOW_SECONDS, theme_manager=None):
         super().__init__(parent)
-        ttk.Label(self, text="DashTab 3 content goes here.").pack(pady=10)
+        self.serial_connection = serial_connection
+
+        ttk.Label(self, text=f"Last {window_seconds // 60} minutes", font=("Arial", 12)).pack(
+            side="top", anchor="w", padx=10, pady=5)
+
+        # Define the charted fields (these match the keys returned by the SerialConnection parser)
+        self.fields = ["Avg Altitude", "Avg Velocity", "Avg Pressure", "Avg Pitch"]
+
+        # Create one chart per field; they share the tab height equally
+        self.charts = {}
+        for field in self.fields:
+            chart = StripChart(self, serial_connection.store, field, window_seconds=window_seconds)
+            chart.pack(side="top", fill="both", expand=True, padx=10, pady=4)
+            self.charts[field] = chart
+        # Canvases are not ttk widgets: recolor them when the theme changes (while this tab is visible)
+        if theme_manager is not None:
+            theme_manager.register(parent, self.set_colors)
+
+    def refresh(self):
+        """Redraw every chart with the points received since the last frame."""
+        for chart in self.charts.values():
+            chart.refresh()
+
+    def set_colors(self, palette):
+        """Recolor the charts with a ThemeManager palette."""
+        for chart in self.charts.values():
+            chart.set_colors(background=palette["background"], text=palette["foreground"], line=palette["line"],
+                             grid=palette["grid"])
@@ -0,0 +1,79 @@
+import time
+import tkinter as tk
+from globalFuncionality.decimation import MinMaxDecimator
+
+WINDOW_SECONDS = 1800  # Default time span of a chart
+
+
+class StripChart(tk.Canvas):
+    """Scrolling line chart of one telemetry field, drawn on a Tk Canvas.
+
+    All canvas items are created once and only moved with coords()/itemconfig()
+    on refresh. New points are pulled from the telemetry store incrementally
+    and decimated to one min/max pair per pixel column.
+    """
+
+    def __init__(self, parent, store, field, window_seconds=WINDOW_SECONDS, height=120, colors=None, **kwargs):
+        self.colors = dict(background="#1c1c1c", line="#57c8ff", text="#d0d0d0", grid="#3a3a3a")
+        self.colors.update(colors or {})
+        super().__init__(parent, height=height, background=self.colors["background"], highlightthickness=0,
+                         **kwargs)
+        self.store = store
+        self.field = field
+        self.window_seconds = window_seconds
+        self.decimator = MinMaxDecimator(window_seconds, 1)
+        self.seen = 0  # Store total for this field already folded into the decimator
+        self.margin = 4
+
+        self.grid_line = self.create_line(0, 0, 0, 0, fill=self.colors["grid"], dash=(2, 4))
+        self.line = self.create_line(0, 0, 0, 0, fill=self.colors["line"], width=1.5)
+        self.title = self.create_text(6, 4, anchor="nw", fill=self.colors["text"], text=field, font=("Arial", 10))
+        self.range_text = self.create_text(0, 4, anchor="ne", fill=self.colors["text"], text="", font=("Arial", 9))
+        self.bind("<Configure>", self._on_resize)
+
+    def _on_resize(self, event):
+        """Match the decimation to the new pixel width and rebuild it from the store."""
+        if event.width == self.decimator.columns:
+            return
+        self.decimator.resize(event.width)
+        window, self.seen = self.store.tail(self.field)
+        start = time.monotonic() - self.window_seconds
+        self.decimator.extend(point for point in window if point[0] >= start)
+        self.refresh()
+
+    def refresh(self, now=None):
+        """Fold in points that arrived since the last refresh and redraw the line."""
+        window, self.seen = self.store.tail(self.field, self.seen)
+        self.decimator.extend(window)
+        if now is None:
+            now = time.monotonic()
+        points = self.decimator.points(now)
+        value_range = self.decimator.value_range(now)
+        if len(points) < 2 or value_range is None:
+            return
+
+        width = self.winfo_width()
+        height = self.winfo_height()
+        low, high = value_range
+        span = (high - low) or 1.0
+        top = 18  # Leave room for the title
+        usable = height - top - self.margin
+        coords = []
+        for x, value in points:
+            coords.append(x * width)
+            coords.append(top + (high - value) / span * usable)
+        self.coords(self.line, *coords)
+        middle = top + usable / 2
+        self.coords(self.grid_line, 0, middle, width, middle)
+        self.coords(self.range_text, width - 6, 4)
+        latest = self.store.latest([self.field]).get(self.field)
+        self.itemconfig(self.range_text, text=f"{low:.2f} .. {high:.2f}   last {latest:.2f}")
+
+    def set_colors(self, **colors):
+        """Recolor the existing items (e.g. after a theme change)."""
+        self.colors.update(colors)
+        self.configure(background=self.colors["background"])
+        self.itemconfig(self.line, fill=self.colors["line"])
+        self.itemconfig(self.grid_line, fill=self.colors["grid"])
+        self.itemconfig(self.title, fill=self.colors["text"])
+        self.itemconfig(self.range_text, fill=self.colors["text"])
@@ -0,0 +1,105 @@
+import time
+from collections import deque
+
+
+class _Panel:
+    """Labels of one notebook tab and the values they currently show."""
+
+    __slots__ = ("tab", "labels", "fields", "rendered", "version", "views")
+
+    def __init__(self, tab, labels):
+        self.tab = tab
+        self.labels = labels
+        self.fields = list(labels)
+        self.rendered = {}  # field -> value currently displayed
+        self.version = None  # Store version this panel was last rendered from
+        self.views = []  # Extra refresh callbacks (e.g. charts) run when the panel is dirty
+
+
+class FieldRenderer:
+    """Shared render loop for the value labels of the dashboard tabs.
+
+    Each frame only the selected notebook tab is considered, nothing is done
+    while the window is minimized or the store has not changed, and only
+    labels whose value differs from what is on screen are reconfigured.
+    Frames are run by the shared TickScheduler.
+    """
+
+    def __init__(self, notebook, store, frame_ms=100):
+        self.notebook = notebook
+        self.store = store
+        self.frame_ms = frame_ms  # Target frame period (the frame budget)
+        self.panels = {}  # Notebook page widget name -> _Panel
+        self.frames = 0
+        self.skipped = 0
+        self.label_updates = 0
+        self.frame_times = deque(maxlen=100)  # Render time of recent frames, in ms
+        self.scheduler = None
+        self.metrics = None  # PipelineMetrics receiving the "ui_frame" render time
+
+    def register(self, tab, labels):
+        """Render the {field: label} mapping of a notebook tab."""
+        self.panels[str(tab)] = _Panel(tab, labels)
+
+    def register_view(self, tab, refresh):
+        """Call refresh() on frames where `tab` is visible and new data has arrived."""
+        panel = self.panels.get(str(tab))
+        if panel is None:
+            panel = self.panels[str(tab)] = _Panel(tab, {})
+        panel.views.append(refresh)
+
+    def start(self, scheduler):
+        """Render from `scheduler` every frame_ms; only every 0.5 s while nothing changes."""
+        self.scheduler = scheduler
+        scheduler.add("render", self._frame, self.frame_ms / 1000, priority=1, idle_period=0.5)
+
+    def stop(self):
+        """Stop rendering."""
+        if self.scheduler is not None:
+            self.scheduler.remove("render")
+
+    def _frame(self):
+        """Scheduler job: render one frame; returns False when there was nothing to do."""
+        start = time.perf_counter()
+        rendered = self.render()
+        if rendered:
+            elapsed = time.perf_counter() - start
+            self.frame_times.append(elapsed * 1000)
+            if self.metrics is not None:
+                self.metrics.observe("ui_frame", elapsed)
+        return rendered
+
+    def render(self):
+        """Update the visible tab if needed; returns True if any work was done."""
+        self.frames += 1
+        panel = self.panels.get(self.notebook.select())
+        if panel is None or self.notebook.winfo_toplevel().state() == "iconic":
+            self.skipped += 1
+            return False
+        version = self.store.version
+        if panel.version == version:
+            self.skipped += 1
+            return False
+        panel.version = version
+        rendered = panel.rendered
+        labels = panel.labels
+        for field, value in self.store.latest(panel.fields).items():
+            if rendered.get(field) != value:
+                labels[field].config(text=f"{field}: {value}")
+                rendered[field] = value
+                self.label_updates += 1
+        for refresh in panel.views:
+            refresh()
+        return True
+
+    def stats(self):
+        """Return frame counters and render times (ms) of recent frames."""
+        times = self.frame_times
+        return {
+            "frames": self.frames,
+            "skipped": self.skipped,
+            "label_updates": self.label_updates,
+            "last_ms": times[-1] if times else 0.0,
+            "avg_ms": sum(times) / len(times) if times else 0.0,
+            "max_ms": max(times) if times else 0.0,
+        }
@@ -1,14 +1,28 @@
+import logging
+import threading
 import tkinter as tk
 from tkinter import ttk
-from PIL import Image, ImageTk
+
+log = logging.getLogger(__name__)
 
 
 class SplashScreen:
-    def __init__(self, root):
+    """Fades in a splash while the dashboard is prepared behind it.
+
+    A background thread imports the dashboard modules and opens the serial
+    connection during the fade; the dashboard itself is built (on the Tk
+    thread) as soon as that is done, so it is ready to be shown the moment
+    the fade ends.
+    """
+
+    def __init__(self, root, dashboard_options=None, startup_timer=None, max_image_size=400):
         self.root = root
+        self.dashboard_options = dashboard_options or {}  # Passed on to TabManager
+        self.startup_timer = startup_timer
+        self.max_image_size = max_image_size  # Larger splash images are subsampled to fit
         self.splash_frame = tk.Frame(root)
         self.splash_frame.pack(fill="both", expand=True)
-        
+
         # Initialize the splash screen elements
         self.image_label = self.create_image_label("images/image.png")
         self.splash_label = self.create_splash_label("Loading...")
@@ -17,10 +31,34 @@ class SplashScreen:
         # Start the progress animation
         self.progress_bar.start(10)
 
+        self.tab_manager = None
+        self.serial_connection = None
+        self.preload_error = None
+        self.faded_in = False
+        self._mark("splash")
+        self.preload_thread = threading.Thread(target=self.preload, daemon=True)
+        self.preload_thread.start()
+        self.root.after(20, self.build_when_preloaded)
+
+    def _mark(self, phase):
+        if self.startup_timer is not None:
+            self.startup_timer.mark(phase)
+
     def create_image_label(self, image_path):
-        """Create and return an image label for the splash screen."""
-        image = Image.open(image_path)
-        photo = ImageTk.PhotoImage(image)
+        """Create and return an image label for the splash screen.
+
+        Tk reads PNG itself, so PIL is only used for formats Tk cannot load.
+        """
+        try:
+            photo = tk.PhotoImage(file=image_path)
+        except tk.TclError:
+            from PIL import Image, ImageTk
+            image = Image.open(image_path)
+            image.thumbnail((self.max_image_size, self.max_image_size))
+            photo = ImageTk.PhotoImage(image)
+        factor = -(-max(photo.width(), photo.height()) // self.max_image_size)  # Ceiling division
+        if factor > 1:
+            photo = photo.subsample(factor)
         image_label = tk.Label(self.splash_frame, image=photo)
         image_label.photo = photo  # Keep reference to avoid garbage collection
         image_label.pack(pady=20)
@@ -38,18 +76,57 @@ class SplashScreen:
         progress.pack(pady=20)
         return progress
 
+    def preload(self):
+        """Background thread: import the dashboard and start the serial connection (no Tk calls)."""
+        try:
+            from dashwindow.tab_manager import dashboard_store, open_serial_connection
+            # Imported here so the lazy tabs build without an import stall later
+            import dashwindow.dashboard2.dashtab2
+            import dashwindow.dashboard3.dashtab3
+            self._mark("imports")
+            options = self.dashboard_options
+            self.serial_connection = open_serial_connection(options.get("replay"), options.get("replay_speed", 1.0),
+                                                            options.get("links"), self.startup_timer,
+                                                            options.get("ingest_process", False),
+                                                            options.get("metrics_file"),
+                                                            options.get("metrics_interval", 5.0),
+                                                            options.get("fanout"), store=dashboard_store())
+            self._mark("serial")
+        except Exception as e:
+            self.preload_error = e
+
+    def build_when_preloaded(self):
+        """Build the (still hidden) dashboard once the preload thread is done."""
+        if self.preload_thread.is_alive():
+            self.root.after(20, self.build_when_preloaded)
+            return
+        from dashwindow.tab_manager import TabManager
+        if self.preload_error is not None or self.serial_connection is None:
+            # Fall back to opening the connection on the Tk thread
+            log.error("Background startup failed: %s", self.preload_error)
+            self.tab_manager = TabManager(self.root, startup_timer=self.startup_timer, **self.dashboard_options)
+        else:
+            self.tab_manager = TabManager(self.root, serial_connection=self.serial_connection,
+                                          startup_timer=self.startup_timer)
+        self._mark("dashboard")
+        if self.faded_in:
+            self.open_dashboard()
+
     def fade_out(self, alpha=0.0, increment=0.05, interval=50):
         """Gradually increase window opacity to fade out the splash screen."""
         if alpha < 1.0:
             self.root.wm_attributes("-alpha", alpha)
             self.root.after(interval, lambda: self.fade_out(alpha + increment, increment, interval))
         else:
-            self.open_dashboard()
+            self.faded_in = True
+            if self.tab_manager is not None:
+                self.open_dashboard()
 
     def open_dashboard(self):
-        """Transition to the main dashboard after splash screen fade-out."""
+        """Swap the splash for the dashboard that was built behind it."""
+        self.progress_bar.stop()
         self.splash_frame.pack_forget()  # Hide splash screen content
-        # Here, you would initialize the dashboard
-        from dashwindow.tab_manager import TabManager
-        self.tab_manager = TabManager(self.root)
         self.tab_manager.pack(expand=True, fill="both")
+        self._mark("shown")
+        if self.startup_timer is not None:
+            log.info("%s", self.startup_timer.report())
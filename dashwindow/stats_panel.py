@@ -0,0 +1,90 @@
+from tkinter import ttk
+
+
+def _format_count(value):
+    for unit in ("", "k", "M", "G"):
+        if abs(value) < 1000:
+            return f"{value:.0f}{unit}" if unit == "" else f"{value:.1f}{unit}"
+        value /= 1000
+    return f"{value:.1f}T"
+
+
+class StatsPanel(ttk.Frame):
+    """Live view of the pipeline metrics: throughput, stage times, bus latency and UI frame time.
+
+    refresh() takes one metrics snapshot and formats it as text; it does
+    nothing while the panel is not the visible tab.
+    """
+
+    # Pipeline stages in the order data flows through them
+    STAGES = ("parse", "record", "derive", "store", "publish", "bus_latency", "callbacks", "ui_frame")
+
+    def __init__(self, parent, serial_connection, notebook=None):
+        super().__init__(parent)
+        self.serial_connection = serial_connection
+        self.notebook = notebook  # Skip refreshes while another tab is selected
+        ttk.Label(self, text="Pipeline statistics", font=("Arial", 16)).pack(side="top", anchor="w", padx=10,
+                                                                            pady=5)
+        self.text_label = ttk.Label(self, text="", font=("Courier", 11), justify="left")
+        self.text_label.pack(side="top", anchor="nw", padx=10, pady=5)
+        buttons = ttk.Frame(self)
+        buttons.pack(side="top", anchor="w", padx=10, pady=5)
+        ttk.Button(buttons, text="Reset", command=self.reset).pack(side="left")
+
+    def visible(self):
+        if self.notebook is None:
+            return True
+        return self.notebook.select() == str(self.master)
+
+    def refresh(self):
+        """Scheduler job: redraw the statistics; returns False while hidden."""
+        if not self.visible():
+            return False
+        self.text_label.config(text=self.format(self.serial_connection.pipeline_stats()))
+        return True
+
+    def reset(self):
+        self.serial_connection.metrics.reset()
+        self.refresh()
+
+    @classmethod
+    def format(cls, snapshot):
+        """Render a PipelineMetrics snapshot as aligned text lines."""
+        counters = snapshot["counters"]
+        rates = snapshot["rates"]
+        peaks = snapshot["peaks"]
+        lines = [
+            f"{'Serial':<14}{_format_count(rates.get('bytes', 0))} B/s   "
+            f"{_format_count(rates.get('lines', 0))} lines/s   {_format_count(rates.get('samples', 0))} samples/s",
+            f"{'Totals':<14}{_format_count(counters.get('bytes', 0))} B   {counters.get('lines', 0)} lines   "
+            f"{counters.get('parse_failures', 0)} parse failures",
+            f"{'Port buffer':<14}high-water {peaks.get('port_buffer', 0)} B",
+            "",
+            f"{'Stage':<14}{'count':>10}{'avg us':>10}{'p50 us':>10}{'p99 us':>10}{'max us':>10}",
+        ]
+        stages = snapshot["stages"]
+        for name in cls.STAGES + tuple(sorted(set(stages) - set(cls.STAGES))):
+            stage = stages.get(name)
+            if stage is None:
+                continue
+            lines.append(f"{name:<14}{stage['count']:>10}{stage['avg_us']:>10.1f}{stage['p50_us']:>10}"
+                         f"{stage['p99_us']:>10}{stage['max_us']:>10.0f}")
+        sources = snapshot["sources"]
+        bus = sources.get("bus")
+        if bus is not None:
+            dropped = sum(s["dropped"] for s in bus["subscriptions"])
+            lines += ["", f"{'Bus':<14}{bus['published']} published   {dropped} dropped   "
+                          f"{bus['callback_errors']} callback errors"]
+        scheduler = sources.get("scheduler")
+        if scheduler is not None:
+            lines.append("")
+            lines.append(f"{'UI job':<14}{'runs':>10}{'avg ms':>10}{'max ms':>10}{'missed':>10}{'deferred':>10}")
+            for name, job in scheduler["jobs"].items():
+                lines.append(f"{name:<14}{job['runs']:>10}{job['avg_ms']:>10.2f}{job['max_ms']:>10.2f}"
+                             f"{job['missed']:>10}{job['deferred']:>10}")
+        uplink = sources.get("uplink")
+        if uplink is not None:
+            rtt = uplink["rtt_avg_ms"]
+            lines += ["", f"{'Uplink':<14}{uplink['sent']} sent   {uplink['acked']} acked   "
+                          f"{uplink['failed']} failed   rtt {'-' if rtt is None else f'{rtt:.0f} ms'}"]
+        return "\n".join(lines)
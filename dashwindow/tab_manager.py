@@ -1,33 +1,75 @@
 from dashwindow.dashboard1.dashtab1 import DashTab1
-from dashwindow.dashboard2.dashtab2 import DashTab2
-from dashwindow.dashboard3.dashtab3 import DashTab3
-from globalFuncionality.serial_connection import SerialConnection
+from dashwindow.dashboard3.strip_chart import WINDOW_SECONDS
+from dashwindow.field_renderer import FieldRenderer
+from dashwindow.theme_manager import ThemeManager
+from dashwindow.tick_scheduler import TickScheduler
+from globalFuncionality.serial_connection import open_serial_connection
+from globalFuncionality.telemetry_store import TelemetryStore
 from tkinter import ttk
 
+MAX_RATE_HZ = 50  # Fastest board rate at which the strip charts still get their whole window
+
+
+def dashboard_store():
+    """Return the TelemetryStore for the dashboard: a full strip-chart window at MAX_RATE_HZ.
+
+    That is 90000 points (about 1.4 MB) per field, so only the GUI uses it;
+    the library default is smaller.
+    """
+    return TelemetryStore(capacity=WINDOW_SECONDS * MAX_RATE_HZ)
+
 
 class TabManager(ttk.Frame):
-    """Manages tabs and allows switching via buttons and hotkeys."""
-    def __init__(self, parent):
+    """Manages tabs and allows switching via buttons and hotkeys.
+
+    Only the first tab is built up front; the others are empty placeholder
+    frames until they are selected for the first time.
+    """
+    def __init__(self, parent, replay=None, replay_speed=1.0, links=None, ingest_process=False,
+                 serial_connection=None, startup_timer=None, metrics_file=None, metrics_interval=5.0, fanout=None):
         super().__init__(parent)
 
         # Initialize notebook
         self.notebook = ttk.Notebook(self)
         self.notebook.pack(expand=True, fill="both")
-        # Create a centralized SerialConnection instance
-        self.serial_connection = SerialConnection(baudrate=9600, timeout=1)
-        # Optionally, auto-connect here if desired:
-        available_ports = self.serial_connection.detect_ports()
-        if available_ports:
-            self.serial_connection.connect(available_ports[0])
-        # Tabs
-        self.dashtab1 = DashTab1(self.notebook, self.serial_connection)
-        self.dashtab2 = DashTab2(self.notebook, self.serial_connection)
-        self.dashtab3 = DashTab3(self.notebook)
+        # Create a centralized SerialConnection instance (unless the splash already did)
+        if serial_connection is None:
+            serial_connection = open_serial_connection(replay, replay_speed, links, startup_timer, ingest_process,
+                                                       metrics_file, metrics_interval, fanout, store=dashboard_store())
+        self.serial_connection = serial_connection
+        # One monotonic scheduler runs every periodic UI job (bus drain, rendering, clocks)
+        self.scheduler = TickScheduler(self)
+        # Deliver reader output to subscribers on the Tk main loop, once per frame
+        self._store_version = None
+        self.scheduler.add("bus", self.drain_bus, 0.033, priority=0)
+
+        # Shared render loop: only the visible tab's changed labels are updated
+        self.renderer = FieldRenderer(self.notebook, self.serial_connection.store, frame_ms=100)
+        # UI timings go into the same metrics as the reader's
+        metrics = self.serial_connection.metrics
+        self.renderer.metrics = metrics
+        metrics.add_source("renderer", self.renderer.stats)
+        metrics.add_source("scheduler", self.scheduler.stats)
+        # Theme switches restyle the visible tab right away and the others when first shown
+        self.theme_manager = ThemeManager(self.winfo_toplevel(), self.notebook, metrics=metrics)
+        self.theme_manager.preload()
+        metrics.add_source("theme", self.theme_manager.stats)
 
-        # Add tabs to notebook
+        # Tabs
+        self.dashtab1 = DashTab1(self.notebook, self.serial_connection, self.scheduler, self.theme_manager)
+        self.dashtab2 = None
+        self.dashtab3 = None
+        self.stats_panel = None
         self.notebook.add(self.dashtab1, text="DashTab 1")
-        self.notebook.add(self.dashtab2, text="DashTab 2")
-        self.notebook.add(self.dashtab3, text="DashTab 3")
+        self.renderer.register(self.dashtab1, self.dashtab1.data_labels)
+        # Placeholder page -> function building the real tab inside it
+        self.lazy_tabs = {}
+        self.add_lazy_tab("DashTab 2", self.build_dashtab2)
+        self.add_lazy_tab("DashTab 3", self.build_dashtab3)
+        self.add_lazy_tab("Pipeline", self.build_stats_panel)
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+        self.renderer.start(self.scheduler)
+        self.scheduler.start()
 
         # Add tab switch buttons
         self.create_tab_buttons()
@@ -37,6 +79,50 @@ class TabManager(ttk.Frame):
         parent.bind("<Control-2>", lambda event: self.switch_tab(1))
         parent.bind("<Control-3>", lambda event: self.switch_tab(2))
 
+    def add_lazy_tab(self, text, build):
+        """Add a tab whose content is built by build(page) the first time it is selected."""
+        page = ttk.Frame(self.notebook)
+        self.notebook.add(page, text=text)
+        self.lazy_tabs[str(page)] = (page, build)
+
+    def on_tab_changed(self, event):
+        """Build a lazy tab the first time it becomes visible, bring it to the current theme and render it."""
+        pending = self.lazy_tabs.pop(self.notebook.select(), None)
+        if pending is not None:
+            page, build = pending
+            build(page)
+        self.theme_manager.on_page_shown()
+        self.scheduler.wake("render")
+        self.scheduler.wake("stats")
+
+    def drain_bus(self):
+        """Scheduler job: deliver bus messages, and wake the idle renderer when new data arrived."""
+        self.serial_connection.bus.drain()
+        version = self.serial_connection.store.version
+        if version != self._store_version:
+            self._store_version = version
+            self.scheduler.wake("render")
+
+    def build_dashtab2(self, page):
+        from dashwindow.dashboard2.dashtab2 import DashTab2
+        self.dashtab2 = DashTab2(page, self.serial_connection)
+        self.dashtab2.pack(expand=True, fill="both")
+        self.renderer.register(page, self.dashtab2.data_labels)
+
+    def build_dashtab3(self, page):
+        from dashwindow.dashboard3.dashtab3 import DashTab3
+        self.dashtab3 = DashTab3(page, self.serial_connection, theme_manager=self.theme_manager)
+        self.dashtab3.pack(expand=True, fill="both")
+        self.renderer.register_view(page, self.dashtab3.refresh)
+
+    def build_stats_panel(self, page):
+        from dashwindow.stats_panel import StatsPanel
+        self.stats_panel = StatsPanel(page, self.serial_connection, self.notebook)
+        self.stats_panel.pack(expand=True, fill="both")
+        # Once a second while visible; the job idles while another tab is selected
+        self.scheduler.add("stats", self.stats_panel.refresh, 1.0, priority=4, idle_period=5.0)
+        self.stats_panel.refresh()
+
     def create_tab_buttons(self):
         """Create buttons to switch tabs."""
         button_frame = ttk.Frame(self)
@@ -0,0 +1,134 @@
+import logging
+import time
+from tkinter import ttk
+import sv_ttk
+
+log = logging.getLogger(__name__)
+
+# ttk theme created by sv_ttk for each mode
+THEMES = {"light": "sun-valley-light", "dark": "sun-valley-dark"}
+
+# Colors of the classic Tk widgets (Text, Canvas, the window itself) that ttk themes do not reach
+PALETTES = {
+    "light": {"background": "#fafafa", "foreground": "#1c1c1c", "select_background": "#2f60d8",
+              "select_foreground": "#ffffff", "line": "#005fb8", "grid": "#c8c8c8"},
+    "dark": {"background": "#1c1c1c", "foreground": "#fafafa", "select_background": "#2f60d8",
+             "select_foreground": "#ffffff", "line": "#57c8ff", "grid": "#3a3a3a"},
+}
+
+
+class ThemeManager:
+    """Switches between the sv_ttk light and dark themes without restyling the whole widget tree at once.
+
+    sv_ttk.use_light_theme()/use_dark_theme() also run tk_setPalette, which
+    walks every widget of the application. Here the ttk theme is switched
+    with one `theme use` (ttk widgets restyle themselves), and classic Tk
+    widgets are recolored by the callbacks registered per notebook page:
+    right away for the visible page, and for the others only when they are
+    shown next. A classic widget without a registered callback keeps the
+    colors it was created with (new ones get the current palette through
+    the option database), so every Text or Canvas that outlives a switch
+    must be registered. Every switch is timed, including the redraw it causes.
+    """
+
+    def __init__(self, root, notebook=None, theme="dark", metrics=None):
+        self.root = root
+        self.notebook = notebook
+        self.theme = theme
+        self.metrics = metrics  # PipelineMetrics receiving "theme_switch" times
+        self.style = ttk.Style(root)
+        self.pages = {}  # Page path -> list of callbacks taking a palette
+        self.applied = {}  # Page path -> theme its callbacks last ran with
+        self.switches = 0
+        self.last_switch_ms = None
+        self.max_switch_ms = 0.0
+        self.recolored = 0  # Callbacks run by the last switch (the others are deferred)
+
+    def preload(self):
+        """Load both themes once, at startup, so that no switch pays for reading theme files."""
+        if self.style.theme_use() not in THEMES.values():
+            sv_ttk.set_theme(self.theme)  # Sources the sv_ttk Tcl code, which creates both themes
+        missing = [name for name in THEMES.values() if name not in self.style.theme_names()]
+        if missing:
+            log.warning("Themes not found after loading sv_ttk: %s", ", ".join(missing))
+        self._set_options(PALETTES[self.theme])
+
+    def palette(self, theme=None):
+        return PALETTES[theme or self.theme]
+
+    def register(self, page, callback):
+        """Have callback(palette) recolor the classic widgets of a notebook page on every theme change.
+
+        It runs now if the page is visible, otherwise the next time the page is shown.
+        """
+        key = str(page)
+        self.pages.setdefault(key, []).append(callback)
+        self.applied.pop(key, None)
+        self.on_page_shown()
+
+    def page_of(self, widget):
+        """Return the notebook page containing widget, the key to register its callback under."""
+        notebook = self.notebook
+        while notebook is not None and widget.master is not None and widget.master is not notebook:
+            widget = widget.master
+        return widget
+
+    def apply(self, theme):
+        """Switch to theme "light" or "dark"; returns the switch time in milliseconds."""
+        theme = theme.lower()
+        if theme not in THEMES:
+            raise ValueError(f"Unknown theme: {theme}")
+        start = time.perf_counter()
+        self.theme = theme
+        palette = PALETTES[theme]
+        self.style.theme_use(THEMES[theme])
+        self._set_options(palette)
+        self.root.configure(background=palette["background"])
+        self.recolored = self.on_page_shown()
+        # ttk widgets restyle and redraw from idle callbacks; count them in
+        self.root.update_idletasks()
+        seconds = time.perf_counter() - start
+        self.switches += 1
+        self.last_switch_ms = seconds * 1000
+        self.max_switch_ms = max(self.max_switch_ms, self.last_switch_ms)
+        if self.metrics is not None:
+            self.metrics.observe("theme_switch", seconds)
+        log.info("Switched to the %s theme in %.1f ms (%d pages deferred)", theme, self.last_switch_ms,
+                 sum(self.applied.get(key) != theme for key in self.pages))
+        return self.last_switch_ms
+
+    def on_page_shown(self):
+        """Recolor the visible page if the theme changed since it was last shown; returns callbacks run."""
+        if self.notebook is None:
+            keys = list(self.pages)  # No notebook: everything counts as visible
+        else:
+            keys = [self.notebook.select()]
+        ran = 0
+        palette = PALETTES[self.theme]
+        for key in keys:
+            if self.applied.get(key) == self.theme:
+                continue
+            for callback in self.pages.get(key, ()):
+                try:
+                    callback(palette)
+                except Exception as e:
+                    log.error("Theme callback %r failed: %s", callback, e)
+                ran += 1
+            self.applied[key] = self.theme
+        return ran
+
+    def _set_options(self, palette):
+        """Default colors for classic widgets created from now on (e.g. in lazily built tabs)."""
+        option_add = self.root.option_add
+        option_add("*Text.background", palette["background"])
+        option_add("*Text.foreground", palette["foreground"])
+        option_add("*Text.insertBackground", palette["foreground"])
+        option_add("*Text.selectBackground", palette["select_background"])
+        option_add("*Text.selectForeground", palette["select_foreground"])
+        option_add("*Canvas.background", palette["background"])
+
+    def stats(self):
+        """Return switch counters and times."""
+        return {"theme": self.theme, "switches": self.switches, "last_switch_ms": self.last_switch_ms,
+                "max_switch_ms": self.max_switch_ms, "recolored": self.recolored,
+                "deferred_pages": sum(self.applied.get(key) != self.theme for key in self.pages)}
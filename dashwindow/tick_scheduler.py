@@ -0,0 +1,150 @@
+import logging
+import time
+from collections import deque
+
+log = logging.getLogger(__name__)
+
+
+class TickJob:
+    """A periodic job registered with the TickScheduler, with its timing statistics."""
+
+    __slots__ = ("name", "callback", "period", "priority", "idle_period", "due", "idle", "runs", "missed",
+                 "deferred", "times", "max_ms")
+
+    def __init__(self, name, callback, period, priority, idle_period):
+        self.name = name
+        self.callback = callback
+        self.period = period  # Seconds between runs while busy
+        self.priority = priority  # Lower runs first, and is the last to be deferred
+        self.idle_period = idle_period  # Seconds between runs while idle or minimized (None: never slow down)
+        self.due = 0.0  # time.monotonic() of the next run
+        self.idle = False  # The last run reported that it had nothing to do
+        self.runs = 0
+        self.missed = 0  # Runs that started more than half a period late
+        self.deferred = 0  # Runs pushed to the next tick because the tick budget was used up
+        self.times = deque(maxlen=100)  # Execution time of recent runs, in ms
+        self.max_ms = 0.0
+
+    def current_period(self, minimized):
+        if self.idle_period is not None and (self.idle or minimized):
+            return self.idle_period
+        return self.period
+
+    def stats(self):
+        times = self.times
+        return {"period_ms": self.period * 1000, "idle": self.idle, "runs": self.runs, "missed": self.missed,
+                "deferred": self.deferred, "avg_ms": sum(times) / len(times) if times else 0.0,
+                "max_ms": self.max_ms}
+
+
+class TickScheduler:
+    """One time.monotonic()-based scheduling loop for every periodic job on the Tk main loop.
+
+    Jobs run on a fixed grid (due += period), so they do not drift; jobs
+    due at the same moment run in the same wakeup, ordered by priority. A
+    job whose callback returns False had nothing to do and is run at its
+    idle_period until it reports work again; while the window is minimized
+    every job with an idle_period uses it. When the jobs of one wakeup use
+    more than `budget_ms`, the remaining lower-priority jobs wait for the
+    next wakeup.
+    """
+
+    def __init__(self, widget, budget_ms=20):
+        self.widget = widget
+        self.budget = budget_ms / 1000
+        self.jobs = {}  # name -> TickJob
+        self.running = False
+        self.wakeups = 0
+        self._after_id = None
+        self._next_wake = None
+
+    def add(self, name, callback, period, priority=0, idle_period=None):
+        """Run callback() every `period` seconds (replacing any job of the same name); returns the TickJob."""
+        job = TickJob(name, callback, period, priority, idle_period)
+        job.due = time.monotonic() + period
+        self.jobs[name] = job
+        if self.running:
+            self._schedule()
+        return job
+
+    def remove(self, name):
+        """Stop running a job."""
+        self.jobs.pop(name, None)
+
+    def wake(self, name):
+        """Run a job at the next wakeup, e.g. because new work arrived for an idle job."""
+        job = self.jobs.get(name)
+        if job is not None and job.idle:
+            job.idle = False
+            job.due = time.monotonic()
+            if self.running:
+                self._schedule()
+
+    def start(self):
+        """Start the loop on the widget's Tk main loop."""
+        if not self.running:
+            self.running = True
+            self._schedule()
+
+    def stop(self):
+        """Stop the loop; jobs stay registered."""
+        self.running = False
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _schedule(self):
+        """(Re)arm the single Tk timer for the earliest due job."""
+        if not self.jobs:
+            return
+        wake = min(job.due for job in self.jobs.values())
+        if self._after_id is not None:
+            if self._next_wake is not None and self._next_wake <= wake:
+                return  # Already waking up early enough
+            self.widget.after_cancel(self._after_id)
+        self._next_wake = wake
+        delay_ms = max(1, int((wake - time.monotonic()) * 1000 + 0.5))
+        self._after_id = self.widget.after(delay_ms, self._tick)
+
+    def _tick(self):
+        """Tk callback: run every due job, in priority order, within the tick budget."""
+        self._after_id = None
+        self._next_wake = None
+        if not self.running:
+            return
+        self.wakeups += 1
+        start = time.monotonic()
+        try:
+            minimized = self.widget.winfo_toplevel().state() == "iconic"
+        except Exception:
+            minimized = False
+        due = sorted((job for job in self.jobs.values() if job.due <= start), key=lambda job: (job.priority, job.due))
+        for job in due:
+            now = time.monotonic()
+            if now - start > self.budget and job is not due[0]:
+                job.deferred += 1
+                job.due = now  # Run at the next wakeup
+                continue
+            if now - job.due > job.current_period(minimized) / 2:
+                job.missed += 1
+            try:
+                result = job.callback()
+            except Exception as e:
+                log.error("Scheduled job %s failed: %s", job.name, e)
+                result = None
+            finished = time.monotonic()
+            elapsed_ms = (finished - now) * 1000
+            job.times.append(elapsed_ms)
+            job.max_ms = max(job.max_ms, elapsed_ms)
+            job.runs += 1
+            job.idle = result is False
+            period = job.current_period(minimized)
+            job.due += period
+            if job.due <= finished:
+                job.due = finished + period  # Fell behind: skip the missed slots instead of bursting
+        if self.jobs:
+            self._schedule()
+
+    def stats(self):
+        """Return per-job execution times, missed deadlines and deferrals."""
+        return {"wakeups": self.wakeups, "jobs": {name: job.stats() for name, job in self.jobs.items()}}
@@ -0,0 +1,271 @@
+"""Summarize every flight in a directory of logs, using all cores.
+
+    python -m globalFuncionality.batch_analysis DIR [-o report.json] [--workers N]
+
+Reads SessionRecorder files (.hrec, .hrec.z) and text logs such as
+serial_log.txt (.txt, .log). Each file is streamed by one worker process;
+a file holds one flight per "Connected to ..." session.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from globalFuncionality.flight_events import FlightEventDetector
+from globalFuncionality.session_recorder import LINK_SAMPLE, SAMPLE, STATUS, read_records
+from globalFuncionality.telemetry_parser import FIELD_MAP, ParseError, TelemetryParser, parse_literal_sample
+
+RECORDING_SUFFIXES = (".hrec", ".hrec.z")
+TEXT_SUFFIXES = (".txt", ".log")
+# A text-log line is telemetry if it has one of the board's labels; other lines are console messages
+_TELEMETRY_RE = re.compile(r"(?:%s)\s*:" % "|".join(map(re.escape, FIELD_MAP)))
+
+
+class FlightSummary:
+    """Accumulates the summary of one flight, one sample at a time."""
+
+    def __init__(self, path, index, timed, gap_seconds):
+        self.path = path
+        self.index = index  # Session number within the file
+        self.timed = timed  # Sample times are real receive times (not synthesized from line order)
+        self.gap_seconds = gap_seconds
+        self.detector = FlightEventDetector()
+        self.samples = 0
+        self.errors = 0
+        self.first = None
+        self.last = None
+        self.apogee = None  # (time, altitude)
+        self.max_velocity = None  # (time, velocity)
+        self.gaps = 0
+        self.gap_total = 0.0
+        self.longest_gap = 0.0
+
+    def add(self, sample, timestamp):
+        if self.first is None:
+            self.first = timestamp
+        elif timestamp - self.last > self.gap_seconds:
+            gap = timestamp - self.last
+            self.gaps += 1
+            self.gap_total += gap
+            self.longest_gap = max(self.longest_gap, gap)
+        self.last = timestamp
+        self.samples += 1
+        altitude = sample.get("Avg Altitude")
+        if altitude is not None and altitude == altitude and (self.apogee is None or altitude > self.apogee[1]):
+            self.apogee = (timestamp, altitude)
+        velocity = sample.get("Avg Velocity")
+        if velocity is not None and velocity == velocity and (self.max_velocity is None
+                                                               or velocity > self.max_velocity[1]):
+            self.max_velocity = (timestamp, velocity)
+        self.detector.feed(sample, timestamp)
+
+    def result(self):
+        first = self.first or 0.0
+        lines = self.samples + self.errors
+        return {
+            "file": self.path,
+            "flight": self.index,
+            "samples": self.samples,
+            "parse_errors": self.errors,
+            "parse_error_rate": self.errors / lines if lines else 0.0,
+            "duration": (self.last - first) if self.samples else 0.0,
+            "apogee": self.apogee[1] if self.apogee else None,
+            "apogee_time": self.apogee[0] - first if self.apogee else None,
+            "max_velocity": self.max_velocity[1] if self.max_velocity else None,
+            "max_velocity_time": self.max_velocity[0] - first if self.max_velocity else None,
+            "events": {name: event.timestamp - first for name, event in self.detector.events.items()},
+            # Text logs carry no timing, so their gaps cannot be measured
+            "link_gaps": self.gaps if self.timed else None,
+            "link_gap_seconds": self.gap_total if self.timed else None,
+            "longest_gap": self.longest_gap if self.timed else None,
+        }
+
+
+def analyze_text_log(path, line_period=0.1, gap_seconds=1.0, chunk_bytes=1 << 20):
+    """Summarize the flights of a text log, reading it in chunks of about chunk_bytes."""
+    parser = TelemetryParser(FIELD_MAP)
+    parse = parser.parse
+    results = []
+    flight = None
+    clock = 0.0
+    with open(path, encoding="utf-8", errors="replace") as f:
+        while True:
+            lines = f.readlines(chunk_bytes)
+            if not lines:
+                break
+            for line in lines:
+                line = line.strip()
+                if not line:
+                    continue
+                if line.startswith("Connected to"):
+                    if flight is not None and flight.samples:
+                        results.append(flight.result())
+                    flight = None
+                    clock = 0.0
+                    continue
+                if line.startswith("{"):
+                    # Older console logs hold sample dicts ("{'Vref': 3.3, ...}"); read them as session_store does
+                    parsed = parse_literal_sample(line)
+                elif line.startswith("Invalid data received"):
+                    parsed = None  # Logged by the dashboard for a line it could not parse
+                elif _TELEMETRY_RE.search(line):
+                    parsed = parse(line)
+                else:
+                    continue  # Status messages ("Disconnected", "Sent: ARM", ...) are neither samples nor errors
+                if flight is None:
+                    flight = FlightSummary(path, len(results) + 1, False, gap_seconds)
+                if not parsed or parsed.__class__ is ParseError:
+                    flight.errors += 1
+                else:
+                    flight.add(parsed, clock)
+                    clock += line_period
+    if flight is not None and flight.samples:
+        results.append(flight.result())
+    return results
+
+
+def analyze_recording(path, gap_seconds=1.0):
+    """Summarize the flights of a SessionRecorder file (streamed record by record)."""
+    results = []
+    flight = None
+    for kind, received, payload in read_records(path):
+        if kind == STATUS:
+            if payload.startswith("Connected to"):
+                if flight is not None and flight.samples:
+                    results.append(flight.result())
+                flight = None
+            elif payload.startswith("Invalid data received") and flight is not None:
+                flight.errors += 1
+            continue
+        if kind == LINK_SAMPLE:
+            payload = payload["sample"]
+        elif kind != SAMPLE:
+            continue
+        if flight is None:
+            flight = FlightSummary(path, len(results) + 1, True, gap_seconds)
+        flight.add(payload, received)
+    if flight is not None and flight.samples:
+        results.append(flight.result())
+    return results
+
+
+def analyze_file(path, line_period=0.1, gap_seconds=1.0):
+    """Worker entry point: return (path, flight summaries, error message or None)."""
+    try:
+        if path.endswith(RECORDING_SUFFIXES):
+            return path, analyze_recording(path, gap_seconds), None
+        return path, analyze_text_log(path, line_period, gap_seconds), None
+    except Exception as e:
+        return path, [], f"{type(e).__name__}: {e}"
+
+
+def find_logs(directory):
+    """Every recording and text log under `directory`, largest first (so big files start early)."""
+    found = []
+    for folder, _, names in os.walk(directory):
+        for name in names:
+            if name.endswith(RECORDING_SUFFIXES + TEXT_SUFFIXES):
+                found.append(os.path.join(folder, name))
+    return sorted(found, key=os.path.getsize, reverse=True)
+
+
+def merge(results, errors):
+    """Combine per-flight summaries into one report."""
+    flights = sorted(results, key=lambda r: (r["file"], r["flight"]))
+    samples = sum(r["samples"] for r in flights)
+    parse_errors = sum(r["parse_errors"] for r in flights)
+    with_apogee = [r for r in flights if r["apogee"] is not None]
+    highest = max(with_apogee, key=lambda r: r["apogee"], default=None)
+    return {
+        "flights": flights,
+        "failed_files": errors,
+        "totals": {
+            "files": len({r["file"] for r in flights}) + len(errors),
+            "flights": len(flights),
+            "samples": samples,
+            "parse_errors": parse_errors,
+            "parse_error_rate": parse_errors / (samples + parse_errors) if samples + parse_errors else 0.0,
+            "highest_apogee": highest["apogee"] if highest else None,
+            "highest_apogee_flight": f"{highest['file']}#{highest['flight']}" if highest else None,
+            "launches_detected": sum("launch" in r["events"] for r in flights),
+        },
+    }
+
+
+def analyze_directory(directory, workers=None, line_period=0.1, gap_seconds=1.0, progress=None):
+    """Analyze every log under `directory` with a process pool; returns the merged report."""
+    paths = find_logs(directory)
+    results = []
+    errors = {}
+    start = time.monotonic()
+    if workers == 1:
+        outcomes = (analyze_file(path, line_period, gap_seconds) for path in paths)
+        for path, flights, error in outcomes:
+            results.extend(flights)
+            if error:
+                errors[path] = error
+            if progress:
+                progress(path, flights, error)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(analyze_file, path, line_period, gap_seconds) for path in paths]
+            for future in as_completed(futures):
+                path, flights, error = future.result()
+                results.extend(flights)
+                if error:
+                    errors[path] = error
+                if progress:
+                    progress(path, flights, error)
+    report = merge(results, errors)
+    report["totals"]["seconds"] = time.monotonic() - start
+    report["totals"]["workers"] = workers or os.cpu_count()
+    return report
+
+
+def _format(value, digits=1):
+    return "-" if value is None else f"{value:.{digits}f}"
+
+
+def print_report(report, out=sys.stdout):
+    print(f"{'flight':<40}{'samples':>9}{'err %':>7}{'apogee':>9}{'at s':>8}{'max vel':>9}{'gaps':>6}"
+          f"  events", file=out)
+    for r in report["flights"]:
+        name = f"{os.path.basename(r['file'])}#{r['flight']}"
+        events = ", ".join(f"{name} {t:.1f}s" for name, t in r["events"].items())
+        gaps = "-" if r["link_gaps"] is None else r["link_gaps"]
+        print(f"{name[:39]:<40}{r['samples']:>9}{r['parse_error_rate'] * 100:>7.2f}{_format(r['apogee']):>9}"
+              f"{_format(r['apogee_time']):>8}{_format(r['max_velocity']):>9}{gaps:>6}  {events}", file=out)
+    totals = report["totals"]
+    print(f"\n{totals['flights']} flights in {totals['files']} files, {totals['samples']} samples, "
+          f"{totals['parse_error_rate'] * 100:.2f}% parse errors; highest apogee "
+          f"{_format(totals['highest_apogee'])} ({totals['highest_apogee_flight'] or '-'}); "
+          f"{totals['seconds']:.1f} s with {totals['workers']} workers", file=out)
+    for path, error in report["failed_files"].items():
+        print(f"failed: {path}: {error}", file=out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory", help="directory searched recursively for .hrec[.z], .txt and .log files")
+    parser.add_argument("-o", "--output", help="also write the full report as JSON")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per core)")
+    parser.add_argument("--line-period", type=float, default=0.1,
+                        help="seconds between samples of text logs, which carry no timing (default: 0.1)")
+    parser.add_argument("--gap", type=float, default=1.0,
+                        help="silence in seconds counted as a link gap (default: 1)")
+    args = parser.parse_args(argv)
+
+    def progress(path, flights, error):
+        print(f"{'failed' if error else 'done'}: {path} ({len(flights)} flights)", file=sys.stderr)
+
+    report = analyze_directory(args.directory, args.workers, args.line_period, args.gap, progress)
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+import struct
+from binascii import crc_hqx
+
+# Frame on the wire: COBS(type:u8 | seq:u16 | payload | crc16:u16) followed by a 0x00 delimiter.
+# The CRC is CRC-16/CCITT-FALSE over type, seq and payload; all integers are little-endian.
+_HEADER = struct.Struct("<BH")
+_CRC = struct.Struct("<H")
+_OVERHEAD = _HEADER.size + _CRC.size
+
+
+class FrameLayout:
+    """Fixed struct layout of one binary frame type, keyed by dashboard field names."""
+
+    def __init__(self, frame_type, keys, fmt):
+        self.frame_type = frame_type
+        self.keys = tuple(keys)
+        self.struct = struct.Struct(fmt)
+        if len(self.keys) != len(self.struct.unpack(bytes(self.struct.size))):
+            raise ValueError(f"Layout {frame_type:#04x} has {len(self.keys)} keys for format {fmt!r}")
+
+
+# Full telemetry frame: the eight analogue channels as float32, the four status bytes as uint8.
+TELEMETRY_LAYOUT = FrameLayout(
+    0x01,
+    ("Vref", "Vout", "Avg Altitude", "Avg Temp", "Avg Pressure", "Avg Humidity", "Avg Pitch", "Avg Velocity",
+     "AirBreakSTS", "RecSTS", "ThrustSTS", "BatSTS"),
+    "<8f4B",
+)
+
+
+def cobs_encode(data):
+    """Consistent Overhead Byte Stuffing: return data with every 0x00 removed (no delimiter)."""
+    out = bytearray()
+    for segment in bytes(data).split(b"\x00"):
+        while len(segment) >= 0xFE:
+            out.append(0xFF)
+            out += segment[:0xFE]
+            segment = segment[0xFE:]
+        out.append(len(segment) + 1)
+        out += segment
+    return bytes(out)
+
+
+def cobs_decode(data):
+    """Reverse cobs_encode; raises ValueError on a malformed block."""
+    out = bytearray()
+    i = 0
+    n = len(data)
+    while i < n:
+        code = data[i]
+        end = i + code
+        if code == 0 or end > n:
+            raise ValueError("Malformed COBS block")
+        out += data[i + 1:end]
+        i = end
+        if code != 0xFF and i < n:
+            out.append(0)
+    return out
+
+
+def encode_frame(layout, seq, values):
+    """Build a delimited wire frame from a dict of values (used by simulators and replay)."""
+    body = _HEADER.pack(layout.frame_type, seq & 0xFFFF) + layout.struct.pack(*(values[key] for key in layout.keys))
+    return cobs_encode(body + _CRC.pack(crc_hqx(body, 0xFFFF))) + b"\x00"
+
+
+_PRINTABLE = bytes(range(0x20, 0x7F)) + b"\t\n\r"
+
+
+def detect_protocol(data):
+    """Guess the wire format from the first bytes: "binary", "text" or None if undecided."""
+    if b"\x00" in data:
+        return "binary"  # COBS frames always end in 0x00, which never appears in text telemetry
+    if b"\n" in data and not data.translate(None, _PRINTABLE):
+        return "text"
+    return None
+
+
+class BinaryFrameDecoder:
+    """Decodes delimited COBS frames and keeps link quality counters.
+
+    dropped_frames is derived from gaps in the 16-bit sequence number;
+    corrupt_frames counts frames that failed COBS, length or CRC checks.
+    """
+
+    def __init__(self, layouts=(TELEMETRY_LAYOUT,), max_frame=1024):
+        self.layouts = {layout.frame_type: layout for layout in layouts}
+        self.max_frame = max_frame
+        self.buffer = bytearray()
+        self.last_seq = None
+        self.frames = 0
+        self.dropped_frames = 0
+        self.corrupt_frames = 0
+        self.unknown_frames = 0
+
+    def feed(self, data):
+        """Append raw bytes and return the list of decoded samples (dicts)."""
+        buf = self.buffer
+        scan_from = len(buf)
+        buf += data
+        end = buf.rfind(b"\x00", scan_from)
+        if end == -1:
+            if len(buf) > self.max_frame:
+                self.corrupt_frames += 1
+                buf.clear()
+            return []
+        frames = bytes(buf[:end]).split(b"\x00")
+        del buf[:end + 1]
+        samples = []
+        for frame in frames:
+            if frame:
+                sample = self._decode(frame)
+                if sample is not None:
+                    samples.append(sample)
+        return samples
+
+    def _decode(self, frame):
+        """Decode one COBS frame (without its delimiter) into a sample dict."""
+        try:
+            body = cobs_decode(frame)
+        except ValueError:
+            self.corrupt_frames += 1
+            return None
+        if len(body) < _OVERHEAD or crc_hqx(memoryview(body)[:-2], 0xFFFF) != _CRC.unpack_from(body, len(body) - 2)[0]:
+            self.corrupt_frames += 1
+            return None
+        frame_type, seq = _HEADER.unpack_from(body)
+        self._track_sequence(seq)
+        layout = self.layouts.get(frame_type)
+        if layout is None:
+            self.unknown_frames += 1
+            return None
+        if len(body) != _OVERHEAD + layout.struct.size:
+            self.corrupt_frames += 1
+            return None
+        self.frames += 1
+        return dict(zip(layout.keys, layout.struct.unpack_from(body, _HEADER.size)))
+
+    def _track_sequence(self, seq):
+        """Count frames missing between the previous and the current sequence number."""
+        if self.last_seq is not None:
+            gap = (seq - self.last_seq - 1) & 0xFFFF
+            if gap < 0x8000:  # A huge jump backwards is a board reset, not loss
+                self.dropped_frames += gap
+        self.last_seq = seq
+
+    def reset(self):
+        """Forget partial data and the sequence position (e.g. after reconnecting)."""
+        self.buffer.clear()
+        self.last_seq = None
+
+    def stats(self):
+        """Return the link quality counters as a dict."""
+        return {
+            "frames": self.frames,
+            "dropped_frames": self.dropped_frames,
+            "corrupt_frames": self.corrupt_frames,
+            "unknown_frames": self.unknown_frames,
+        }
@@ -0,0 +1,57 @@
+"""Command-line options shared by main.py (dashboard) and headless.py (relay)."""
+
+
+def add_connection_arguments(parser):
+    """Add the data source, metrics, forwarding and logging options to an ArgumentParser."""
+    parser.add_argument("--replay", nargs="+", metavar="FILE",
+                        help="play recorded session file(s) instead of connecting to a serial port")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="replay speed multiplier; 0 replays as fast as possible (default: 1)")
+    parser.add_argument("--links", nargs="+", metavar="NAME=PORT",
+                        help="read several serial ports at once, e.g. avionics=/dev/ttyUSB0 radio=/dev/ttyUSB1")
+    parser.add_argument("--ingest-process", action="store_true",
+                        help="read and parse serial data in a separate process (not with --links)")
+    parser.add_argument("--metrics-file", metavar="FILE",
+                        help="append pipeline metrics (JSON lines) to FILE every --metrics-interval seconds")
+    parser.add_argument("--metrics-interval", type=float, default=5.0,
+                        help="seconds between metrics exports (default: 5)")
+    parser.add_argument("--serve", metavar="[HOST:]PORT",
+                        help="serve parsed telemetry to network clients over TCP (HOST defaults to 0.0.0.0)")
+    parser.add_argument("--multicast", metavar="GROUP:PORT",
+                        help="also send parsed telemetry to a UDP multicast group, e.g. 239.255.42.1:5761")
+    parser.add_argument("--log-level", default="INFO", choices=("DEBUG", "INFO", "WARNING", "ERROR"),
+                        help="messages to log; DEBUG includes every unparsable line (default: INFO)")
+
+
+def check_connection_arguments(parser, args):
+    """Validate the options added by add_connection_arguments; sets args.links and args.fanout."""
+    if args.ingest_process and args.links:
+        parser.error("--ingest-process cannot be combined with --links")
+    links = {}
+    for link in args.links or ():
+        name, sep, port = link.partition("=")
+        if not sep or not name or not port:
+            parser.error(f"--links expects NAME=PORT, got {link!r}")
+        links[name] = port
+    args.links = links
+    args.fanout = None
+    if args.serve or args.multicast:
+        args.fanout = {"port": None}
+        if args.serve:
+            host, _, port = args.serve.rpartition(":")
+            if not port.isdigit():
+                parser.error(f"--serve expects [HOST:]PORT, got {args.serve!r}")
+            args.fanout.update(host=host or "0.0.0.0", port=int(port))
+        if args.multicast:
+            group, _, port = args.multicast.rpartition(":")
+            if not group or not port.isdigit():
+                parser.error(f"--multicast expects GROUP:PORT, got {args.multicast!r}")
+            args.fanout["multicast"] = (group, int(port))
+    return args
+
+
+def connection_options(args):
+    """Keyword arguments of open_serial_connection() from parsed arguments."""
+    return {"replay": args.replay, "replay_speed": args.speed or None, "links": args.links,
+            "ingest_process": args.ingest_process, "metrics_file": args.metrics_file,
+            "metrics_interval": args.metrics_interval, "fanout": args.fanout}
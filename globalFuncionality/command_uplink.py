@@ -0,0 +1,235 @@
+import heapq
+import itertools
+import re
+import threading
+import time
+from collections import deque
+
+# Command priorities; lower is sent first
+ABORT_PRIORITY = 0
+NORMAL_PRIORITY = 1
+
+# Command states
+QUEUED = "queued"
+SENT = "sent"  # Written, waiting for its ack
+ACKED = "acked"
+DONE = "done"  # Written, no ack expected
+FAILED = "failed"
+
+
+class Command:
+    """One queued command and what happened to it."""
+
+    __slots__ = ("text", "priority", "ack", "link", "seq", "state", "attempts", "queued", "sent", "finished",
+                 "deadline", "error")
+
+    def __init__(self, text, priority, ack, link, seq):
+        self.text = text
+        self.priority = priority
+        self.ack = ack  # Compiled regex an incoming line must match, or None
+        self.link = link  # Multiplexer link name, or None for the single port
+        self.seq = seq
+        self.state = QUEUED
+        self.attempts = 0
+        self.queued = time.monotonic()
+        self.sent = None  # Time of the last write
+        self.finished = None
+        self.deadline = None  # Ack timeout of the last write
+        self.error = ""
+
+    def __lt__(self, other):
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+    def __repr__(self):
+        return f"Command({self.text!r}, {self.state!r})"
+
+
+class CommandUplink:
+    """Sends commands to the board from its own writer thread, so callers never block on the port.
+
+    send() only puts the command in a bounded priority queue. Abort-type
+    commands jump the queue and are accepted even when it is full. When a
+    command expects an ack, every line the board sends is matched against
+    it (see match_line()); without a match within ack_timeout the command
+    is written again, up to `retries` times, and then reported as failed.
+    Results are published as status messages on the connection's bus.
+    """
+
+    def __init__(self, connection, max_queue=64, ack_timeout=1.0, retries=2, expect_ack=False,
+                 ack_pattern=r"\bACK\W+{name}\b", abort_commands=("ABORT",), terminator=""):
+        self.connection = connection
+        self.max_queue = max_queue
+        self.ack_timeout = ack_timeout
+        self.retries = retries  # Extra writes of a command that was not acked
+        self.expect_ack = expect_ack  # Default for send(); ack matching needs firmware that acks
+        # Regex of the ack line; {name} is replaced by the command's first word
+        self.ack_pattern = ack_pattern
+        self.abort_commands = {name.upper() for name in abort_commands}
+        # Appended to every command on the wire; "" sends the text exactly as SerialConnection.write() does
+        self.terminator = terminator
+        self.lock = threading.Condition()
+        self.heap = []  # Commands waiting to be written
+        self.in_flight = []  # Commands written and waiting for their ack, in send order
+        self.running = False
+        self.thread = None
+        self._seq = itertools.count()
+        self.counters = {"queued": 0, "sent": 0, "acked": 0, "failed": 0, "retries": 0, "rejected": 0,
+                         "write_errors": 0}
+        self.rtt = deque(maxlen=100)  # Round-trip times of recent acked commands, in ms
+
+    def start(self):
+        """Start the writer thread."""
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="CommandUplink", daemon=True)
+        self.thread.start()
+
+    def stop(self, wait=True):
+        """Stop the writer thread; commands still queued are dropped."""
+        with self.lock:
+            self.running = False
+            self.lock.notify()
+        if wait and self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join(2)
+        self.thread = None
+
+    def send(self, text, ack=None, priority=None, link=None):
+        """Queue a command; returns the Command, or None when the queue is full.
+
+        ack: None uses expect_ack, True/False turn ack matching on/off, and a
+        string is a regex that the ack line must match. priority defaults to
+        ABORT_PRIORITY for abort_commands and NORMAL_PRIORITY otherwise.
+        link names the multiplexer link to write to.
+        """
+        text = text.strip()
+        name = text.split()[0] if text else ""
+        if priority is None:
+            priority = ABORT_PRIORITY if name.upper() in self.abort_commands else NORMAL_PRIORITY
+        if ack is None:
+            ack = self.expect_ack
+        if ack is True:
+            ack = self.ack_pattern.replace("{name}", re.escape(name))
+        pattern = re.compile(ack, re.IGNORECASE) if ack else None
+        with self.lock:
+            if len(self.heap) >= self.max_queue and priority > ABORT_PRIORITY:
+                self.counters["rejected"] += 1
+                command = None
+            else:
+                command = Command(text, priority, pattern, link, next(self._seq))
+                heapq.heappush(self.heap, command)
+                self.counters["queued"] += 1
+                self.lock.notify()
+        if command is None:
+            self.connection._invoke_callbacks(f"Command queue full, dropped: {text}")
+        return command
+
+    def match_line(self, line):
+        """Check a line from the board against the commands waiting for an ack (reader thread)."""
+        if not self.in_flight:
+            return False
+        now = time.monotonic()
+        with self.lock:
+            for command in self.in_flight:
+                if command.ack.search(line):
+                    self.in_flight.remove(command)
+                    command.state = ACKED
+                    command.finished = now
+                    self.counters["acked"] += 1
+                    rtt = (now - command.sent) * 1000
+                    self.rtt.append(rtt)
+                    break
+            else:
+                return False
+        self.connection._invoke_callbacks(f"Acked: {command.text} ({rtt:.0f} ms)")
+        return True
+
+    def _run(self):
+        """Writer thread: write queued commands in priority order and retry the unacked ones."""
+        while True:
+            with self.lock:
+                while self.running and not self.heap:
+                    timeout = None
+                    if self.in_flight:
+                        timeout = min(c.deadline for c in self.in_flight) - time.monotonic()
+                        if timeout <= 0:
+                            break
+                    self.lock.wait(timeout)
+                if not self.running:
+                    return
+                command = heapq.heappop(self.heap) if self.heap else None
+                now = time.monotonic()
+                expired = [c for c in self.in_flight if c.deadline <= now]
+                for c in expired:
+                    self.in_flight.remove(c)
+            for c in expired:
+                if c.attempts > self.retries:
+                    self._fail(c, f"no ack after {c.attempts} attempt(s)")
+                else:
+                    self.counters["retries"] += 1
+                    self._write(c)
+            if command is not None:
+                self._write(command)
+
+    def _port(self, command):
+        """Return the open serial-like object to write the command to, or None."""
+        connection = self.connection
+        if command.link is not None:
+            multiplexer = connection.multiplexer
+            link = multiplexer.links.get(command.link) if multiplexer is not None else None
+            return link.conn if link is not None else None
+        port = connection.serial_connection
+        if port is None or not port.is_open:
+            return None
+        return port
+
+    def _write(self, command):
+        """Write one attempt of a command (writer thread); the port's write_timeout bounds the wait."""
+        port = self._port(command)
+        if port is None:
+            if self.connection.ingest is not None:
+                self._fail(command, "commands cannot be sent while the ingest process reads the port")
+            else:
+                self._fail(command, "serial connection is not open")
+            return
+        command.attempts += 1
+        try:
+            port.write((command.text + self.terminator).encode("utf-8"))
+        except Exception as e:
+            self.counters["write_errors"] += 1
+            if command.attempts > self.retries:
+                self._fail(command, str(e))
+                return
+            self.counters["retries"] += 1
+            with self.lock:
+                heapq.heappush(self.heap, command)
+            return
+        command.sent = time.monotonic()
+        self.counters["sent"] += 1
+        if command.ack is None:
+            command.state = DONE
+            command.finished = command.sent
+            self.connection._invoke_callbacks(f"Sent: {command.text}")
+            return
+        command.state = SENT
+        command.deadline = command.sent + self.ack_timeout
+        with self.lock:
+            self.in_flight.append(command)
+        if command.attempts == 1:
+            self.connection._invoke_callbacks(f"Sent: {command.text} (waiting for ack)")
+
+    def _fail(self, command, reason):
+        command.state = FAILED
+        command.error = reason
+        command.finished = time.monotonic()
+        self.counters["failed"] += 1
+        self.connection._invoke_callbacks(f"Command {command.text} failed: {reason}")
+
+    def stats(self):
+        """Return the command counters, queue depth and round-trip times (ms)."""
+        rtt = self.rtt
+        with self.lock:
+            stats = dict(self.counters, pending=len(self.heap), in_flight=len(self.in_flight))
+        stats["rtt_avg_ms"] = sum(rtt) / len(rtt) if rtt else None
+        stats["rtt_max_ms"] = max(rtt) if rtt else None
+        return stats
@@ -0,0 +1,78 @@
+from collections import deque
+
+
+class MinMaxDecimator:
+    """Incremental min/max decimation of a time series to a fixed number of columns.
+
+    Time is cut into buckets of window_seconds / columns; each bucket keeps
+    only the min and max it has seen. Adding a point is O(1) and producing
+    the polyline is O(columns), so drawing cost depends on the chart width,
+    not on how many points fall inside the window.
+    """
+
+    def __init__(self, window_seconds, columns):
+        self.window_seconds = window_seconds
+        self.columns = 0
+        self.bucket_width = 1.0
+        self.buckets = deque()
+        self.resize(columns)
+
+    def resize(self, columns):
+        """Change the number of columns; drops the current buckets (re-add points afterwards)."""
+        self.columns = max(1, int(columns))
+        self.bucket_width = self.window_seconds / self.columns
+        # Bucket entries: [index, min, max, min_first]
+        self.buckets = deque(maxlen=self.columns + 1)
+
+    def add(self, timestamp, value):
+        """Fold one point into its bucket (points must arrive in time order)."""
+        if value != value:
+            return  # NaN
+        index = int(timestamp // self.bucket_width)
+        buckets = self.buckets
+        if buckets and buckets[-1][0] == index:
+            bucket = buckets[-1]
+            if value < bucket[1]:
+                bucket[1] = value
+                bucket[3] = False
+            elif value > bucket[2]:
+                bucket[2] = value
+                bucket[3] = True
+        else:
+            buckets.append([index, value, value, True])
+
+    def extend(self, points):
+        """Fold an iterable of (timestamp, value) pairs."""
+        for timestamp, value in points:
+            self.add(timestamp, value)
+
+    def points(self, now):
+        """Return [(x, value), ...] for the window ending at `now`, x in [0, 1].
+
+        Each bucket contributes its min and max in the order they occurred,
+        so spikes survive decimation.
+        """
+        first = int(now // self.bucket_width) - self.columns
+        scale = 1.0 / self.columns
+        out = []
+        for index, low, high, min_first in self.buckets:
+            if index < first:
+                continue
+            x = (index - first) * scale
+            if low == high:
+                out.append((x, low))
+            elif min_first:
+                out.append((x, low))
+                out.append((x, high))
+            else:
+                out.append((x, high))
+                out.append((x, low))
+        return out
+
+    def value_range(self, now):
+        """Return (min, max) over the buckets inside the window, or None if empty."""
+        first = int(now // self.bucket_width) - self.columns
+        visible = [b for b in self.buckets if b[0] >= first]
+        if not visible:
+            return None
+        return min(b[1] for b in visible), max(b[2] for b in visible)
@@ -0,0 +1,171 @@
+import math
+from collections import deque
+
+
+class RollingStats:
+    """Mean, min, max and standard deviation over the last `window_seconds` of one field.
+
+    Sums are updated as points enter and leave the window, and min/max use
+    monotonic deques, so every add() is amortized O(1) however many points
+    the window holds.
+    """
+
+    def __init__(self, window_seconds):
+        self.window_seconds = window_seconds
+        self.clear()
+
+    def clear(self):
+        """Empty the window."""
+        self.points = deque()  # (timestamp, value) inside the window
+        self.lows = deque()  # Increasing values; lows[0] is the minimum
+        self.highs = deque()  # Decreasing values; highs[0] is the maximum
+        # Sums of (value - shift): shifting by the first value keeps the
+        # variance of large readings (e.g. ~93000 Pa) free of cancellation.
+        self.shift = None
+        self.total = 0.0
+        self.total_squares = 0.0
+
+    def add(self, timestamp, value):
+        """Add a point and drop the ones that fell out of the window."""
+        if self.shift is None:
+            self.shift = value
+        shifted = value - self.shift
+        self.points.append((timestamp, value))
+        self.total += shifted
+        self.total_squares += shifted * shifted
+        lows = self.lows
+        while lows and lows[-1][1] > value:
+            lows.pop()
+        lows.append((timestamp, value))
+        highs = self.highs
+        while highs and highs[-1][1] < value:
+            highs.pop()
+        highs.append((timestamp, value))
+
+        start = timestamp - self.window_seconds
+        points = self.points
+        while points[0][0] < start:
+            old = points.popleft()[1] - self.shift
+            self.total -= old
+            self.total_squares -= old * old
+        while lows[0][0] < start:
+            lows.popleft()
+        while highs[0][0] < start:
+            highs.popleft()
+
+    def mean(self):
+        return self.shift + self.total / len(self.points)
+
+    def std(self):
+        """Population standard deviation of the window."""
+        count = len(self.points)
+        mean = self.total / count
+        # max() guards against tiny negative values from rounding
+        return math.sqrt(max(0.0, self.total_squares / count - mean * mean))
+
+    def low(self):
+        return self.lows[0][1]
+
+    def high(self):
+        return self.highs[0][1]
+
+
+class DerivedMetrics:
+    """Computes extra fields from the incoming samples, O(1) per sample.
+
+    update() returns a dict of derived fields to publish alongside the
+    sample:
+      "<field> Mean/Min/Max/Std"  rolling statistics of `rolling_fields`
+      "Vertical Speed"            m/s, from altitude deltas (exponentially smoothed)
+      "Vertical Accel"            m/s^2, from vertical speed deltas (smoothed)
+      "Max Altitude"              highest altitude so far
+      "Apogee"                    max altitude once the rocket has descended apogee_drop below it
+      "Pressure Rate"             Pa/s, from pressure deltas (smoothed)
+    Derived values are rounded to `digits` decimals for display.
+    """
+
+    def __init__(self, rolling_fields=("Avg Altitude", "Avg Velocity", "Avg Pressure"), window_seconds=10.0,
+                 smoothing_seconds=0.5, apogee_drop=5.0, altitude_field="Avg Altitude",
+                 pressure_field="Avg Pressure", digits=3):
+        self.window_seconds = window_seconds
+        self.smoothing_seconds = smoothing_seconds  # Time constant of the derivative smoothing
+        self.apogee_drop = apogee_drop  # Metres below the maximum that confirm the descent
+        self.altitude_field = altitude_field
+        self.pressure_field = pressure_field
+        self.digits = digits
+        # Output keys are built once: field -> (stats, mean key, min key, max key, std key)
+        self.rolling = {field: (RollingStats(window_seconds), f"{field} Mean", f"{field} Min", f"{field} Max",
+                                f"{field} Std")
+                        for field in rolling_fields}
+        self.reset()
+
+    def reset(self):
+        """Forget all history (e.g. before a new flight or replay)."""
+        for stats, *_ in self.rolling.values():
+            stats.clear()
+        self.last_altitude = None  # (timestamp, altitude)
+        self.vertical_speed = None
+        self.last_speed = None  # (timestamp, smoothed vertical speed)
+        self.vertical_accel = None
+        self.max_altitude = None
+        self.apogee = None
+        self.last_pressure = None
+        self.pressure_rate = None
+
+    def _smooth(self, previous, value, dt):
+        """Exponential smoothing with time constant smoothing_seconds, for irregular sample spacing."""
+        if previous is None:
+            return value
+        alpha = 1.0 - math.exp(-dt / self.smoothing_seconds) if self.smoothing_seconds > 0 else 1.0
+        return previous + alpha * (value - previous)
+
+    def update(self, sample, timestamp):
+        """Fold in one sample received at `timestamp`; returns the derived fields it changed."""
+        out = {}
+        digits = self.digits
+        for field, (stats, mean_key, min_key, max_key, std_key) in self.rolling.items():
+            value = sample.get(field)
+            if value is None or value != value:
+                continue  # Missing or NaN
+            stats.add(timestamp, value)
+            out[mean_key] = round(stats.mean(), digits)
+            out[min_key] = stats.low()
+            out[max_key] = stats.high()
+            out[std_key] = round(stats.std(), digits)
+
+        altitude = sample.get(self.altitude_field)
+        if altitude is not None and altitude == altitude:
+            self._update_altitude(timestamp, altitude, out)
+
+        pressure = sample.get(self.pressure_field)
+        if pressure is not None and pressure == pressure:
+            last = self.last_pressure
+            if last is not None and timestamp > last[0]:
+                dt = timestamp - last[0]
+                self.pressure_rate = self._smooth(self.pressure_rate, (pressure - last[1]) / dt, dt)
+                out["Pressure Rate"] = round(self.pressure_rate, digits)
+            self.last_pressure = (timestamp, pressure)
+        return out
+
+    def _update_altitude(self, timestamp, altitude, out):
+        digits = self.digits
+        last = self.last_altitude
+        if last is not None and timestamp > last[0]:
+            dt = timestamp - last[0]
+            self.vertical_speed = self._smooth(self.vertical_speed, (altitude - last[1]) / dt, dt)
+            out["Vertical Speed"] = round(self.vertical_speed, digits)
+            previous = self.last_speed
+            if previous is not None and timestamp > previous[0]:
+                accel_dt = timestamp - previous[0]
+                accel = (self.vertical_speed - previous[1]) / accel_dt
+                self.vertical_accel = self._smooth(self.vertical_accel, accel, accel_dt)
+                out["Vertical Accel"] = round(self.vertical_accel, digits)
+            self.last_speed = (timestamp, self.vertical_speed)
+        self.last_altitude = (timestamp, altitude)
+
+        if self.max_altitude is None or altitude > self.max_altitude:
+            self.max_altitude = altitude
+            out["Max Altitude"] = altitude
+        elif self.apogee is None and altitude <= self.max_altitude - self.apogee_drop:
+            self.apogee = self.max_altitude
+            out["Apogee"] = self.apogee
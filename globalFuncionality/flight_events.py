@@ -0,0 +1,151 @@
+import time
+
+LAUNCH = "launch"
+APOGEE = "apogee"
+RECOVERY1 = "recovery1"
+RECOVERY2 = "recovery2"
+
+# Flight phases of the detector's state machine, in order
+PAD = "pad"
+ASCENT = "ascent"
+DESCENT = "descent"
+
+
+class FlightEvent:
+    """One detected flight event.
+
+    timestamp is the monotonic receive time of the sample that triggered
+    it (the first of the debounced run; for apogee, the highest altitude
+    sample), so timers started from it do not depend on when the UI got
+    around to handling the event. decided is the receive time of the sample
+    that completed the debounce, the reference for detection latency.
+    """
+
+    __slots__ = ("name", "timestamp", "decided", "value", "reason")
+
+    def __init__(self, name, timestamp, decided=None, value=None, reason=""):
+        self.name = name
+        self.timestamp = timestamp
+        self.decided = time.monotonic() if decided is None else decided
+        self.value = value
+        self.reason = reason
+
+    def __str__(self):
+        return f"Flight event: {self.name} ({self.reason})"
+
+    def __repr__(self):
+        return f"FlightEvent({self.name!r}, {self.timestamp!r}, value={self.value!r})"
+
+
+class _Debounce:
+    """Tracks a condition that must hold for `count` consecutive samples; remembers when it started.
+
+    With edge=True only a rising edge counts: the condition must have been
+    seen false once before a run can start, so a level that is already on
+    (connecting mid-flight, a board reporting a status on the pad) never fires.
+    """
+
+    __slots__ = ("count", "armed", "run", "since")
+
+    def __init__(self, count, edge=False):
+        self.count = count
+        self.armed = not edge
+        self.run = 0
+        self.since = None
+
+    def update(self, condition, timestamp):
+        """Return True once the condition has held for `count` samples in a row."""
+        if not condition:
+            self.armed = True
+            self.run = 0
+            self.since = None
+            return False
+        if not self.armed:
+            return False
+        if self.run == 0:
+            self.since = timestamp
+        self.run += 1
+        return self.run >= self.count
+
+
+class FlightEventDetector:
+    """Streaming state machine detecting launch, apogee and the recovery deployments.
+
+    Launch: ThrustSTS switching on, or altitude more than launch_altitude
+    above the pad with velocity above launch_velocity. Apogee: altitude
+    apogee_drop below the maximum after launch. Recovery 1/2: RecSTS rising
+    to 1 and to 2 (the number of deployed stages). Status triggers fire on
+    the transition only, after the field was seen off. Every condition must hold
+    for `debounce` consecutive samples carrying the field, and the event is
+    stamped with the first of them. feed() is O(1) per sample.
+    """
+
+    def __init__(self, launch_altitude=30.0, launch_velocity=15.0, apogee_drop=5.0, debounce=3,
+                 status_debounce=2):
+        self.launch_altitude = launch_altitude  # Metres above the pad altitude
+        self.launch_velocity = launch_velocity  # m/s
+        self.apogee_drop = apogee_drop  # Metres below the maximum that confirm the descent
+        self.debounce = debounce  # Consecutive altitude/velocity samples
+        self.status_debounce = status_debounce  # Consecutive status samples (sent less often)
+        self.reset()
+
+    def reset(self):
+        """Back to the pad, e.g. before a new flight or replay."""
+        self.phase = PAD
+        self.events = {}  # name -> FlightEvent
+        self.ground_altitude = None
+        self.max_altitude = None
+        self.max_altitude_time = None
+        self._thrust = _Debounce(self.status_debounce, edge=True)
+        self._climb = _Debounce(self.debounce)
+        self._falling = _Debounce(self.debounce)
+        self._recovery = {RECOVERY1: _Debounce(self.status_debounce, edge=True),
+                          RECOVERY2: _Debounce(self.status_debounce, edge=True)}
+
+    def feed(self, sample, timestamp):
+        """Process one sample received at `timestamp`; returns the list of new FlightEvents."""
+        events = []
+        altitude = sample.get("Avg Altitude")
+        if altitude is not None and altitude != altitude:
+            altitude = None  # NaN
+
+        if self.phase == PAD:
+            if altitude is not None:
+                if self.ground_altitude is None or altitude < self.ground_altitude:
+                    self.ground_altitude = altitude
+                velocity = sample.get("Avg Velocity")
+                climbing = (altitude - self.ground_altitude > self.launch_altitude and velocity is not None
+                            and velocity > self.launch_velocity)
+                if self._climb.update(climbing, timestamp):
+                    events.append(self._launch(self._climb.since, timestamp, f"climbing at {velocity} m/s"))
+            thrust = sample.get("ThrustSTS")
+            if self.phase == PAD and thrust is not None and self._thrust.update(thrust >= 1, timestamp):
+                events.append(self._launch(self._thrust.since, timestamp, "thruster on"))
+
+        if self.phase == ASCENT and altitude is not None:
+            if self.max_altitude is None or altitude > self.max_altitude:
+                self.max_altitude = altitude
+                self.max_altitude_time = timestamp
+            if self._falling.update(altitude <= self.max_altitude - self.apogee_drop, timestamp):
+                self.phase = DESCENT
+                events.append(self._event(APOGEE, self.max_altitude_time, timestamp, self.max_altitude,
+                                          f"{self.max_altitude:.1f} m"))
+
+        recovery = sample.get("RecSTS")
+        if recovery is not None:
+            for stage, name in ((1, RECOVERY1), (2, RECOVERY2)):
+                if name in self.events:
+                    continue
+                debounce = self._recovery[name]
+                if debounce.update(recovery >= stage, timestamp):
+                    events.append(self._event(name, debounce.since, timestamp, recovery, f"RecSTS {recovery:g}"))
+        return events
+
+    def _launch(self, timestamp, decided, reason):
+        self.phase = ASCENT
+        return self._event(LAUNCH, timestamp, decided, None, reason)
+
+    def _event(self, name, timestamp, decided, value, reason):
+        event = FlightEvent(name, timestamp, decided, value, reason)
+        self.events[name] = event
+        return event
@@ -0,0 +1,113 @@
+import multiprocessing
+import queue
+from globalFuncionality.shared_ring import SharedRingReader, SharedRingWriter
+from globalFuncionality.telemetry_bus import ERROR, STATUS
+from globalFuncionality.telemetry_parser import ParseError
+
+
+def _ingest_main(ring_name, fields, status_queue, stop_event, options):
+    """Child process: read, frame and parse, writing samples into the shared ring.
+
+    A full SerialConnection runs here with the ring writer standing in for
+    its store; status text and parse errors go back over `status_queue` as
+    (kind, text) pairs.
+    """
+    from globalFuncionality.serial_connection import SerialConnection
+
+    writer = SharedRingWriter(ring_name, fields)
+    # Derived metrics and flight events come from the parent, which publishes the samples.
+    connection = SerialConnection(options["baudrate"], options["timeout"], protocol=options["protocol"],
+                                  store=writer, derived_metrics=False, detect_events=False)
+
+    def forward(message):
+        # A ParseError travels as its raw line so the parent can rebuild it
+        item = (ERROR, message.raw) if isinstance(message, ParseError) else (STATUS, str(message))
+        try:
+            status_queue.put_nowait(item)
+        except queue.Full:
+            pass
+
+    connection.bus.subscribe(forward, kinds=(STATUS, ERROR), immediate=True)
+    if options["replay"]:
+        connection.replay(options["replay"], speed=options["replay_speed"])
+    else:
+        connection.supervise(options["port"])
+    try:
+        stop_event.wait()
+    except KeyboardInterrupt:
+        pass  # Ctrl+C reaches the whole process group; the parent decides when to stop
+    finally:
+        connection.stop()
+        writer.close()
+
+
+class IngestProcess:
+    """Runs serial ingest in a separate process and feeds its samples into `connection`.
+
+    Reading, framing and parsing happen in a child process, so they never
+    compete with Tk for the GIL. Parsed samples come back through a
+    fixed-layout shared-memory ring (see shared_ring); poll() copies new
+    records into the connection's store and bus. The bus calls poll() at
+    the start of every drain, so on the Tk main loop this happens once per
+    frame.
+    """
+
+    def __init__(self, connection, port=None, replay=None, replay_speed=1.0, capacity=65536):
+        self.connection = connection
+        self.fields = list(connection.field_map.values())
+        self.ring = SharedRingReader(self.fields, capacity)
+        # spawn, not fork: the parent has Tk and several threads running.
+        context = multiprocessing.get_context("spawn")
+        self.status_queue = context.Queue(maxsize=1000)
+        self.stop_event = context.Event()
+        options = {"baudrate": connection.baudrate, "timeout": connection.timeout,
+                   "protocol": connection.decoder.protocol, "port": port, "replay": replay,
+                   "replay_speed": replay_speed}
+        self.process = context.Process(target=_ingest_main, name="helios-ingest", daemon=True,
+                                       args=(self.ring.name, self.fields, self.status_queue, self.stop_event,
+                                             options))
+        self.samples = 0
+        self._exit_reported = False
+
+    def start(self):
+        """Start the child process and poll it from the connection's bus."""
+        self.process.start()
+        self.connection.bus.add_poller(self.poll)
+
+    def poll(self):
+        """Move new samples and status messages from the child into the store and bus; returns samples moved."""
+        connection = self.connection
+        records = self.ring.read()
+        publish = connection._publish_sample
+        for received, sample in records:
+            publish(sample, received)
+        self.samples += len(records)
+        while True:
+            try:
+                kind, text = self.status_queue.get_nowait()
+            except queue.Empty:
+                break
+            # Same messages as in-process reading: parse errors count as such and go out as ERROR
+            connection._invoke_callbacks(ParseError(text) if kind == ERROR else text)
+        if not self.process.is_alive() and not self._exit_reported and not self.stop_event.is_set():
+            self._exit_reported = True
+            connection._invoke_callbacks(f"Ingest process exited with code {self.process.exitcode}")
+        return len(records)
+
+    def stop(self, timeout=3.0):
+        """Ask the child to stop, wait for it, and release the shared memory."""
+        self.connection.bus.remove_poller(self.poll)
+        self.stop_event.set()
+        if self.process.pid is not None:
+            self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout)
+        self.status_queue.cancel_join_thread()
+        self.status_queue.close()
+        self.ring.close()
+
+    def stats(self):
+        """Return sample and overrun counters."""
+        return {"samples": self.samples, "overruns": self.ring.overruns, "pending": self.ring.pending(),
+                "alive": self.process.is_alive()}
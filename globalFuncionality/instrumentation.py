@@ -0,0 +1,177 @@
+import json
+import logging
+import os
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+_BUCKETS = 32  # Bucket i counts durations below 2**i microseconds; the last one everything longer
+
+
+class Histogram:
+    """Log2-bucketed histogram of durations; add() is a handful of integer operations."""
+
+    __slots__ = ("buckets", "count", "total", "max")
+
+    def __init__(self):
+        self.buckets = [0] * _BUCKETS
+        self.count = 0
+        self.total = 0.0  # Seconds
+        self.max = 0.0
+
+    def add(self, seconds):
+        self.buckets[min(int(seconds * 1e6).bit_length(), _BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q):
+        """Upper bound (microseconds) of the bucket holding the q-th percentile."""
+        if not self.count:
+            return 0
+        rank = q / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                return 1 << i
+        return 1 << (_BUCKETS - 1)
+
+    def snapshot(self):
+        count = self.count
+        return {"count": count, "avg_us": self.total / count * 1e6 if count else 0.0,
+                "p50_us": self.percentile(50), "p99_us": self.percentile(99), "max_us": self.max * 1e6}
+
+
+class PipelineMetrics:
+    """Counters, high-water marks and stage-time histograms of the telemetry pipeline.
+
+    Producers only increment integers and append to histograms, under one
+    short lock because the reader, I/O and Tk threads all report here;
+    rates and percentiles are computed when snapshot() is called. Set
+    `enabled` to False to skip the timing calls altogether. Components
+    with their own stats() (bus, renderer, scheduler, uplink...) can be
+    added with add_source() so that one snapshot covers everything.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.counters = {}  # name -> int
+        self.peaks = {}  # name -> highest value seen (e.g. bytes waiting in the port buffer)
+        self.histograms = {}  # name -> Histogram of seconds
+        self.sources = {}  # name -> stats() callable
+        self.started = time.monotonic()
+        self.rate_window = 1.0  # Rates are averaged over at least this many seconds
+        self._last = (self.started, {})  # Time and counters at the start of the current rate window
+        self._rates = {}
+
+    def count(self, name, n=1):
+        with self.lock:
+            counters = self.counters
+            counters[name] = counters.get(name, 0) + n
+
+    def peak(self, name, value):
+        with self.lock:
+            if value > self.peaks.get(name, 0):
+                self.peaks[name] = value
+
+    def observe(self, name, seconds):
+        """Add one duration (seconds) to the histogram of a pipeline stage."""
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.add(seconds)
+
+    def add_source(self, name, stats):
+        """Include stats() of another component in every snapshot."""
+        self.sources[name] = stats
+
+    def reset(self):
+        """Zero every counter, peak and histogram."""
+        with self.lock:
+            self.counters = {}
+            self.peaks = {}
+            self.histograms = {}
+            self.started = time.monotonic()
+            self._last = (self.started, {})
+            self._rates = {}
+
+    def snapshot(self):
+        """Return all metrics as a JSON-serializable dict, with per-second rates of the counters.
+
+        Rates cover the last rate_window seconds or more, however often
+        snapshots are taken (the panel and the exporter both take them).
+        """
+        with self.lock:
+            now = time.monotonic()
+            counters = dict(self.counters)
+            peaks = dict(self.peaks)
+            stages = {name: h.snapshot() for name, h in self.histograms.items()}
+            last_time, last_counters = self._last
+            elapsed = now - last_time
+            if elapsed >= self.rate_window:
+                self._last = (now, counters)
+                self._rates = {name: (value - last_counters.get(name, 0)) / elapsed
+                               for name, value in counters.items()}
+            rates = self._rates
+            started = self.started
+        sources = {}
+        for name, stats in list(self.sources.items()):
+            try:
+                sources[name] = stats()
+            except Exception as e:
+                sources[name] = {"error": str(e)}
+        return {"time": time.time(), "uptime": now - started, "counters": counters, "rates": rates,
+                "peaks": peaks, "stages": stages, "sources": sources}
+
+
+class MetricsExporter:
+    """Appends a PipelineMetrics snapshot as one JSON line to a file every `interval` seconds."""
+
+    def __init__(self, metrics, path, interval=5.0):
+        self.metrics = metrics
+        self.path = path
+        self.interval = interval
+        self.exports = 0
+        self.running = False
+        self.thread = None
+        self._stop = threading.Event()
+
+    def start(self):
+        """Start the export thread."""
+        if self.running:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.running = True
+        self._stop.clear()
+        self.thread = threading.Thread(target=self._run, name="MetricsExporter", daemon=True)
+        self.thread.start()
+
+    def stop(self, wait=True):
+        """Stop exporting, after writing one last snapshot."""
+        self.running = False
+        self._stop.set()
+        if wait and self.thread is not None:
+            self.thread.join(2)
+        self.thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.export()
+        self.export()
+
+    def export(self):
+        """Write one snapshot now."""
+        try:
+            line = json.dumps(self.metrics.snapshot(), default=str)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+            self.exports += 1
+        except Exception as e:
+            log.error("Metrics export to %s failed: %s", self.path, e)
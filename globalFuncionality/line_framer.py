@@ -0,0 +1,37 @@
+class LineFramer:
+    """Splits a raw byte stream into newline-terminated text lines.
+
+    Incoming bytes are appended to a single bytearray. Only the region up to
+    the last newline is decoded (through a memoryview, without copying), and
+    the consumed prefix is dropped once per feed instead of once per line.
+    """
+
+    def __init__(self, max_line=4096, encoding="utf-8"):
+        self.buffer = bytearray()
+        self.max_line = max_line  # Longest tail kept without seeing a newline
+        self.encoding = encoding
+        self.overflows = 0  # Number of times an oversized partial line was discarded
+
+    def feed(self, data):
+        """Append raw bytes and return the list of complete, stripped, non-empty lines."""
+        buf = self.buffer
+        # The existing tail is known not to contain a newline, so only scan the new bytes.
+        scan_from = len(buf)
+        buf += data
+        end = buf.rfind(b"\n", scan_from)
+        if end == -1:
+            if len(buf) > self.max_line:
+                # Garbage or a missing terminator; don't let the buffer grow without bound.
+                self.overflows += 1
+                buf.clear()
+            return []
+
+        # Decode every complete line in one pass; the partial tail stays as bytes.
+        with memoryview(buf) as view:
+            text = str(view[:end], self.encoding, "ignore")
+        del buf[:end + 1]
+        return [line for line in map(str.strip, text.split("\n")) if line]
+
+    def reset(self):
+        """Drop any partially received line."""
+        self.buffer.clear()
@@ -0,0 +1,156 @@
+import threading
+import time
+from globalFuncionality.telemetry_bus import PORTS
+
+
+class LinkSupervisor:
+    """Keeps a SerialConnection connected from a background thread.
+
+    Ports are enumerated every `scan_interval` seconds and the list is
+    diffed to notice hotplug; the new list is published on the bus as a
+    PORTS message. While a link is wanted but down (never opened, or the
+    reader stopped after an error) it is (re)opened with exponential
+    backoff between `backoff_min` and `backoff_max` seconds; a port
+    appearing resets the backoff. A dropout is thus recovered within about
+    backoff_max + scan_interval seconds of the device coming back. Nothing
+    here ever runs on the Tk thread.
+    """
+
+    def __init__(self, connection, port=None, auto_connect=True, scan_interval=2.0, backoff_min=0.5,
+                 backoff_max=8.0):
+        self.connection = connection
+        self.port = port  # Preferred port; None takes the first one found
+        self.wanted = auto_connect  # Whether a link should be kept open
+        self.scan_interval = scan_interval
+        self.backoff_min = backoff_min
+        self.backoff_max = backoff_max
+        self.backoff = backoff_min
+        self.ports = []  # Last enumerated port list
+        self.connected_port = None
+        self.attempts = 0
+        self.reconnects = 0  # Successful connects after a dropout
+        self.running = False
+        self.thread = None
+        self._wakeup = threading.Event()
+        self._next_scan = 0.0
+        self._next_attempt = 0.0
+        self._was_connected = False
+        self._disconnect_requested = False  # Switch ports: close the current link first
+
+    def start(self):
+        """Start supervising in a daemon thread."""
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self, wait=True):
+        """Stop the supervisor thread (the link itself is left as it is)."""
+        self.running = False
+        self._wakeup.set()
+        if wait and self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join()
+
+    def request_connect(self, port=None):
+        """Ask for a link to `port` (or the preferred/first port); returns immediately."""
+        if port is not None:
+            self.port = port
+        self.wanted = True
+        self.backoff = self.backoff_min
+        self._next_attempt = 0.0
+        if self.connected_port is not None and port is not None and port != self.connected_port:
+            self._disconnect_requested = True
+        self._wakeup.set()
+
+    def request_disconnect(self):
+        """Close the link and stop reconnecting until request_connect(); returns immediately."""
+        self.wanted = False
+        self._wakeup.set()
+
+    def link_lost(self):
+        """Called by the reader thread after a read error so recovery starts without waiting for a scan."""
+        self._wakeup.set()
+
+    def refresh(self):
+        """Enumerate ports now instead of at the next scan."""
+        self._next_scan = 0.0
+        self._wakeup.set()
+
+    def _run(self):
+        while self.running:
+            now = time.monotonic()
+            if now >= self._next_scan:
+                self._scan()
+                self._next_scan = now + self.scan_interval
+            self._supervise(now)
+            delay = self._next_scan - time.monotonic()
+            if self.wanted and self.connected_port is None:
+                delay = min(delay, self._next_attempt - time.monotonic())
+            self._wakeup.wait(max(0.05, delay))
+            self._wakeup.clear()
+
+    def _scan(self):
+        """Enumerate ports and publish the list when it changed."""
+        try:
+            ports = self.connection.detect_ports()
+        except Exception as e:
+            self.connection._invoke_callbacks(f"Error listing serial ports: {e}")
+            return
+        if ports == self.ports:
+            return
+        added = [p for p in ports if p not in self.ports]
+        removed = [p for p in self.ports if p not in ports]
+        self.ports = ports
+        self.connection.bus.publish(list(ports), PORTS)
+        if added:
+            self.connection._invoke_callbacks(f"Serial port(s) appeared: {', '.join(added)}")
+            # A device came back: retry right away instead of waiting out the backoff.
+            self.backoff = self.backoff_min
+            self._next_attempt = 0.0
+        if removed:
+            self.connection._invoke_callbacks(f"Serial port(s) removed: {', '.join(removed)}")
+        if not ports:
+            self.connection._invoke_callbacks("No serial ports available!")
+
+    def _supervise(self, now):
+        """Close a dead or unwanted link and open a wanted one when its backoff has expired."""
+        connection = self.connection
+        if self._disconnect_requested or not self.wanted:
+            self._disconnect_requested = False
+            if connection.serial_connection is not None:
+                connection.disconnect()
+            self.connected_port = None
+            self._was_connected = False
+            if not self.wanted:
+                return
+        if self.connected_port is not None:
+            if connection.running:
+                return
+            # The reader stopped after an error (e.g. the cable glitched).
+            connection.disconnect()
+            self.connected_port = None
+        if now < self._next_attempt:
+            return
+        port = self.port if self.port is not None else (self.ports[0] if self.ports else None)
+        if port is None:
+            return  # Wait for the scan to report a port
+        self.attempts += 1
+        try:
+            connection.connect(port)
+        except Exception as e:
+            connection._invoke_callbacks(f"Error connecting to port {port}: {e}")
+        if connection.running:
+            self.connected_port = port
+            if self._was_connected:
+                self.reconnects += 1
+            self._was_connected = True
+            self.backoff = self.backoff_min
+        else:
+            self._next_attempt = time.monotonic() + self.backoff
+            self.backoff = min(self.backoff * 2, self.backoff_max)
+
+    def stats(self):
+        """Return connection attempt counters."""
+        return {"port": self.connected_port, "ports": list(self.ports), "attempts": self.attempts,
+                "reconnects": self.reconnects, "backoff": self.backoff}
@@ -1,37 +1,78 @@
+import os
 import serial
 import serial.tools.list_ports
 import threading
-import re
+import time
+from globalFuncionality.command_uplink import CommandUplink
+from globalFuncionality.derived_metrics import DerivedMetrics
+from globalFuncionality.flight_events import FlightEventDetector
+from globalFuncionality.instrumentation import MetricsExporter, PipelineMetrics
+from globalFuncionality.ingest_process import IngestProcess
+from globalFuncionality.link_supervisor import LinkSupervisor
+from globalFuncionality.serial_multiplexer import SerialMultiplexer
+from globalFuncionality.session_recorder import SessionRecorder
+from globalFuncionality.session_replay import ReplaySerial
+from globalFuncionality.session_store import ColumnarSessionWriter
+from globalFuncionality.stream_decoder import StreamDecoder
+from globalFuncionality.telemetry_bus import ERROR, EVENT, SAMPLE, STATUS, TelemetryBus
+from globalFuncionality.telemetry_fanout import TelemetryFanout
+from globalFuncionality.telemetry_parser import FIELD_MAP, ParseError, TelemetryParser
+from globalFuncionality.telemetry_store import TelemetryStore
 
 
 class SerialConnection:
     """Handles serial communication and parses incoming serial data,
     while supporting multiple callbacks."""
 
-    def __init__(self, baudrate=9600, timeout=1):
+    def __init__(self, baudrate=9600, timeout=1, read_mode="blocking", read_size=4096, protocol="auto",
+                 store=None, derived_metrics=True, detect_events=True, write_timeout=1, instrument=True):
         self.serial_connection = None
         self.running = False
         self.read_thread = None
         self.callbacks = []  # List of callback functions to handle data/status
+        # Everything the reader produces goes through the bus; callbacks are bus subscribers.
+        self.bus = TelemetryBus()
         self.baudrate = baudrate
         self.timeout = timeout
-        self.buffer = ""  # Buffer for accumulating incoming data
+        self.write_timeout = write_timeout  # A stalled port fails a write instead of hanging the writer
+        # "blocking" waits on bounded reads; "polling" is the original busy loop
+        # on in_waiting. Both frame and decode bytes with the same StreamDecoder.
+        self.read_mode = read_mode
+        self.read_size = read_size  # Upper bound on bytes requested per read call
+        # Wire format: "text" ("Label: value" lines), "binary" (COBS frames) or
+        # "auto" to detect it from the first bytes of every connection.
+        self.decoder = StreamDecoder(self.parse_serial_data, protocol)
+        self._source_generation = 0  # read_generation of a ReplaySerial, bumped by its seek()
+        # Shared history of every parsed field; the tabs read from here.
+        self.store = store if store is not None else TelemetryStore()
+        self.recorder = None  # SessionRecorder while recording, see start_recording()
+        self.session_store = None  # ColumnarSessionWriter for range queries, see start_session_store()
+        # Vertical speed, apogee, rolling statistics... computed per sample and
+        # published as extra fields; one DerivedMetrics per link name.
+        self.derived_metrics = derived_metrics
+        self._derived = {}
+        # Launch/apogee/recovery detection; events go out on the bus as EVENT messages.
+        self.event_detector = FlightEventDetector() if detect_events else None
+        self.multiplexer = None  # SerialMultiplexer when several links are open, see open_links()
+        # With several links, only the primary one feeds the store, the session store and the
+        # event detector, so a backup radio never interleaves with it; see _is_primary().
+        self.primary_link = None
+        self.failover_seconds = 2.0  # Silence of the primary link after which another link takes over
+        self._primary_seen = 0.0  # Receive time of the primary link's latest sample
+        self.supervisor = None  # LinkSupervisor doing discovery/reconnects, see supervise()
+        self.ingest = None  # IngestProcess when reading happens in a child process, see start_ingest_process()
+        self.uplink = None  # CommandUplink writing commands from its own thread, see start_uplink()
+        self.fanout = None  # TelemetryFanout serving samples to network clients, see start_fanout()
+        # Throughput counters and per-stage timings; instrument=False skips the timing calls.
+        self.metrics = PipelineMetrics(enabled=instrument)
+        self.metrics.add_source("bus", self.bus.stats)
+        self.bus.metrics = self.metrics
+        self.exporter = None  # MetricsExporter writing snapshots to a file, see start_metrics_export()
 
         # Mapping from printed labels to standardized keys for the dashboard.
-        self.field_map = {
-            "Vref": "Vref",
-            "Vout": "Vout",
-            "Average Altitude": "Avg Altitude",
-            "Average Temperature": "Avg Temp",
-            "Average Pressure": "Avg Pressure",
-            "Average Humidity": "Avg Humidity",
-            "Average Pitch": "Avg Pitch",
-            "Average Velocity": "Avg Velocity",
-            "Airbrake Status": "AirBreakSTS",
-            "Recovery Status": "RecSTS",
-            "Thruster Status": "ThrustSTS",
-            "Battery Status": "BatSTS"
-        }
+        self.field_map = dict(FIELD_MAP)
+        # Compiled once from field_map; call rebuild_parser() after editing the map.
+        self.parser = TelemetryParser(self.field_map)
 
     def detect_ports(self):
         """Detect available serial ports."""
@@ -43,19 +84,136 @@ class SerialConnection:
             self.disconnect()
 
         try:
-            self.serial_connection = serial.Serial(port, baudrate=self.baudrate, timeout=self.timeout)
+            self.serial_connection = serial.Serial(port, baudrate=self.baudrate, timeout=self.timeout,
+                                                   write_timeout=self.write_timeout)
             self.running = True
             self.start_reading()
             self._invoke_callbacks(f"Connected to {port}")
         except serial.SerialException as e:
             self._invoke_callbacks(f"Error connecting to port {port}: {e}")
 
+    def supervise(self, port=None, auto_connect=True, **options):
+        """Discover ports and (re)connect in the background; returns the LinkSupervisor.
+
+        With auto_connect the preferred `port` (or the first port found) is
+        opened as soon as it is available and reopened after dropouts.
+        options are passed to LinkSupervisor (scan_interval, backoff_min, backoff_max).
+        """
+        if self.supervisor is None:
+            self.supervisor = LinkSupervisor(self, port, auto_connect, **options)
+            self.supervisor.start()
+        elif auto_connect:
+            self.supervisor.request_connect(port)
+        return self.supervisor
+
+    def start_ingest_process(self, port=None, replay=None, replay_speed=1.0):
+        """Read and parse in a separate process; samples arrive through shared memory.
+
+        The child connects to `port` (or the first port found, reconnecting as
+        needed) or replays the `replay` files. Its samples are copied into
+        this connection's store and bus whenever the bus is drained.
+        Returns the IngestProcess.
+        """
+        if self.ingest is None:
+            self.ingest = IngestProcess(self, port=port, replay=replay, replay_speed=replay_speed)
+            self.ingest.start()
+        return self.ingest
+
+    def start_uplink(self, **options):
+        """Start the command writer thread; returns the CommandUplink.
+
+        options are passed to CommandUplink (max_queue, ack_timeout, retries, expect_ack, ...).
+        """
+        if self.uplink is None:
+            self.uplink = CommandUplink(self, **options)
+            self.uplink.start()
+        return self.uplink
+
+    def start_fanout(self, host="127.0.0.1", port=5760, **options):
+        """Serve samples, status messages and flight events to network clients; returns the TelemetryFanout.
+
+        options are passed to TelemetryFanout (max_client_buffer, policy, multicast, ...).
+        """
+        if self.fanout is None:
+            self.fanout = TelemetryFanout(self, host, port, **options).start()
+        return self.fanout
+
+    def start_metrics_export(self, path, interval=5.0):
+        """Append a metrics snapshot (JSON lines) to `path` every `interval` seconds; returns the MetricsExporter."""
+        if self.exporter is None:
+            self.exporter = MetricsExporter(self.metrics, path, interval)
+            self.exporter.start()
+        return self.exporter
+
+    def pipeline_stats(self):
+        """Return a snapshot of the pipeline metrics, including the active reader's own counters."""
+        metrics = self.metrics
+        for name, component in (("supervisor", self.supervisor), ("multiplexer", self.multiplexer),
+                                ("ingest", self.ingest), ("uplink", self.uplink), ("recorder", self.recorder),
+                                ("fanout", self.fanout), ("session_store", self.session_store)):
+            if component is not None:
+                metrics.sources[name] = component.stats
+            else:
+                metrics.sources.pop(name, None)
+        return metrics.snapshot()
+
+    def open_source(self, source, name):
+        """Read from an already open serial-like object (e.g. a ReplaySerial) instead of a port."""
+        if self.serial_connection:
+            self.disconnect()
+        self.serial_connection = source
+        self.running = True
+        self.start_reading()
+        self._invoke_callbacks(f"Connected to {name}")
+
+    def replay(self, paths, speed=1.0, line_period=None):
+        """Play recorded session file(s) through the normal parse/callback pipeline.
+
+        speed is a multiplier of the original timing; None replays as fast as possible.
+        Returns the ReplaySerial so the caller can seek() or read its progress.
+        """
+        if self.serial_connection:
+            self.disconnect()
+        # A replay is another flight: derived values and flight events start over
+        self._derived.clear()
+        if self.event_detector is not None:
+            self.event_detector.reset()
+        source = ReplaySerial(paths, speed=speed, timeout=self.timeout, line_period=line_period)
+        self.open_source(source, f"replay of {source.paths[0]}")
+        return source
+
+    def open_links(self, links, primary=None):
+        """Read several ports at once; `links` maps link names to port devices.
+
+        All links share one I/O thread, and their samples reach the recorder
+        and callbacks tagged with the link name. The store, session store and
+        flight events follow the primary link (the first one unless `primary`
+        names another). Returns the SerialMultiplexer.
+        """
+        if self.multiplexer is None:
+            self.multiplexer = SerialMultiplexer(self, read_size=self.read_size)
+        if primary is not None:
+            self.primary_link = primary
+        elif self.primary_link is None:
+            self.primary_link = next(iter(links), None)
+        self._primary_seen = time.monotonic()  # Give the primary link time to deliver its first sample
+        for name, port in links.items():
+            self.multiplexer.add_link(name, port, baudrate=self.baudrate, protocol=self.decoder.protocol,
+                                      write_timeout=self.write_timeout)
+        self.multiplexer.start()
+        return self.multiplexer
+
     def disconnect(self):
         """Disconnect from the serial port."""
         self.running = False
         if self.serial_connection and self.serial_connection.is_open:
             self.serial_connection.close()
         self.serial_connection = None
+        # Let the old reader exit before a reconnect starts a new one on the same state.
+        reader = self.read_thread
+        if reader is not None and reader is not threading.current_thread():
+            reader.join(self.timeout + 1 if self.timeout is not None else None)
+        self.read_thread = None
         self._invoke_callbacks("Disconnected")
 
     def start_reading(self):
@@ -67,24 +225,166 @@ class SerialConnection:
 
     def read_loop(self):
         """Continuously read data from the serial port, parse it, and send it to the callbacks."""
+        self.decoder.reset()
+        self._source_generation = 0
+        if self.read_mode == "polling":
+            self._read_loop_polling()
+        else:
+            self._read_loop_blocking()
+
+    def _read_loop_blocking(self):
+        """Block on bounded reads and hand complete lines to the parser."""
+        conn = self.serial_connection
+        read_size = self.read_size
+        metrics = self.metrics
+        while self.running:
+            try:
+                # Waits up to `timeout` for the first byte, then drains whatever is
+                # already queued, so an idle port costs no CPU.
+                waiting = conn.in_waiting
+                chunk = conn.read(min(waiting, read_size) if waiting else 1)
+                if chunk:
+                    received = time.monotonic()
+                    metrics.count("bytes", len(chunk))
+                    metrics.peak("port_buffer", waiting)
+                    recorder = self.recorder  # stop_recording() may clear it from the Tk thread
+                    if recorder is not None:
+                        recorder.record_raw(chunk, received)
+                    self._feed(chunk, received)
+            except Exception as e:
+                if self.running:
+                    self._invoke_callbacks(f"Error reading from serial: {e}")
+                self.running = False
+                if self.supervisor is not None:
+                    self.supervisor.link_lost()
+
+    def _read_loop_polling(self):
+        """Legacy reader that spins on in_waiting; kept for comparison.
+
+        Only the way bytes are read differs from the blocking reader: they
+        go through the same StreamDecoder, so binary frames are decoded too.
+        """
         while self.running:
             try:
                 if self.serial_connection.in_waiting:
-                    # Read available bytes and decode them (ignoring decode errors)
-                    incoming = self.serial_connection.read(self.serial_connection.in_waiting).decode("utf-8",
-                                                                                                     errors="ignore")
-                    self.buffer += incoming
-                    # Process each complete line (terminated by newline)
-                    while "\n" in self.buffer:
-                        line, self.buffer = self.buffer.split("\n", 1)
-                        line = line.strip()
-                        if line:
-                            parsed = self.parse_serial_data(line)
-                            if parsed:
-                                self._invoke_callbacks(parsed)
+                    data = self.serial_connection.read(self.serial_connection.in_waiting)
+                    received = time.monotonic()
+                    self.metrics.count("bytes", len(data))
+                    recorder = self.recorder
+                    if recorder is not None:
+                        recorder.record_raw(data, received)
+                    self._feed(data, received)
             except Exception as e:
                 self._invoke_callbacks(f"Error reading from serial: {e}")
                 self.running = False
+                if self.supervisor is not None:
+                    self.supervisor.link_lost()
+
+    def _feed(self, chunk, received):
+        """Decode a chunk of raw bytes and pass every completed result on."""
+        decoder = self.decoder
+        metrics = self.metrics
+        generation = getattr(self.serial_connection, "read_generation", 0)
+        if generation != self._source_generation:
+            # The replay jumped: the partial line or frame before this chunk belongs elsewhere
+            self._source_generation = generation
+            decoder.reset()
+        undecided = decoder.active_protocol is None
+        if metrics.enabled:
+            start = time.perf_counter()
+            results = decoder.feed(chunk)
+            metrics.observe("parse", time.perf_counter() - start)
+        else:
+            results = decoder.feed(chunk)
+        metrics.count("lines", len(results))
+        if undecided and decoder.active_protocol is not None:
+            self._invoke_callbacks(f"Detected {decoder.active_protocol} telemetry")
+        for parsed in results:
+            if isinstance(parsed, dict):
+                self._publish_sample(parsed, received)
+            else:
+                self._handle_text(parsed)
+
+    def link_stats(self):
+        """Return frame counters for the binary protocol (dropped/corrupt frames)."""
+        return self.decoder.binary_decoder.stats()
+
+    def _publish_sample(self, sample, received, source=None):
+        """Record a parsed sample in the store, then publish it on the bus.
+
+        source names the link it came from when several links are multiplexed;
+        only samples of the primary link go to the store, the session store
+        and the event detector. Derived metrics are added to the stored and
+        published sample, but the recording keeps what the board sent. Flight
+        events it triggers are published before the sample itself.
+        """
+        primary = source is None or self._is_primary(source, received)
+        timed = self.metrics.enabled
+        if timed:
+            clock = time.perf_counter
+            start = clock()
+        recorder = self.recorder  # Read once: stop_recording() may clear it from the Tk thread
+        if recorder is not None:
+            recorder.record_sample(sample, received, source)
+            if timed:
+                now = clock()
+                self.metrics.observe("record", now - start)
+                start = now
+        if primary and self.event_detector is not None:
+            for event in self.event_detector.feed(sample, received):
+                self.bus.publish(event, EVENT, source)
+                self._invoke_callbacks(str(event))
+        if self.derived_metrics:
+            engine = self._derived.get(source)
+            if engine is None:
+                engine = self._derived[source] = DerivedMetrics()
+            derived = engine.update(sample, received)
+            if derived:
+                sample = {**sample, **derived}
+        if timed:
+            now = clock()
+            self.metrics.observe("derive", now - start)
+            start = now
+        if primary:
+            self.store.append(sample, received, source)
+            session_store = self.session_store  # Read once: stop_session_store() may clear it from the Tk thread
+            if session_store is not None:
+                session_store.append(sample, received, source)
+        if timed:
+            now = clock()
+            self.metrics.observe("store", now - start)
+            start = now
+        self.bus.publish(sample, SAMPLE, source)
+        if timed:
+            self.metrics.observe("publish", clock() - start)
+        self.metrics.count("samples")
+
+    def _is_primary(self, source, received):
+        """Whether a sample from link `source` is the one to store (I/O thread).
+
+        The primary link stays primary while it delivers; after
+        failover_seconds without a sample from it, the next link that
+        delivers takes over until it falls silent in turn.
+        """
+        if source == self.primary_link:
+            self._primary_seen = received
+            return True
+        if received - self._primary_seen <= self.failover_seconds:
+            return False
+        previous, self.primary_link = self.primary_link, source
+        self._primary_seen = received
+        if previous is not None:
+            self._invoke_callbacks(f"Primary link {previous} silent, using {source}")
+        return True
+
+    def _handle_text(self, message):
+        """Pass a line that is not a sample to the uplink, then to the callbacks.
+
+        A line the uplink matched as a command ack is reported as "Acked: ..." instead.
+        """
+        if self.uplink is not None and self.uplink.match_line(getattr(message, "raw", message)):
+            return
+        self._invoke_callbacks(message)
 
     def parse_serial_data(self, raw_data):
         """
@@ -94,32 +394,22 @@ class SerialConnection:
         "Vref: 3.30, Vout: 1.06, Average Altitude: 792.95 m, Average Temperature: 24.85 C,
          Average Pressure: 93425.10 Pa, Average Humidity: 19.30 %, Average Pitch: 1.34 degrees,
          Average Velocity: 196.00 m/s"
+
+        Returns a dict on success or a ParseError (whose str() is the old
+        "Invalid data received: ..." message) when nothing could be parsed.
         """
-        result = {}
-        parts = raw_data.split(",")
-        for part in parts:
-            part = part.strip()
-            # Use regex to match a label and a numeric value (ignoring trailing text)
-            m = re.match(r"(.+?):\s*([-+]?\d*\.?\d+)", part)
-            if m:
-                label = m.group(1).strip()
-                value_str = m.group(2).strip()
-                try:
-                    value = float(value_str)
-                except ValueError:
-                    continue  # Skip if conversion fails
-                if label in self.field_map:
-                    key = self.field_map[label]
-                    result[key] = value
-                else:
-                    result[label] = value
-        if result:
-            return result
-        else:
-            return f"Invalid data received: {raw_data}"
+        return self.parser.parse(raw_data)
+
+    def parse_lines(self, lines):
+        """Parse a list of lines in one call; returns a columnar ParsedBatch."""
+        return self.parser.parse_batch(lines)
+
+    def rebuild_parser(self):
+        """Recompile the parser after field_map has been changed."""
+        self.parser = TelemetryParser(self.field_map)
 
     def write(self, data):
-        """Write data to the serial port."""
+        """Write data to the serial port, blocking up to write_timeout; the UI uses the uplink instead."""
         if not self.serial_connection or not self.serial_connection.is_open:
             self._invoke_callbacks("Error: Serial connection is not open.")
             return
@@ -129,15 +419,132 @@ class SerialConnection:
             self._invoke_callbacks(f"Error writing to serial: {e}")
 
     def set_callback(self, callback):
-        """Add a callback function to handle incoming data or status messages."""
+        """Add a callback function to handle incoming data or status messages.
+
+        Callbacks are bus subscribers: they run wherever the bus is drained
+        (the Tk main loop once attached), never on the reader thread.
+        """
         if callback not in self.callbacks:
             self.callbacks.append(callback)
+            self.bus.subscribe(callback)
 
     def _invoke_callbacks(self, data):
-        """Invoke all registered callback functions with the given data."""
-        for callback in self.callbacks:
-            callback(data)
+        """Publish data or a status message to the registered callbacks."""
+        if isinstance(data, dict):
+            self.bus.publish(data, SAMPLE)
+            return
+        recorder = self.recorder
+        if recorder is not None:
+            recorder.record_status(data, time.monotonic())
+        if isinstance(data, ParseError):
+            self.metrics.count("parse_failures")
+            self.bus.publish(data, ERROR)
+        else:
+            self.bus.publish(data, STATUS)
+
+    def start_recording(self, directory="recordings", **options):
+        """Start recording raw bytes, samples and status messages; returns the SessionRecorder.
+
+        options are passed to SessionRecorder (flush_ms, max_bytes, max_seconds, compress, fsync).
+        """
+        if self.recorder is None:
+            recorder = SessionRecorder(directory, **options)
+            recorder.start()
+            self.recorder = recorder
+        return self.recorder
+
+    def start_session_store(self, root="sessions", **options):
+        """Also write the parsed samples to a new columnar session under `root`; returns the writer.
+
+        options are passed to ColumnarSessionWriter (fields, chunk_rows, chunk_seconds, max_pending).
+        """
+        if self.session_store is None:
+            stamp = os.path.join(root, time.strftime("session-%Y%m%d-%H%M%S"))
+            directory, index = stamp, 0
+            while os.path.exists(directory):  # Logging restarted within the same second
+                index += 1
+                directory = f"{stamp}-{index:03d}"
+            # Files are written on the writer's own thread, never on the publishing one
+            options.setdefault("background", True)
+            self.session_store = ColumnarSessionWriter(directory, **options)
+        return self.session_store
+
+    def stop_session_store(self):
+        """Write the last chunk and close the session."""
+        writer, self.session_store = self.session_store, None
+        if writer is not None:
+            writer.close()
+
+    def stop_recording(self, wait=True):
+        """Stop recording; with wait=False the writer closes the file in the background."""
+        recorder, self.recorder = self.recorder, None
+        if recorder is not None:
+            recorder.stop(wait)
 
     def stop(self):
-        """Stop the reading thread and disconnect the serial connection."""
+        """Stop the reading thread, any recording, and disconnect the serial connection."""
+        if self.uplink is not None:
+            self.uplink.stop()
+            self.uplink = None
+        if self.fanout is not None:
+            self.fanout.stop()
+            self.fanout = None
+        if self.supervisor is not None:
+            self.supervisor.stop()
+            self.supervisor = None
+        if self.ingest is not None:
+            self.ingest.stop()
+            self.ingest = None
+        if self.multiplexer is not None:
+            self.multiplexer.stop()
+            self.multiplexer = None
         self.disconnect()
+        self.stop_recording()
+        self.stop_session_store()
+        if self.exporter is not None:
+            self.exporter.stop()
+            self.exporter = None
+
+
+def open_serial_connection(replay=None, replay_speed=1.0, links=None, startup_timer=None, ingest_process=False,
+                           metrics_file=None, metrics_interval=5.0, fanout=None, recording=None, session_store=None,
+                           status_callback=None, store=None):
+    """Create the shared SerialConnection and start its data source.
+
+    Needs no Tk, so the splash screen runs it on a background thread while
+    the fade is still on screen, and headless.py runs it with no UI at all;
+    the reader threads start filling the store before the dashboard exists.
+    With ingest_process, reading and parsing run in a child process instead
+    (single port or replay only). With metrics_file, pipeline metrics are
+    appended to it every metrics_interval s. fanout is a dict of
+    SerialConnection.start_fanout() options, to serve the telemetry to other
+    machines. recording and session_store are directories to record the
+    session to from the first byte on. status_callback is subscribed to
+    status and error messages before the source starts, so it sees them all.
+    store is the TelemetryStore to fill (SerialConnection's default when None).
+    """
+    serial_connection = SerialConnection(baudrate=9600, timeout=1, store=store)
+    if metrics_file:
+        serial_connection.start_metrics_export(metrics_file, metrics_interval)
+    if fanout:
+        serial_connection.start_fanout(**fanout)
+    if recording:
+        serial_connection.start_recording(recording)
+    if session_store:
+        serial_connection.start_session_store(session_store)
+    if status_callback is not None:
+        serial_connection.bus.subscribe(status_callback, kinds=(STATUS, ERROR))
+    if startup_timer is not None:
+        startup_timer.watch(serial_connection.bus)
+    if ingest_process:
+        serial_connection.start_ingest_process(replay=replay, replay_speed=replay_speed)
+    elif replay:
+        # Feed a recorded session through the normal pipeline instead of a board
+        serial_connection.replay(replay, speed=replay_speed)
+    elif links:
+        # Several boards (e.g. avionics + backup radio) feeding this one dashboard
+        serial_connection.open_links(links)
+    else:
+        # Find a port and connect (and reconnect after dropouts) off the calling thread
+        serial_connection.supervise()
+    return serial_connection
@@ -0,0 +1,148 @@
+import selectors
+import serial
+import threading
+import time
+from globalFuncionality.stream_decoder import StreamDecoder
+from globalFuncionality.telemetry_parser import TelemetryParser
+
+
+class SerialLink:
+    """One port handled by the multiplexer, with its own framing and parser state."""
+
+    def __init__(self, name, port, conn, decoder):
+        self.name = name
+        self.port = port
+        self.conn = conn
+        self.decoder = decoder
+        self.bytes_read = 0
+        self.samples = 0
+        self.errors = 0  # Lines that could not be parsed
+
+    def stats(self):
+        """Return byte/sample counters and binary frame counters of this link."""
+        stats = {"port": self.port, "protocol": self.decoder.active_protocol, "bytes_read": self.bytes_read,
+                 "samples": self.samples, "errors": self.errors}
+        stats.update(self.decoder.binary_decoder.stats())
+        return stats
+
+
+class SerialMultiplexer:
+    """Reads several serial links on a single selector-based I/O thread.
+
+    Every link gets its own StreamDecoder and TelemetryParser, so a partial
+    line on one port never mixes with another. Samples are tagged with the
+    link name and go through the SerialConnection's recorder and bus, so
+    all links feed the same dashboard; its store follows the primary link. Ports are opened non-blocking and
+    waited on with select(), which needs real file descriptors (POSIX).
+    """
+
+    def __init__(self, connection, read_size=4096, poll_timeout=0.5):
+        self.connection = connection  # SerialConnection whose store/bus/recorder receive the samples
+        self.read_size = read_size
+        self.poll_timeout = poll_timeout  # Seconds select() waits before re-checking `running`
+        self.links = {}  # name -> SerialLink
+        self.selector = selectors.DefaultSelector()
+        self.lock = threading.Lock()  # Guards links/selector between the UI and I/O threads
+        self.running = False
+        self.thread = None
+
+    def add_link(self, name, port, baudrate=9600, protocol="auto", write_timeout=1):
+        """Open `port` and start reading it as link `name`; returns the SerialLink or None on error."""
+        if name in self.links:
+            self.remove_link(name)
+        try:
+            conn = serial.Serial(port, baudrate=baudrate, timeout=0, write_timeout=write_timeout)
+        except serial.SerialException as e:
+            self.connection._invoke_callbacks(f"Error connecting to port {port} ({name}): {e}")
+            return None
+        parser = TelemetryParser(self.connection.field_map)
+        link = SerialLink(name, port, conn, StreamDecoder(parser.parse, protocol))
+        with self.lock:
+            self.links[name] = link
+            self.selector.register(conn.fileno(), selectors.EVENT_READ, link)
+        self.connection._invoke_callbacks(f"Connected to {port} ({name})")
+        return link
+
+    def remove_link(self, name):
+        """Stop reading link `name` and close its port."""
+        with self.lock:
+            link = self.links.pop(name, None)
+            if link is None:
+                return
+            try:
+                self.selector.unregister(link.conn.fileno())
+            except (KeyError, ValueError):
+                pass
+        try:
+            link.conn.close()
+        except Exception:
+            pass
+        self.connection._invoke_callbacks(f"Disconnected {name}")
+
+    def start(self):
+        """Start the I/O thread (links can be added before or after)."""
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop the I/O thread and close every link."""
+        self.running = False
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        for name in list(self.links):
+            self.remove_link(name)
+
+    def _run(self):
+        """I/O thread: wait for any link to become readable and drain it."""
+        read_size = self.read_size
+        while self.running:
+            with self.lock:
+                empty = not self.links
+            if empty:
+                time.sleep(self.poll_timeout)  # select() on no descriptors fails on some platforms
+                continue
+            for key, _ in self.selector.select(self.poll_timeout):
+                link = key.data
+                try:
+                    chunk = link.conn.read(read_size)
+                except Exception as e:
+                    self.connection._invoke_callbacks(f"Error reading from {link.name}: {e}")
+                    self.remove_link(link.name)
+                    continue
+                if chunk:
+                    self._feed(link, chunk, time.monotonic())
+
+    def _feed(self, link, chunk, received):
+        """Decode a chunk of one link and publish its samples tagged with the link name."""
+        link.bytes_read += len(chunk)
+        connection = self.connection
+        metrics = connection.metrics
+        metrics.count("bytes", len(chunk))
+        decoder = link.decoder
+        undecided = decoder.active_protocol is None
+        if metrics.enabled:
+            start = time.perf_counter()
+            results = decoder.feed(chunk)
+            metrics.observe("parse", time.perf_counter() - start)
+        else:
+            results = decoder.feed(chunk)
+        metrics.count("lines", len(results))
+        if undecided and decoder.active_protocol is not None:
+            connection._invoke_callbacks(f"Detected {decoder.active_protocol} telemetry on {link.name}")
+        for parsed in results:
+            if isinstance(parsed, dict):
+                link.samples += 1
+                connection._publish_sample(parsed, received, link.name)
+            else:
+                link.errors += 1
+                connection._handle_text(parsed)
+
+    def stats(self):
+        """Return per-link counters keyed by link name."""
+        with self.lock:
+            links = list(self.links.values())
+        return {link.name: link.stats() for link in links}
@@ -0,0 +1,214 @@
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import deque
+
+# Record kinds stored in a recording file
+META = 0  # JSON header written at the start of every file
+RAW = 1  # Raw bytes exactly as read from the port
+SAMPLE = 2  # Parsed sample dict, JSON encoded
+STATUS = 3  # Status or error text
+LINK_SAMPLE = 4  # Parsed sample from a named link: {"source": name, "sample": {...}}
+
+# Every record: kind (u8), host receive time (f64, time.monotonic), payload length (u32), payload.
+_RECORD = struct.Struct("<BdI")
+EXTENSION = ".hrec"
+
+
+class SessionRecorder:
+    """Records raw bytes and parsed samples to disk on its own writer thread.
+
+    The reader thread only appends to an in-memory queue. The writer wakes up
+    every flush_ms, encodes everything queued into one chunk and writes it,
+    so a crash loses at most about flush_ms of data. Files rotate by size and
+    age and can be zlib compressed (".hrec.z"); read them with read_records().
+    """
+
+    def __init__(self, directory="recordings", flush_ms=250, max_bytes=64 * 1024 * 1024, max_seconds=3600,
+                 compress=True, fsync=False, max_pending=200000):
+        self.directory = directory
+        self.flush_ms = flush_ms
+        self.max_bytes = max_bytes  # Rotate after this many bytes written to one file
+        self.max_seconds = max_seconds  # Rotate after a file has been open this long
+        self.compress = compress
+        self.fsync = fsync  # Also survive an OS crash, at the cost of a sync per flush
+        self.queue = deque(maxlen=max_pending)
+        self.queue_lock = threading.Lock()  # Producers on several threads share the overflow check and count
+        self.dropped = 0  # Records lost because the writer fell max_pending behind
+        self.records = 0
+        self.bytes_written = 0
+        self.files = []  # Paths of every file written by this recorder
+        self.running = False
+        self.thread = None
+        self._wakeup = threading.Event()
+        self._file = None
+        self._compressor = None
+        self._file_bytes = 0
+        self._file_opened = 0.0
+
+    def start(self):
+        """Start the writer thread."""
+        if self.running:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="SessionRecorder", daemon=True)
+        self.thread.start()
+
+    def stop(self, wait=True):
+        """Write everything still queued, close the current file and stop the thread."""
+        if not self.running:
+            return
+        self.running = False
+        self._wakeup.set()
+        if wait:
+            self.thread.join()
+
+    def record_raw(self, data, received):
+        """Queue raw bytes read from the port (any thread, never blocks)."""
+        self._put((RAW, received, data))
+
+    def record_sample(self, sample, received, source=None):
+        """Queue a parsed sample dict, tagged with its link when multiplexed (any thread, never blocks)."""
+        if source is None:
+            self._put((SAMPLE, received, sample))
+        else:
+            self._put((LINK_SAMPLE, received, {"source": source, "sample": sample}))
+
+    def record_status(self, message, received):
+        """Queue a status or error message (any thread, never blocks)."""
+        self._put((STATUS, received, str(message)))
+
+    def _put(self, record):
+        queue = self.queue
+        with self.queue_lock:
+            if len(queue) == queue.maxlen:
+                self.dropped += 1
+            queue.append(record)
+
+    def _run(self):
+        """Writer thread: drain the queue every flush_ms until stopped."""
+        try:
+            while self.running:
+                self._wakeup.wait(self.flush_ms / 1000)
+                self._wakeup.clear()
+                self._write_pending()
+            self._write_pending()
+        finally:
+            self._close_file()
+
+    def _write_pending(self):
+        """Encode all queued records into one chunk, write and flush it."""
+        queue = self.queue
+        if not queue:
+            return
+        if self._file is None or self._should_rotate():
+            self._close_file()
+            self._open_file()
+        chunk = bytearray()
+        pack = _RECORD.pack
+        count = 0
+        while queue:
+            kind, received, payload = queue.popleft()
+            if kind == RAW:
+                payload = bytes(payload)
+            elif kind in (SAMPLE, LINK_SAMPLE):
+                payload = json.dumps(payload, separators=(",", ":")).encode()
+            else:
+                payload = payload.encode("utf-8", "replace")
+            chunk += pack(kind, received, len(payload))
+            chunk += payload
+            count += 1
+        self._write(chunk)
+        self._flush()
+        self.records += count
+
+    def _write(self, data):
+        if self._compressor is not None:
+            data = self._compressor.compress(data)
+        self._file.write(data)
+        self._file_bytes += len(data)
+        self.bytes_written += len(data)
+
+    def _flush(self):
+        if self._compressor is not None:
+            # Sync flush makes everything so far decodable without closing the stream.
+            data = self._compressor.flush(zlib.Z_SYNC_FLUSH)
+            self._file.write(data)
+            self._file_bytes += len(data)
+            self.bytes_written += len(data)
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def _should_rotate(self):
+        return (self._file_bytes >= self.max_bytes
+                or time.monotonic() - self._file_opened >= self.max_seconds)
+
+    def _open_file(self):
+        """Start a new recording file and write its header record."""
+        stamp = time.strftime("session-%Y%m%d-%H%M%S")
+        index = len(self.files)
+        while True:
+            # Another recorder may have started in the same second; never truncate its file
+            path = os.path.join(self.directory, f"{stamp}-{index:03d}{EXTENSION}" + (".z" if self.compress else ""))
+            try:
+                self._file = open(path, "xb")
+                break
+            except FileExistsError:
+                index += 1
+        self._compressor = zlib.compressobj(6) if self.compress else None
+        self._file_bytes = 0
+        self._file_opened = time.monotonic()
+        self.files.append(path)
+        header = json.dumps({"version": 1, "wall_time": time.time(), "monotonic": self._file_opened}).encode()
+        self._write(_RECORD.pack(META, self._file_opened, len(header)) + header)
+
+    def _close_file(self):
+        if self._file is None:
+            return
+        if self._compressor is not None:
+            self._file.write(self._compressor.flush(zlib.Z_FINISH))
+        self._file.close()
+        self._file = None
+        self._compressor = None
+
+    def stats(self):
+        """Return writer counters."""
+        return {"records": self.records, "bytes_written": self.bytes_written, "dropped": self.dropped,
+                "pending": len(self.queue), "files": len(self.files)}
+
+
+def read_records(path, chunk_size=64 * 1024):
+    """Stream (kind, received, payload) tuples from a recording file.
+
+    RAW payloads are bytes, SAMPLE, LINK_SAMPLE and META payloads are dicts and STATUS
+    payloads are str. The file is read in chunks, never loaded whole; a
+    truncated final record (e.g. after a crash) is ignored.
+    """
+    decompressor = zlib.decompressobj() if path.endswith(".z") else None
+    buffer = bytearray()
+    header_size = _RECORD.size
+    with open(path, "rb") as f:
+        while True:
+            data = f.read(chunk_size)
+            if not data:
+                break
+            buffer += decompressor.decompress(data) if decompressor is not None else data
+            offset = 0
+            while len(buffer) - offset >= header_size:
+                kind, received, length = _RECORD.unpack_from(buffer, offset)
+                end = offset + header_size + length
+                if end > len(buffer):
+                    break
+                payload = bytes(buffer[offset + header_size:end])
+                offset = end
+                if kind in (SAMPLE, LINK_SAMPLE, META):
+                    payload = json.loads(payload)
+                elif kind == STATUS:
+                    payload = payload.decode("utf-8", "replace")
+                yield kind, received, payload
+            del buffer[:offset]
@@ -0,0 +1,159 @@
+import threading
+import time
+from itertools import groupby
+from globalFuncionality.session_recorder import RAW, read_records
+
+
+def _iter_recording(paths):
+    """Yield (offset_seconds, raw_bytes) for every RAW record of one or more recording files."""
+    first = None
+    for path in paths:
+        for kind, received, payload in read_records(path):
+            if kind != RAW:
+                continue
+            if first is None:
+                first = received
+            yield received - first, payload
+
+
+def _iter_text_log(path, line_period, lines_per_chunk=64):
+    """Yield (offset_seconds, raw_bytes) from a plain text log such as serial_log.txt.
+
+    Text logs carry no timing, so lines are spaced line_period seconds apart
+    (or grouped into chunks with no timing at all when line_period is None).
+    """
+    with open(path, "rb") as f:
+        if line_period is None:
+            while True:
+                chunk = b"".join(line for _, line in zip(range(lines_per_chunk), f))
+                if not chunk:
+                    return
+                yield 0.0, chunk
+        for i, line in enumerate(f):
+            yield i * line_period, line
+
+
+class ReplaySerial:
+    """Stand-in for serial.Serial that plays a recorded session back.
+
+    Bytes are released on the original timing divided by `speed` (speed=None
+    plays as fast as the reader can consume them). Records are streamed from
+    disk, so arbitrarily large logs use constant memory. Recording files
+    (.hrec, .hrec.z) and text logs can be mixed; each file continues where
+    the previous one ended. seek() jumps to an offset in seconds from the
+    start; the reader sees read_generation change with the first bytes after
+    the jump, and should drop its partial line or frame then.
+    """
+
+    def __init__(self, paths, speed=1.0, timeout=1, line_period=None):
+        if isinstance(paths, str):
+            paths = [paths]
+        self.paths = sorted(paths)  # Rotated files sort in recording order
+        self.speed = speed
+        self.timeout = timeout
+        self.line_period = line_period  # Spacing used for plain text logs
+        self.is_open = True
+        self.finished = False
+        self.bytes_read = 0
+        self.lock = threading.Lock()
+        self.generation = 0  # Number of seek() calls
+        self.read_generation = 0  # Generation of the bytes returned by the last read()
+        self._seek_to(0.0)
+
+    def _records(self):
+        """Yield (offset_seconds, raw_bytes) over every path, in order."""
+        end = 0.0
+        for recording, group in groupby(self.paths, key=lambda path: ".hrec" in path):
+            # Consecutive recording files (rotations of one session) share their time origin
+            segments = [_iter_recording(list(group))] if recording else [
+                _iter_text_log(path, self.line_period) for path in group]
+            for segment in segments:
+                start = end
+                for offset, data in segment:
+                    end = start + offset
+                    yield end, data
+
+    def _seek_to(self, offset):
+        """Restart the record stream and skip everything before offset."""
+        self._source = self._records()
+        self._next = None
+        self._pending = b""
+        self.finished = False
+        self.position = offset  # Recording time of the last released record
+        for record in self._source:
+            if record[0] >= offset:
+                self._next = record
+                break
+        else:
+            self.finished = True
+        self._start_wall = time.monotonic()
+        self._start_offset = offset
+
+    def seek(self, seconds):
+        """Continue playback from `seconds` after the start of the recording."""
+        with self.lock:
+            self.generation += 1
+            self._seek_to(max(0.0, seconds))
+
+    def _due_in(self, offset):
+        """Seconds until a record at `offset` should be released (<= 0 means now)."""
+        if not self.speed:
+            return 0.0
+        return self._start_wall + (offset - self._start_offset) / self.speed - time.monotonic()
+
+    def _advance(self):
+        """Move the next record into the pending buffer if it is due; returns the wait otherwise."""
+        if self._next is None:
+            self.finished = True
+            return None
+        offset, data = self._next
+        wait = self._due_in(offset)
+        if wait > 0:
+            return wait
+        self._pending = memoryview(data)
+        self.position = offset
+        self._next = next(self._source, None)
+        return 0.0
+
+    @property
+    def in_waiting(self):
+        """Number of bytes that are due and can be read without blocking."""
+        with self.lock:
+            if not self._pending:
+                self._advance()
+            return len(self._pending)
+
+    def read(self, size=1):
+        """Return up to `size` due bytes, blocking for at most `timeout` seconds like pyserial."""
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        out = bytearray()
+        while len(out) < size and self.is_open:
+            with self.lock:
+                wait = 0.0 if self._pending else self._advance()
+                if self._pending:
+                    if self.read_generation != self.generation:
+                        out.clear()  # Bytes from before a seek() must not run into the ones after it
+                        self.read_generation = self.generation
+                    take = size - len(out)
+                    out += self._pending[:take]
+                    self._pending = self._pending[take:]
+                    continue
+            if out:
+                break  # Return what is available instead of waiting for the next record
+            if wait is None:
+                wait = 0.05  # End of recording: behave like an idle port
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                wait = min(wait, remaining)
+            time.sleep(min(wait, 0.05))  # Short naps so seek() and close() take effect quickly
+        self.bytes_read += len(out)
+        return bytes(out)
+
+    def write(self, data):
+        """Commands sent during a replay go nowhere."""
+        return len(data)
+
+    def close(self):
+        self.is_open = False
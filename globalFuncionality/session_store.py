@@ -0,0 +1,417 @@
+"""Append-only columnar session files with a chunk index, for fast time-range queries.
+
+Import old logs, then query them:
+
+    python -m globalFuncionality.session_store import serial_log.txt recordings/*.hrec.z --out sessions
+    python -m globalFuncionality.session_store max sessions/serial_log-001 "Avg Altitude"
+    python -m globalFuncionality.session_store range sessions/serial_log-001 120 130
+"""
+import argparse
+import bisect
+import json
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from array import array
+from collections import deque
+from globalFuncionality.session_recorder import LINK_SAMPLE, SAMPLE, read_records
+from globalFuncionality.telemetry_parser import FIELD_MAP, TelemetryParser, parse_literal_sample
+
+META_FILE = "meta.json"
+INDEX_FILE = "index.bin"
+TIME_FILE = "time.f64"
+# Index entry per chunk: first row, row count, first and last time; then min and max of every column.
+_CHUNK = struct.Struct("<QI4xdd")
+_NAN = math.nan
+
+
+def _summary(values):
+    """(min, max) of the non-NaN values, or NaNs if there are none."""
+    present = [v for v in values if v == v]
+    if not present:
+        return _NAN, _NAN
+    return min(present), max(present)
+
+
+class ColumnarSessionWriter:
+    """Writes parsed samples of one session as one float64 file per field plus a time column.
+
+    Samples are buffered in memory and written as a chunk every
+    chunk_rows samples or chunk_seconds of data, whichever comes first. The
+    chunk's entry (row range, time range and per-column min/max) is appended
+    to the index only after its columns are written, so a reader never sees
+    a partial chunk. Times are stored in seconds since the session's first
+    sample; fields missing from a sample are stored as NaN. append() has
+    the TelemetryStore signature.
+
+    With background=True (live sessions) the files are written by a writer
+    thread: append() only buffers and hands complete chunks to a queue of
+    at most max_pending chunks. If the disk falls that far behind, newer
+    chunks are dropped (`dropped_rows`) instead of blocking the publisher.
+    """
+
+    def __init__(self, directory, fields=None, chunk_rows=4096, chunk_seconds=5.0, meta=None, background=False,
+                 max_pending=64):
+        self.directory = directory
+        self.fields = list(fields if fields is not None else FIELD_MAP.values())
+        self.chunk_rows = chunk_rows
+        self.chunk_seconds = chunk_seconds
+        if os.path.exists(os.path.join(directory, META_FILE)):
+            raise FileExistsError(f"Session {directory} already exists")
+        os.makedirs(directory, exist_ok=True)
+        columns = {field: f"c{i:03d}.f64" for i, field in enumerate(self.fields)}
+        info = {"version": 1, "fields": self.fields, "columns": columns, "time": TIME_FILE,
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"), "chunk_rows": chunk_rows}
+        info.update(meta or {})
+        with open(os.path.join(directory, META_FILE), "w", encoding="utf-8") as f:
+            json.dump(info, f, indent=2)
+        self._time_file = open(os.path.join(directory, TIME_FILE), "ab")
+        self._column_files = [open(os.path.join(directory, columns[field]), "ab") for field in self.fields]
+        self._index_file = open(os.path.join(directory, INDEX_FILE), "ab")
+        self._entry = struct.Struct(_CHUNK.format + "d" * (2 * len(self.fields)))
+        self._times = array("d")
+        self._columns = [array("d") for _ in self.fields]
+        self.origin = None  # Receive time of the first sample
+        self.last_time = 0.0
+        self.rows = 0  # Rows written to disk
+        self.chunks = 0
+        self.time_regressions = 0  # Samples stamped earlier than their predecessor (stored at its time)
+        self.closed = False
+        self.pending = deque()  # Complete chunks (times, columns) waiting for the writer thread
+        self.max_pending = max_pending
+        self.dropped_rows = 0
+        self.thread = None
+        self._wakeup = threading.Event()
+        if background:
+            self.thread = threading.Thread(target=self._run, name="ColumnarSessionWriter", daemon=True)
+            self.thread.start()
+
+    def append(self, sample, timestamp, source=None):
+        """Buffer one sample received at `timestamp`; writes a chunk when one is complete."""
+        if self.origin is None:
+            self.origin = timestamp
+        t = timestamp - self.origin
+        if t < self.last_time:
+            self.time_regressions += 1
+            t = self.last_time  # Keep the time column sorted for the index
+        self.last_time = t
+        self._times.append(t)
+        get = sample.get
+        for field, column in zip(self.fields, self._columns):
+            value = get(field)
+            column.append(_NAN if value is None else value)
+        times = self._times
+        if len(times) >= self.chunk_rows or times[-1] - times[0] >= self.chunk_seconds:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered rows as one chunk (or queue it for the writer thread)."""
+        times = self._times
+        if not times or self.closed:
+            return
+        columns = self._columns
+        self._times = array("d")
+        self._columns = [array("d") for _ in self.fields]
+        if self.thread is None:
+            self._write_chunk(times, columns)
+        elif len(self.pending) >= self.max_pending:
+            self.dropped_rows += len(times)
+        else:
+            self.pending.append((times, columns))
+            self._wakeup.set()
+
+    def _run(self):
+        """Writer thread: write queued chunks until closed."""
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            pending = self.pending
+            # close() queues the last chunk before setting closed, so once closed
+            # has been seen, the drain below is guaranteed to include that chunk.
+            closed = self.closed
+            while pending:
+                self._write_chunk(*pending.popleft())
+            if closed:
+                break
+
+    def _write_chunk(self, times, columns):
+        """Write one chunk's columns, then its index entry."""
+        summaries = []
+        for column, f in zip(columns, self._column_files):
+            column.tofile(f)
+            f.flush()
+            summaries.extend(_summary(column))
+        times.tofile(self._time_file)
+        self._time_file.flush()
+        self._index_file.write(self._entry.pack(self.rows, len(times), times[0], times[-1], *summaries))
+        self._index_file.flush()
+        self.rows += len(times)
+        self.chunks += 1
+
+    def close(self):
+        """Write the last partial chunk and close the files."""
+        if self.closed:
+            return
+        self.flush()
+        self.closed = True
+        if self.thread is not None:
+            self._wakeup.set()
+            self.thread.join()
+        for f in [self._time_file, self._index_file] + self._column_files:
+            f.close()
+
+    def stats(self):
+        return {"directory": self.directory, "rows": self.rows, "chunks": self.chunks,
+                "buffered": len(self._times), "pending": len(self.pending), "dropped_rows": self.dropped_rows,
+                "time_regressions": self.time_regressions}
+
+
+class ColumnarSession:
+    """Read-only view of a session written by ColumnarSessionWriter.
+
+    The index is small and read whole; column files are memory-mapped and
+    only the chunks a query needs are touched (`chunks_read` counts them).
+    Call refresh() to see chunks written since the session was opened.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, META_FILE), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.fields = self.meta["fields"]
+        self._entry = struct.Struct(_CHUNK.format + "d" * (2 * len(self.fields)))
+        self._maps = {}  # File name -> (file, mmap, memoryview of doubles)
+        self.chunks_read = 0
+        self.refresh()
+
+    def refresh(self):
+        """Re-read the index (and remap the columns on next use)."""
+        self._unmap()
+        with open(os.path.join(self.directory, INDEX_FILE), "rb") as f:
+            data = f.read()
+        count = len(data) // self._entry.size
+        self.row_starts = array("q")
+        self.row_counts = array("q")
+        self.t_min = array("d")  # Sparse time index: first time of every chunk
+        self.t_max = array("d")
+        self.mins = {field: array("d") for field in self.fields}
+        self.maxs = {field: array("d") for field in self.fields}
+        for entry in self._entry.iter_unpack(data[:count * self._entry.size]):
+            self.row_starts.append(entry[0])
+            self.row_counts.append(entry[1])
+            self.t_min.append(entry[2])
+            self.t_max.append(entry[3])
+            for i, field in enumerate(self.fields):
+                self.mins[field].append(entry[4 + 2 * i])
+                self.maxs[field].append(entry[5 + 2 * i])
+        self.rows = self.row_starts[-1] + self.row_counts[-1] if count else 0
+
+    def __len__(self):
+        return self.rows
+
+    @property
+    def duration(self):
+        return self.t_max[-1] if self.rows else 0.0
+
+    def _column(self, field):
+        """Memoryview of doubles over the committed rows of a column (or the time column for None)."""
+        name = self.meta["time"] if field is None else self.meta["columns"][field]
+        mapped = self._maps.get(name)
+        if mapped is None:
+            f = open(os.path.join(self.directory, name), "rb")
+            mm = mmap.mmap(f.fileno(), self.rows * 8, access=mmap.ACCESS_READ)
+            mapped = self._maps[name] = (f, mm, memoryview(mm).cast("d"))
+        return mapped[2]
+
+    def _chunk_range(self, start, end):
+        """Indices of the chunks that may hold rows with start <= time <= end."""
+        return range(bisect.bisect_left(self.t_max, start), bisect.bisect_right(self.t_min, end))
+
+    def range(self, start, end, fields=None):
+        """Return {"time": array, field: array, ...} for the rows with start <= time <= end."""
+        fields = self.fields if fields is None else list(fields)
+        out = {"time": array("d")}
+        out.update((field, array("d")) for field in fields)
+        if not self.rows:
+            return out
+        times = self._column(None)
+        columns = [(out[field], self._column(field)) for field in fields]
+        for chunk in self._chunk_range(start, end):
+            first = self.row_starts[chunk]
+            last = first + self.row_counts[chunk]
+            self.chunks_read += 1
+            # Only the boundary chunks need a search; rows are sorted by time.
+            lo = bisect.bisect_left(times, start, first, last) if self.t_min[chunk] < start else first
+            hi = bisect.bisect_right(times, end, lo, last) if self.t_max[chunk] > end else last
+            out["time"].frombytes(times[lo:hi].cast("B"))
+            for target, column in columns:
+                target.frombytes(column[lo:hi].cast("B"))
+        return out
+
+    def around(self, center, seconds):
+        """Rows within seconds/2 of `center`, e.g. the 10 seconds around apogee."""
+        return self.range(center - seconds / 2, center + seconds / 2)
+
+    def extreme(self, field, largest=True):
+        """Return (time, value) of the largest (or smallest) value of `field`, or None if it has none.
+
+        The per-chunk summaries pick the one chunk holding it; only that chunk is read.
+        """
+        summary = self.maxs[field] if largest else self.mins[field]
+        best = None
+        for chunk, value in enumerate(summary):
+            if value == value and (best is None or (value > summary[best] if largest else value < summary[best])):
+                best = chunk
+        if best is None:
+            return None
+        target = summary[best]
+        first = self.row_starts[best]
+        column = self._column(field)
+        self.chunks_read += 1
+        for row in range(first, first + self.row_counts[best]):
+            if column[row] == target:
+                return self._column(None)[row], target
+        return None
+
+    def max(self, field):
+        return self.extreme(field, True)
+
+    def min(self, field):
+        return self.extreme(field, False)
+
+    def _unmap(self):
+        for f, mm, view in self._maps.values():
+            view.release()
+            mm.close()
+            f.close()
+        self._maps = {}
+
+    def close(self):
+        self._unmap()
+
+
+def list_sessions(root):
+    """Return the session directories under `root`, oldest first."""
+    if not os.path.isdir(root):
+        return []
+    found = [os.path.join(root, name) for name in os.listdir(root)
+             if os.path.isfile(os.path.join(root, name, META_FILE))]
+    return sorted(found, key=lambda path: os.path.getmtime(os.path.join(path, META_FILE)))
+
+
+def _next_directory(root, stem):
+    for n in range(1, 10000):
+        path = os.path.join(root, f"{stem}-{n:03d}")
+        if not os.path.exists(path):
+            return path
+    raise FileExistsError(f"Too many sessions named {stem} in {root}")
+
+
+def import_text_log(path, root, line_period=0.1, field_map=FIELD_MAP, **options):
+    """Convert a text log such as serial_log.txt into sessions; returns their directories.
+
+    The log is streamed line by line. Every "Connected to ..." line (or a
+    previous console log being appended to) starts a new session. Text logs
+    carry no timing, so consecutive samples are spaced line_period seconds
+    apart. options are passed to ColumnarSessionWriter; chunks default to
+    60 s of data, since an import needs no crash-safe flushing.
+    """
+    options.setdefault("chunk_seconds", 60.0)
+    parser = TelemetryParser(field_map)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    directories = []
+    writer = None
+    clock = 0.0
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("Connected to"):
+                if writer is not None:
+                    writer.close()
+                    writer = None
+                continue
+            sample = parse_literal_sample(line, field_map) if line.startswith("{") else parser.parse(line)
+            if not isinstance(sample, dict) or not sample:
+                continue
+            if writer is None:
+                writer = ColumnarSessionWriter(_next_directory(root, stem), meta={"imported_from": path,
+                                                                                  "line_period": line_period},
+                                               **options)
+                directories.append(writer.directory)
+                clock = 0.0
+            writer.append(sample, clock)
+            clock += line_period
+    if writer is not None:
+        writer.close()
+    return directories
+
+
+def import_recording(paths, root, **options):
+    """Convert SessionRecorder file(s) (.hrec, .hrec.z) into one session; returns its directory or None."""
+    if isinstance(paths, str):
+        paths = [paths]
+    options.setdefault("chunk_seconds", 60.0)
+    stem = os.path.basename(paths[0]).split(".")[0]
+    writer = None
+    for path in paths:
+        for kind, received, payload in read_records(path):
+            if kind == LINK_SAMPLE:
+                payload = payload["sample"]
+            elif kind != SAMPLE:
+                continue
+            if writer is None:
+                writer = ColumnarSessionWriter(_next_directory(root, stem), meta={"imported_from": list(paths)},
+                                               **options)
+            writer.append(payload, received)
+    if writer is None:
+        return None
+    writer.close()
+    return writer.directory
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Columnar flight session store")
+    commands = parser.add_subparsers(dest="command", required=True)
+    imports = commands.add_parser("import", help="convert serial_log.txt files and recordings into sessions")
+    imports.add_argument("paths", nargs="+")
+    imports.add_argument("--out", default="sessions", help="directory to create the sessions in")
+    imports.add_argument("--line-period", type=float, default=0.1,
+                         help="seconds between samples of text logs, which carry no timing (default: 0.1)")
+    extreme = commands.add_parser("max", help="print the time and value of a field's maximum")
+    extreme.add_argument("session")
+    extreme.add_argument("field")
+    query = commands.add_parser("range", help="print the rows between two session times (seconds)")
+    query.add_argument("session")
+    query.add_argument("start", type=float)
+    query.add_argument("end", type=float)
+    args = parser.parse_args(argv)
+
+    if args.command == "import":
+        for path in args.paths:
+            if ".hrec" in os.path.basename(path):
+                created = [import_recording(path, args.out)]
+            else:
+                created = import_text_log(path, args.out, args.line_period)
+            for directory in filter(None, created):
+                print(f"{path} -> {directory} ({len(ColumnarSession(directory))} rows)")
+        return
+    session = ColumnarSession(args.session)
+    if args.command == "max":
+        found = session.max(args.field)
+        print("no values" if found is None else f"{args.field} max {found[1]} at {found[0]:.3f} s")
+    else:
+        rows = session.range(args.start, args.end)
+        fields = [field for field in session.fields if any(v == v for v in rows[field])]
+        print("\t".join(["time"] + fields))
+        for i, t in enumerate(rows["time"]):
+            print("\t".join([f"{t:.3f}"] + [f"{rows[field][i]:g}" for field in fields]))
+    print(f"({session.chunks_read} of {len(session.row_starts)} chunks read)")
+
+
+if __name__ == "__main__":
+    main()
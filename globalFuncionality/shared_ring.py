@@ -0,0 +1,122 @@
+import math
+import struct
+from multiprocessing import shared_memory
+
+# Header: magic, record capacity, field count, padding, records written so far.
+_HEADER = struct.Struct("<4sII4xQ")
+_MAGIC = b"HRNG"
+_COUNT_OFFSET = 16  # Offset of the records-written counter inside the header
+_COUNT = struct.Struct("<Q")
+MAX_FIELDS = 64  # One bit per field in the presence mask
+
+
+def _record_struct(fields):
+    """Record layout: sequence number, receive time, presence bitmask, one float64 per field."""
+    if len(fields) > MAX_FIELDS:
+        raise ValueError(f"A shared ring holds at most {MAX_FIELDS} fields")
+    return struct.Struct(f"<QdQ{len(fields)}d")
+
+
+class SharedRingReader:
+    """Creates a shared-memory ring of parsed samples and reads what a writer process puts in it.
+
+    Every record has the same fixed layout (see _record_struct), so no
+    serialization is involved. The reader owns the block and removes it on
+    close(). A reader that falls more than `capacity` records behind skips
+    ahead and counts the lost records in `overruns`.
+    """
+
+    def __init__(self, fields, capacity=65536):
+        self.fields = list(fields)
+        self.capacity = capacity
+        self.record = _record_struct(self.fields)
+        self.shm = shared_memory.SharedMemory(create=True, size=_HEADER.size + capacity * self.record.size)
+        self.name = self.shm.name  # Pass to SharedRingWriter in the other process
+        _HEADER.pack_into(self.shm.buf, 0, _MAGIC, capacity, len(self.fields), 0)
+        self.cursor = 0  # Sequence number of the next record to read
+        self.overruns = 0
+
+    def pending(self):
+        """Return the number of records written but not yet read."""
+        return _COUNT.unpack_from(self.shm.buf, _COUNT_OFFSET)[0] - self.cursor
+
+    def read(self, max_records=None):
+        """Return [(timestamp, sample dict), ...] for the records written since the last read."""
+        buf = self.shm.buf
+        count = _COUNT.unpack_from(buf, _COUNT_OFFSET)[0]
+        cursor = self.cursor
+        capacity = self.capacity
+        if count - cursor > capacity:
+            self.overruns += count - cursor - capacity
+            cursor = count - capacity
+        if max_records is not None:
+            count = min(count, cursor + max_records)
+        size = self.record.size
+        unpack = self.record.unpack_from
+        fields = self.fields
+        width = len(fields)
+        records = [unpack(buf, _HEADER.size + (seq % capacity) * size) for seq in range(cursor, count)]
+        # Records the writer may have started overwriting while we copied them are discarded.
+        oldest_valid = _COUNT.unpack_from(buf, _COUNT_OFFSET)[0] - capacity + 1
+        out = []
+        for seq, record in zip(range(cursor, count), records):
+            if seq < oldest_valid or record[0] != seq:
+                self.overruns += 1
+                continue
+            mask = record[2]
+            out.append((record[1], {fields[i]: record[3 + i] for i in range(width) if mask >> i & 1}))
+        self.cursor = count
+        return out
+
+    def close(self):
+        """Unmap and remove the block."""
+        self.shm.close()
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SharedRingWriter:
+    """Producer side: attaches to a ring created by SharedRingReader. There must be only one writer.
+
+    append() has the TelemetryStore signature, so the writer can be handed
+    to a SerialConnection in place of its store.
+    """
+
+    def __init__(self, name, fields):
+        # A spawned writer shares the reader's resource tracker, so only the
+        # reader's close() removes the block.
+        self.shm = shared_memory.SharedMemory(name=name)
+        magic, self.capacity, field_count, self.count = _HEADER.unpack_from(self.shm.buf, 0)
+        if magic != _MAGIC or field_count != len(fields):
+            raise ValueError(f"Shared memory {name!r} is not a telemetry ring with {len(fields)} fields")
+        self.fields = list(fields)
+        self.index = {field: i for i, field in enumerate(self.fields)}
+        self.record = _record_struct(self.fields)
+        self.unknown_fields = 0  # Values of keys outside `fields`, which are not transported
+        self.nan_row = [math.nan] * len(self.fields)
+
+    def append(self, sample, timestamp, source=None):
+        """Write one sample dict received at `timestamp` (time.monotonic, which is system-wide)."""
+        values = list(self.nan_row)
+        mask = 0
+        index = self.index
+        for key, value in sample.items():
+            i = index.get(key)
+            if i is None:
+                self.unknown_fields += 1
+                continue
+            values[i] = value
+            mask |= 1 << i
+        count = self.count
+        buf = self.shm.buf
+        self.record.pack_into(buf, _HEADER.size + (count % self.capacity) * self.record.size, count, timestamp,
+                              mask, *values)
+        # Publish the record only after it has been written completely.
+        self.count = count + 1
+        _COUNT.pack_into(buf, _COUNT_OFFSET, self.count)
+
+    def close(self):
+        """Unmap the block (the reader removes it)."""
+        self.shm.close()
@@ -0,0 +1,61 @@
+import logging
+import threading
+import time
+from globalFuncionality.telemetry_bus import SAMPLE
+
+_IMPORTED = time.monotonic()  # Import this module first so this approximates process start
+log = logging.getLogger(__name__)
+
+
+class StartupTimer:
+    """Records when each startup phase finished, relative to process start.
+
+    mark() may be called from any thread. watch(bus) adds a final
+    "first_telemetry" phase when the first sample is published, which is
+    the number we actually care about: time until the operator sees data.
+    """
+
+    def __init__(self, start=None):
+        self.start = _IMPORTED if start is None else start
+        self.phases = []  # (name, seconds since start, seconds since previous mark)
+        self.lock = threading.Lock()
+        self._last = self.start
+        self._subscription = None
+        self._bus = None
+
+    def mark(self, name):
+        """Record that phase `name` just finished; returns seconds since start."""
+        now = time.monotonic()
+        with self.lock:
+            self.phases.append((name, now - self.start, now - self._last))
+            self._last = now
+        return now - self.start
+
+    def watch(self, bus):
+        """Mark "first_telemetry" and log the report when the first sample is published on `bus`."""
+        self._bus = bus
+        self._subscription = bus.subscribe(self._on_first_sample, kinds=(SAMPLE,), immediate=True)
+
+    def _on_first_sample(self, sample):
+        with self.lock:
+            subscription, self._subscription = self._subscription, None
+        if subscription is None:
+            return  # Another reader thread got there first
+        self._bus.unsubscribe(subscription)
+        self.mark("first_telemetry")
+        log.info("%s", self.report())
+
+    def elapsed(self, name):
+        """Return seconds from start to phase `name`, or None if it has not happened."""
+        with self.lock:
+            for phase, total, _ in self.phases:
+                if phase == name:
+                    return total
+        return None
+
+    def report(self):
+        """Return a one-line summary: phase=total ms (+ms of that phase)."""
+        with self.lock:
+            phases = list(self.phases)
+        return "Startup: " + ", ".join(f"{name}={total * 1000:.0f}ms (+{step * 1000:.0f})"
+                                       for name, total, step in phases)
@@ -0,0 +1,45 @@
+from globalFuncionality.binary_protocol import BinaryFrameDecoder, detect_protocol
+from globalFuncionality.line_framer import LineFramer
+
+
+class StreamDecoder:
+    """Turns the raw byte stream of one link into parsed results.
+
+    The wire format is "text" ("Label: value" lines, parsed with `parse`),
+    "binary" (COBS frames) or "auto", which decides from the first bytes
+    after every reset().
+    """
+
+    def __init__(self, parse, protocol="auto", detect_limit=1024):
+        self.parse = parse  # Callable turning one text line into a dict or a ParseError
+        self.protocol = protocol
+        self.detect_limit = detect_limit  # Undecided bytes after which text is assumed
+        self.framer = LineFramer()
+        self.binary_decoder = BinaryFrameDecoder()
+        self.active_protocol = None
+        self._detect_buffer = bytearray()
+        self.reset()
+
+    def reset(self):
+        """Forget partial data and, in auto mode, the detected format (e.g. after reconnecting)."""
+        self.framer.reset()
+        self.binary_decoder.reset()
+        self._detect_buffer.clear()
+        self.active_protocol = None if self.protocol == "auto" else self.protocol
+
+    def feed(self, chunk):
+        """Return the parsed results (sample dicts or ParseErrors) completed by `chunk`."""
+        if self.active_protocol is None:
+            self._detect_buffer += chunk
+            detected = detect_protocol(self._detect_buffer)
+            if detected is None:
+                if len(self._detect_buffer) < self.detect_limit:
+                    return []  # Wait for more bytes before deciding
+                detected = "text"
+            self.active_protocol = detected
+            chunk = bytes(self._detect_buffer)
+            self._detect_buffer.clear()
+        if self.active_protocol == "binary":
+            return self.binary_decoder.feed(chunk)
+        parse = self.parse
+        return [parse(line) for line in self.framer.feed(chunk)]
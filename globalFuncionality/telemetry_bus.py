@@ -0,0 +1,210 @@
+import logging
+import threading
+import time
+from collections import deque
+
+log = logging.getLogger(__name__)
+
+SAMPLE = "sample"  # Parsed telemetry dict
+STATUS = "status"  # Connection status text ("Connected to ...", errors)
+ERROR = "error"  # Line that could not be parsed (ParseError)
+PORTS = "ports"  # List of serial ports after it changed (LinkSupervisor); opt-in, not in ALL_KINDS
+EVENT = "event"  # FlightEvent (launch, apogee, recovery); opt-in, not in ALL_KINDS
+ALL_KINDS = (SAMPLE, STATUS, ERROR)
+
+
+class Subscription:
+    """One consumer of the bus and its pending, not yet delivered, messages.
+
+    policy "latest" keeps only the newest value per field (and the newest
+    message of other kinds); policy "queue" keeps messages in order in a
+    deque of at most `maxlen` entries, dropping the oldest when full.
+    with_source subscriptions receive (source, message) tuples, which are
+    never merged per field.
+    """
+
+    __slots__ = ("callback", "kinds", "fields", "sources", "with_source", "policy", "immediate", "pending",
+                 "pending_fields", "delivered", "dropped")
+
+    def __init__(self, callback, kinds, fields, policy, maxlen, immediate, sources=None, with_source=False):
+        if policy not in ("latest", "queue"):
+            raise ValueError(f"Unknown delivery policy: {policy}")
+        self.callback = callback
+        self.kinds = frozenset(kinds)
+        self.fields = frozenset(fields) if fields is not None else None
+        self.sources = frozenset(sources) if sources is not None else None  # Link names to accept
+        self.with_source = with_source  # Deliver (source, message) tuples instead of bare messages
+        self.policy = policy
+        self.immediate = immediate  # Call on the publishing thread instead of at the next drain
+        self.pending = deque(maxlen=maxlen)
+        self.pending_fields = {}  # "latest" policy: merged field values since the last drain
+        self.delivered = 0
+        self.dropped = 0  # Messages discarded by the queue bound or overwritten by a newer value
+
+    def stats(self):
+        """Return delivery counters for this subscription."""
+        name = getattr(self.callback, "__qualname__", repr(self.callback))
+        return {"callback": name, "policy": self.policy, "delivered": self.delivered, "dropped": self.dropped,
+                "pending": len(self.pending) + bool(self.pending_fields)}
+
+
+class TelemetryBus:
+    """Publish/subscribe hub between the serial reader thread and its consumers.
+
+    publish() only appends to bounded per-subscriber buffers under a short
+    lock, so a slow consumer can never stall the reader. drain() delivers
+    everything pending in one batch; attach() runs it once per frame on the
+    Tk main loop, so callbacks always execute on the UI thread.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscriptions = []
+        self.published = 0
+        self.callback_errors = 0
+        self.pollers = []  # Called at the start of every drain to pull in data from other sources
+        self.metrics = None  # PipelineMetrics receiving delivery latency and callback time
+        self._pending_since = None  # When the oldest undelivered message was queued
+        self._widget = None
+        self._interval = None
+
+    def subscribe(self, callback, kinds=ALL_KINDS, fields=None, policy="queue", maxlen=1024, immediate=False,
+                  sources=None, with_source=False):
+        """Register a consumer and return its Subscription.
+
+        fields restricts sample delivery to those keys (each delivery is a dict
+        with just the subscribed fields); kinds selects message types and
+        sources the links (by name) when several are multiplexed.
+        """
+        subscription = Subscription(callback, kinds, fields, policy, maxlen, immediate, sources, with_source)
+        with self.lock:
+            self.subscriptions = self.subscriptions + [subscription]
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """Stop delivering to a subscription."""
+        with self.lock:
+            self.subscriptions = [s for s in self.subscriptions if s is not subscription]
+
+    def publish(self, message, kind, source=None):
+        """Queue a message for every matching subscriber. Safe to call from any thread."""
+        immediate = []
+        with self.lock:
+            self.published += 1
+            if self._pending_since is None:
+                self._pending_since = time.monotonic()
+            for subscription in self.subscriptions:
+                if kind not in subscription.kinds:
+                    continue
+                if subscription.sources is not None and source not in subscription.sources:
+                    continue
+                payload = message
+                if kind == SAMPLE and subscription.fields is not None:
+                    payload = {k: v for k, v in message.items() if k in subscription.fields}
+                    if not payload:
+                        continue
+                if subscription.with_source:
+                    payload = (source, payload)
+                if subscription.immediate:
+                    immediate.append((subscription, payload))
+                elif subscription.policy == "latest" and kind == SAMPLE and not subscription.with_source:
+                    pending = subscription.pending_fields
+                    before = len(pending)
+                    pending.update(payload)
+                    subscription.dropped += before + len(payload) - len(pending)
+                else:
+                    pending = subscription.pending
+                    if len(pending) == pending.maxlen:
+                        subscription.dropped += 1
+                    elif subscription.policy == "latest" and pending:
+                        pending.clear()
+                        subscription.dropped += 1
+                    pending.append(payload)
+        for subscription, payload in immediate:
+            if self._deliver(subscription, payload):
+                with self.lock:
+                    subscription.delivered += 1
+
+    def add_poller(self, poll):
+        """Call poll() at the start of every drain (e.g. to read samples produced by another process)."""
+        self.pollers = self.pollers + [poll]
+
+    def remove_poller(self, poll):
+        """Stop calling a poller added with add_poller()."""
+        self.pollers = [p for p in self.pollers if p != poll]
+
+    def drain(self):
+        """Deliver everything pending on the calling thread; returns the number of deliveries."""
+        for poll in self.pollers:
+            try:
+                poll()
+            except Exception as e:
+                with self.lock:
+                    self.callback_errors += 1
+                log.error("Telemetry bus poller %r failed: %s", poll, e)
+        batches = []
+        with self.lock:
+            pending_since, self._pending_since = self._pending_since, None
+            for subscription in self.subscriptions:
+                if subscription.pending_fields:
+                    batches.append((subscription, [subscription.pending_fields]))
+                    subscription.pending_fields = {}
+                if subscription.pending:
+                    batches.append((subscription, list(subscription.pending)))
+                    subscription.pending.clear()
+        metrics = self.metrics
+        if metrics is not None and metrics.enabled and batches:
+            start = time.monotonic()
+            if pending_since is not None:
+                metrics.observe("bus_latency", start - pending_since)  # Wait of the oldest message
+        count = 0
+        for subscription, messages in batches:
+            delivered = 0
+            for message in messages:
+                delivered += self._deliver(subscription, message)
+                count += 1
+            with self.lock:
+                subscription.delivered += delivered
+        if metrics is not None and metrics.enabled and batches:
+            metrics.observe("callbacks", time.monotonic() - start)
+        return count
+
+    def _deliver(self, subscription, message):
+        """Invoke one callback, isolating the bus from consumer errors; returns True on success.
+
+        Immediate subscriptions are delivered on the publishing threads, so the
+        callers count deliveries under the bus lock.
+        """
+        try:
+            subscription.callback(message)
+            return True
+        except Exception as e:
+            with self.lock:
+                self.callback_errors += 1
+            log.error("Telemetry bus callback %r failed: %s", subscription.callback, e)
+            return False
+
+    def attach(self, widget, interval_ms=33):
+        """Drain the bus on the Tk main loop of `widget` once per frame."""
+        self._widget = widget
+        self._interval = interval_ms
+        widget.after(interval_ms, self._drain_tick)
+
+    def _drain_tick(self):
+        """Tk callback: drain, then schedule the next frame."""
+        try:
+            self.drain()
+        finally:
+            if self._widget is not None:
+                self._widget.after(self._interval, self._drain_tick)
+
+    def detach(self):
+        """Stop the Tk drain loop started by attach()."""
+        self._widget = None
+
+    def stats(self):
+        """Return bus-wide and per-subscription counters."""
+        with self.lock:
+            subscriptions = [s.stats() for s in self.subscriptions]
+            return {"published": self.published, "callback_errors": self.callback_errors,
+                    "subscriptions": subscriptions}
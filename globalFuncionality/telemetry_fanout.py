@@ -0,0 +1,543 @@
+"""Re-broadcast parsed telemetry to other machines over TCP and/or UDP multicast.
+
+Run a listening client (prints every sample):
+
+    python -m globalFuncionality.telemetry_fanout HOST PORT
+    python -m globalFuncionality.telemetry_fanout --multicast 239.255.42.1 5761
+"""
+import argparse
+import itertools
+import logging
+import selectors
+import socket
+import struct
+import threading
+import time
+from collections import deque
+from globalFuncionality.telemetry_bus import ERROR, EVENT, SAMPLE, STATUS
+
+log = logging.getLogger(__name__)
+
+# Every message is a u32 body length followed by the body, whose first byte is the message type.
+# FIELDS  (id:u8, name length:u8, name)...             field id dictionary, sent before ids are used
+# SAMPLE  seq:u32, sent:f64, source length:u8, source, (id:u8, value:f64)...
+# TEXT    kind length:u8, kind, utf-8 text              status, error and flight event messages
+MSG_FIELDS = 1
+MSG_SAMPLE = 2
+MSG_TEXT = 3
+_LENGTH = struct.Struct("<I")
+_SAMPLE_HEADER = struct.Struct("<BIdB")
+_VALUE = struct.Struct("<Bd")
+_ENTRY = struct.Struct("<BB")
+MAX_FIELDS = 256
+MAX_MESSAGE = 65000  # Keeps every message inside one UDP datagram
+
+
+class FanoutEncoder:
+    """Builds length-prefixed messages; numbers every field name the first time it is seen."""
+
+    def __init__(self):
+        self.ids = {}  # Field name -> id
+        self.seq = 0
+
+    def fields_message(self, names=None):
+        """Dictionary message for `names` (default: every field numbered so far)."""
+        names = self.ids if names is None else names
+        body = bytearray((MSG_FIELDS,))
+        for name in names:
+            raw = name.encode("utf-8")[:255]
+            body += _ENTRY.pack(self.ids[name], len(raw)) + raw
+        return _LENGTH.pack(len(body)) + body
+
+    def encode_sample(self, sample, source=None, sent=None):
+        """Return the messages for one sample: a dictionary update if it has new fields, then the sample."""
+        ids = self.ids
+        new = [key for key in sample if key not in ids and len(ids) < MAX_FIELDS]
+        messages = []
+        if new:
+            for key in new:
+                ids[key] = len(ids)
+            messages.append(self.fields_message(new))
+        raw_source = (source or "").encode("utf-8")[:255]
+        self.seq = (self.seq + 1) & 0xFFFFFFFF
+        body = bytearray(_SAMPLE_HEADER.pack(MSG_SAMPLE, self.seq, time.time() if sent is None else sent,
+                                             len(raw_source)))
+        body += raw_source
+        pack = _VALUE.pack
+        for key, value in sample.items():
+            field_id = ids.get(key)
+            if field_id is not None and isinstance(value, (int, float)):
+                body += pack(field_id, value)
+        messages.append(_LENGTH.pack(len(body)) + body)
+        return messages
+
+    def encode_text(self, kind, text):
+        raw_kind = kind.encode("utf-8")[:255]
+        body = bytes((MSG_TEXT, len(raw_kind))) + raw_kind + str(text).encode("utf-8")[:MAX_MESSAGE]
+        return _LENGTH.pack(len(body)) + body
+
+
+class FanoutMessage:
+    """One decoded message: kind is "sample" or the text kind ("status", "error", "event")."""
+
+    __slots__ = ("kind", "payload", "source", "seq", "sent")
+
+    def __init__(self, kind, payload, source=None, seq=None, sent=None):
+        self.kind = kind
+        self.payload = payload  # Sample dict, or text
+        self.source = source
+        self.seq = seq
+        self.sent = sent  # Server time.time() when the message was encoded
+
+    def __repr__(self):
+        return f"FanoutMessage({self.kind!r}, {self.payload!r})"
+
+
+class FanoutDecoder:
+    """Client side: turns a byte stream (or UDP datagrams) back into FanoutMessages.
+
+    Samples whose field ids have not been announced yet (e.g. a multicast
+    listener joining mid-flight) lose those fields until the next
+    dictionary message; `unknown_fields` counts them.
+    """
+
+    def __init__(self):
+        self.names = {}  # Field id -> name
+        self.buffer = bytearray()
+        self.messages = 0
+        self.unknown_fields = 0
+        self.last_seq = None
+        self.gaps = 0  # Samples missing from the sequence (dropped for a slow client, or lost datagrams)
+
+    def feed(self, data):
+        """Add received bytes; returns the list of complete FanoutMessages."""
+        buffer = self.buffer
+        buffer += data
+        out = []
+        offset = 0
+        size = len(buffer)
+        while size - offset >= 4:
+            length = _LENGTH.unpack_from(buffer, offset)[0]
+            end = offset + 4 + length
+            if end > size:
+                break
+            message = self._decode(bytes(buffer[offset + 4:end]))
+            if message is not None:
+                out.append(message)
+            offset = end
+        del buffer[:offset]
+        return out
+
+    def _decode(self, body):
+        self.messages += 1
+        kind = body[0]
+        if kind == MSG_SAMPLE:
+            _, seq, sent, source_length = _SAMPLE_HEADER.unpack_from(body)
+            position = _SAMPLE_HEADER.size
+            source = body[position:position + source_length].decode("utf-8") or None
+            position += source_length
+            names = self.names
+            sample = {}
+            for field_id, value in _VALUE.iter_unpack(body[position:]):
+                name = names.get(field_id)
+                if name is None:
+                    self.unknown_fields += 1
+                else:
+                    sample[name] = value
+            if self.last_seq is not None and seq > self.last_seq + 1:
+                self.gaps += seq - self.last_seq - 1
+            self.last_seq = seq
+            return FanoutMessage("sample", sample, source, seq, sent)
+        if kind == MSG_FIELDS:
+            position = 1
+            while position < len(body):
+                field_id, length = _ENTRY.unpack_from(body, position)
+                position += _ENTRY.size
+                self.names[field_id] = body[position:position + length].decode("utf-8")
+                position += length
+            return None
+        if kind == MSG_TEXT:
+            length = body[1]
+            return FanoutMessage(body[2:2 + length].decode("utf-8"), body[2 + length:].decode("utf-8", "replace"))
+        return None
+
+
+class _Client:
+    """One connected TCP client and the messages queued for it."""
+
+    __slots__ = ("sock", "address", "queue", "offset", "in_flight", "queued_bytes", "sent_bytes", "sent_messages",
+                 "dropped", "connected", "writing", "slow")
+
+    def __init__(self, sock, address):
+        self.sock = sock
+        self.address = address
+        self.queue = deque()  # (enqueue time, message bytes)
+        self.offset = 0  # Bytes of queue[0] already sent
+        self.in_flight = 0  # Messages at the front of the queue inside the chunk being sent (not to be dropped)
+        self.queued_bytes = 0
+        self.sent_bytes = 0
+        self.sent_messages = 0
+        self.dropped = 0
+        self.connected = time.monotonic()
+        self.writing = False  # Registered for EVENT_WRITE because the socket buffer is full
+        self.slow = False  # Over its buffer with the "disconnect" policy; closed by the server thread
+
+    def stats(self, now):
+        return {"address": f"{self.address[0]}:{self.address[1]}", "queued_bytes": self.queued_bytes,
+                "sent_bytes": self.sent_bytes, "sent_messages": self.sent_messages, "dropped": self.dropped,
+                "lag_ms": (now - self.queue[0][0]) * 1000 if self.queue else 0.0}
+
+
+class TelemetryFanout:
+    """Serves the samples, status messages and flight events of a SerialConnection to network clients.
+
+    The serial port stays owned by this process. Every message is encoded
+    once on the publishing thread (an immediate bus subscription) and
+    appended to each client's own send queue; a selector thread writes the
+    queues out. A client whose queue exceeds max_client_buffer bytes loses
+    its oldest whole messages (policy "drop_oldest") or is disconnected
+    (policy "disconnect"), so a slow client never delays the others.
+    With `multicast=(group, port)` every message is also sent as one UDP
+    datagram, with the field dictionary repeated every fields_interval s.
+    """
+
+    def __init__(self, connection, host="127.0.0.1", port=5760, max_client_buffer=256 * 1024,
+                 policy="drop_oldest", multicast=None, multicast_ttl=1, fields_interval=1.0):
+        if policy not in ("drop_oldest", "disconnect"):
+            raise ValueError(f"Unknown slow client policy: {policy}")
+        self.connection = connection
+        self.host = host
+        self.port = port  # 0 picks a free port (see `address` after start()); None serves multicast only
+        self.max_client_buffer = max_client_buffer
+        self.policy = policy
+        self.multicast = multicast
+        self.multicast_ttl = multicast_ttl
+        self.fields_interval = fields_interval
+        self.encoder = FanoutEncoder()
+        self.lock = threading.Lock()  # Guards the encoder and the client queues
+        self.clients = {}  # fileno -> _Client
+        self.address = None
+        self.running = False
+        self.thread = None
+        self.subscriptions = []
+        self.messages = 0
+        self.bytes_encoded = 0
+        self.disconnects = 0
+        self.datagram_errors = 0
+        self._server = None
+        self._udp = None
+        self._selector = None
+        self._wake_r = self._wake_w = None
+        self._wake_pending = False
+
+    def start(self):
+        """Open the listening socket (and multicast socket) and start serving."""
+        if self.running:
+            return self
+        if self.port is not None:
+            server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            server.bind((self.host, self.port))
+            server.listen(64)
+            server.setblocking(False)
+            self._server = server
+            self.address = server.getsockname()
+        if self.multicast is not None:
+            udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+            udp.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, self.multicast_ttl)
+            udp.setblocking(False)
+            self._udp = udp
+        self._selector = selectors.DefaultSelector()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._selector.register(self._wake_r, selectors.EVENT_READ, None)
+        if self._server is not None:
+            self._selector.register(self._server, selectors.EVENT_READ, None)
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="TelemetryFanout", daemon=True)
+        self.thread.start()
+        bus = self.connection.bus
+        self.subscriptions = [
+            bus.subscribe(self._on_sample, kinds=(SAMPLE,), immediate=True, with_source=True),
+            bus.subscribe(lambda message: self._on_text(STATUS, message), kinds=(STATUS,), immediate=True),
+            bus.subscribe(lambda message: self._on_text(ERROR, message), kinds=(ERROR,), immediate=True),
+            bus.subscribe(lambda message: self._on_text(EVENT, message), kinds=(EVENT,), immediate=True),
+        ]
+        where = [f"tcp://{self.address[0]}:{self.address[1]}"] if self.address else []
+        if self.multicast is not None:
+            where.append(f"udp://{self.multicast[0]}:{self.multicast[1]}")
+        self.connection._invoke_callbacks(f"Serving telemetry on {', '.join(where)}")
+        return self
+
+    def stop(self, wait=True):
+        """Stop serving and close every client."""
+        if not self.running:
+            return
+        for subscription in self.subscriptions:
+            self.connection.bus.unsubscribe(subscription)
+        self.subscriptions = []
+        self.running = False
+        self._wake()
+        if wait and self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join(2)
+        self.thread = None
+
+    def _on_sample(self, item):
+        source, sample = item
+        with self.lock:
+            messages = self.encoder.encode_sample(sample, source)
+            self._broadcast(messages)
+
+    def _on_text(self, kind, message):
+        with self.lock:
+            self._broadcast([self.encoder.encode_text(kind, message)])
+
+    def _broadcast(self, messages):
+        """Queue encoded messages for every client (lock held) and send the datagrams."""
+        now = time.monotonic()
+        size = sum(len(m) for m in messages)
+        self.messages += len(messages)
+        self.bytes_encoded += size
+        for client in list(self.clients.values()):
+            for message in messages:
+                client.queue.append((now, message))
+            client.queued_bytes += size
+            if client.queued_bytes > self.max_client_buffer:
+                if self.policy == "disconnect":
+                    client.slow = True
+                else:
+                    self._drop_oldest(client)
+        if self._udp is not None:
+            for message in messages:
+                self._send_datagram(message)
+        self._wake()
+
+    def _drop_oldest(self, client):
+        """Drop whole messages from the front of a queue until it fits.
+
+        The messages being sent, the partly sent message and field
+        dictionaries stay, so the client can still decode what follows.
+        """
+        queue = client.queue
+        index = max(client.in_flight, 1 if client.offset > 0 else 0)
+        while client.queued_bytes > self.max_client_buffer and index < len(queue):
+            message = queue[index][1]
+            if message[4] == MSG_FIELDS:
+                index += 1
+                continue
+            del queue[index]
+            client.queued_bytes -= len(message)
+            client.dropped += 1
+
+    def _send_datagram(self, message):
+        try:
+            self._udp.sendto(message, self.multicast)
+        except OSError:
+            self.datagram_errors += 1  # Socket buffer full or no route: multicast is best effort
+
+    def _wake(self):
+        """Nudge the server thread out of select() (at most one pending byte)."""
+        if self._wake_pending:
+            return
+        self._wake_pending = True
+        try:
+            self._wake_w.send(b"\x00")
+        except OSError:
+            pass
+
+    def _run(self):
+        """Server thread: accept clients, write their queues, notice disconnects."""
+        selector = self._selector
+        next_fields = time.monotonic()
+        try:
+            while self.running:
+                for key, events in selector.select(timeout=self.fields_interval):
+                    sock = key.fileobj
+                    if sock is self._wake_r:
+                        try:
+                            sock.recv(4096)
+                        except OSError:
+                            pass
+                        self._wake_pending = False
+                    elif sock is self._server:
+                        self._accept()
+                    else:
+                        client = key.data
+                        if events & selectors.EVENT_READ and not self._read(client):
+                            continue
+                        if events & selectors.EVENT_WRITE:
+                            self._flush(client)
+                for client in list(self.clients.values()):
+                    if client.slow:
+                        self._close(client, "too slow")
+                    elif client.queue and not client.writing:
+                        self._flush(client)
+                if self._udp is not None and time.monotonic() >= next_fields:
+                    next_fields = time.monotonic() + self.fields_interval
+                    with self.lock:
+                        message = self.encoder.fields_message()
+                    self._send_datagram(message)
+        finally:
+            for client in list(self.clients.values()):
+                self._close(client, "server stopped")
+            for sock in (self._server, self._udp, self._wake_r, self._wake_w):
+                if sock is not None:
+                    sock.close()
+            selector.close()
+
+    def _accept(self):
+        try:
+            sock, address = self._server.accept()
+        except OSError:
+            return
+        sock.setblocking(False)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        client = _Client(sock, address)
+        with self.lock:
+            # The dictionary goes first so the client can decode every following sample.
+            dictionary = self.encoder.fields_message()
+            client.queue.append((time.monotonic(), dictionary))
+            client.queued_bytes = len(dictionary)
+            self.clients[sock.fileno()] = client
+        self._selector.register(sock, selectors.EVENT_READ, client)
+        log.info("Telemetry client connected from %s:%s", *address[:2])
+
+    def _read(self, client):
+        """Discard anything a client sends; returns False if it disconnected."""
+        try:
+            data = client.sock.recv(4096)
+        except BlockingIOError:
+            return True
+        except OSError:
+            data = b""
+        if not data:
+            self._close(client, "disconnected")
+            return False
+        return True
+
+    def _flush(self, client):
+        """Send as much of a client's queue as the socket takes without blocking."""
+        sock = client.sock
+        while True:
+            with self.lock:
+                if not client.queue or client.slow:
+                    break
+                # Coalesce queued messages into one send to save system calls.
+                chunk = bytearray(client.queue[0][1][client.offset:])
+                for _, message in itertools.islice(client.queue, 1, 64):
+                    chunk += message
+                # _drop_oldest must leave these alone until the send returns
+                client.in_flight = min(len(client.queue), 64)
+            try:
+                sent = sock.send(chunk)
+            except BlockingIOError:
+                sent = 0
+            except OSError:
+                with self.lock:
+                    client.in_flight = 0
+                self._close(client, "send failed")
+                return
+            with self.lock:
+                client.in_flight = 0
+                client.sent_bytes += sent
+                client.queued_bytes -= sent
+                remaining = sent + client.offset
+                while client.queue and remaining >= len(client.queue[0][1]):
+                    remaining -= len(client.queue.popleft()[1])
+                    client.sent_messages += 1
+                client.offset = remaining
+            if sent < len(chunk):
+                break  # Socket buffer full
+        blocked = bool(client.queue)
+        if blocked != client.writing:
+            client.writing = blocked
+            events = selectors.EVENT_READ | (selectors.EVENT_WRITE if blocked else 0)
+            try:
+                self._selector.modify(sock, events, client)
+            except (KeyError, ValueError):
+                pass
+
+    def _close(self, client, reason):
+        with self.lock:
+            if self.clients.pop(client.sock.fileno(), None) is None:
+                return
+        try:
+            self._selector.unregister(client.sock)
+        except (KeyError, ValueError):
+            pass
+        client.sock.close()
+        self.disconnects += 1
+        log.info("Telemetry client %s:%s closed (%s)", client.address[0], client.address[1], reason)
+
+    def stats(self):
+        """Return server counters and per-client queue size, drops and lag (age of the oldest queued message)."""
+        now = time.monotonic()
+        with self.lock:
+            clients = [client.stats(now) for client in self.clients.values()]
+        return {"address": self.address, "multicast": self.multicast, "messages": self.messages,
+                "bytes_encoded": self.bytes_encoded, "disconnects": self.disconnects,
+                "datagram_errors": self.datagram_errors, "clients": clients}
+
+
+class FanoutClient:
+    """Minimal TCP client for a TelemetryFanout server."""
+
+    def __init__(self, host, port, timeout=5.0):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.decoder = FanoutDecoder()
+
+    def read(self, timeout=None):
+        """Wait up to `timeout` seconds for data; returns the decoded messages (empty on timeout)."""
+        self.sock.settimeout(timeout)
+        try:
+            data = self.sock.recv(65536)
+        except socket.timeout:
+            return []
+        if not data:
+            raise ConnectionError("Fan-out server closed the connection")
+        return self.decoder.feed(data)
+
+    def close(self):
+        self.sock.close()
+
+
+def open_multicast(group, port, interface="0.0.0.0"):
+    """Return a UDP socket joined to a fan-out multicast group; feed each datagram to a FanoutDecoder."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(("", port))
+    membership = struct.pack("4s4s", socket.inet_aton(group), socket.inet_aton(interface))
+    sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, membership)
+    return sock
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print the telemetry served by a ground station")
+    parser.add_argument("host", help="fan-out server address (or multicast group with --multicast)")
+    parser.add_argument("port", type=int)
+    parser.add_argument("--multicast", action="store_true", help="join a UDP multicast group instead of TCP")
+    args = parser.parse_args(argv)
+    decoder = FanoutDecoder()
+    if args.multicast:
+        sock = open_multicast(args.host, args.port)
+        receive = lambda: decoder.feed(sock.recv(MAX_MESSAGE + 4))
+    else:
+        client = FanoutClient(args.host, args.port)
+        decoder = client.decoder
+        receive = client.read
+    try:
+        while True:
+            for message in receive():
+                if message.kind == "sample":
+                    lag = (time.time() - message.sent) * 1000
+                    print(f"[{message.source or '-'}] #{message.seq} ({lag:.1f} ms) {message.payload}")
+                else:
+                    print(f"{message.kind}: {message.payload}")
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+import ast
+import re
+from array import array
+
+# Matches one "Label: value [units]" fragment starting at the beginning of the line or after a comma.
+# The label must contain a non-space character (a blank label never was a field).
+_NUMBER = r"([-+]?\d*\.?\d+)"
+_FRAGMENT_RE = re.compile(r"(?:\A|,)\s*([^,\s][^,]*?)\s*:\s*" + _NUMBER)
+_NAN = float("nan")
+
+# Mapping from the labels the board prints to the standardized dashboard keys.
+# Kept here, free of serial/Tk imports, so offline tools can parse logs too.
+FIELD_MAP = {
+    "Vref": "Vref",
+    "Vout": "Vout",
+    "Average Altitude": "Avg Altitude",
+    "Average Temperature": "Avg Temp",
+    "Average Pressure": "Avg Pressure",
+    "Average Humidity": "Avg Humidity",
+    "Average Pitch": "Avg Pitch",
+    "Average Velocity": "Avg Velocity",
+    "Airbrake Status": "AirBreakSTS",
+    "Recovery Status": "RecSTS",
+    "Thruster Status": "ThrustSTS",
+    "Battery Status": "BatSTS"
+}
+
+
+class ParseError:
+    """Structured result for a line that contained no usable "Label: value" pairs.
+
+    The human readable message is only built when the error is displayed.
+    """
+
+    __slots__ = ("raw", "reason", "index")
+
+    def __init__(self, raw, reason="no fields", index=None):
+        self.raw = raw
+        self.reason = reason
+        self.index = index  # Line position when produced by parse_batch
+
+    def __str__(self):
+        return f"Invalid data received: {self.raw}"
+
+    def __repr__(self):
+        return f"ParseError({self.raw!r}, {self.reason!r})"
+
+
+class ParsedBatch:
+    """Columnar result of TelemetryParser.parse_batch.
+
+    columns maps each key to an array('d') with one entry per valid row
+    (NaN where the row did not carry that field); errors holds the
+    ParseError of every rejected line, with its index set.
+    """
+
+    __slots__ = ("rows", "columns", "errors")
+
+    def __init__(self, rows, columns, errors):
+        self.rows = rows
+        self.columns = columns
+        self.errors = errors
+
+
+class TelemetryParser:
+    """Parser compiled once from a field_map.
+
+    Lines are scanned with a single precompiled regex. Every distinct label
+    layout seen on the wire is also compiled into a full-line pattern, so the
+    usual case (the board repeating the same layout) is one fullmatch and a zip.
+    """
+
+    def __init__(self, field_map, converters=None, max_layouts=4):
+        self.field_map = dict(field_map)
+        self.converters = dict(converters or {})  # Keyed by output key; default is float
+        self.max_layouts = max_layouts
+        self.layouts = []  # Most recently used first: (pattern, keys, converters, labels)
+
+    def parse(self, raw_data):
+        """Parse one line into a dict of values, or a ParseError."""
+        for i, (pattern, keys, converters, _) in enumerate(self.layouts):
+            m = pattern.fullmatch(raw_data)
+            if m:
+                if i:
+                    # Keep the active layout at the front.
+                    self.layouts.insert(0, self.layouts.pop(i))
+                try:
+                    return {key: convert(value) for key, convert, value in zip(keys, converters, m.groups())}
+                except ValueError:
+                    break
+        return self._parse_slow(raw_data)
+
+    def _parse_slow(self, raw_data):
+        """Scan fragment by fragment and learn the layout of the line."""
+        if ":" not in raw_data:
+            return ParseError(raw_data)
+        result = {}
+        labels = []
+        field_map = self.field_map
+        for m in _FRAGMENT_RE.finditer(raw_data):
+            label, value_str = m.groups()
+            label = label.strip()
+            key = field_map.get(label, label)
+            try:
+                result[key] = self.converters.get(key, float)(value_str)
+            except ValueError:
+                continue  # Skip if conversion fails
+            labels.append(label)
+        if not result:
+            return ParseError(raw_data)
+        if len(labels) == len(result):
+            self._learn_layout(labels)
+        return result
+
+    def _learn_layout(self, labels):
+        """Compile a full-line pattern for a label sequence."""
+        labels = tuple(labels)
+        if any(layout[3] == labels for layout in self.layouts):
+            return  # Known layout that this line did not fullmatch (e.g. a trailing comma)
+        parts = [re.escape(label) + r"\s*:\s*" + _NUMBER + r"[^,]*" for label in labels]
+        pattern = re.compile(r"\s*" + r",\s*".join(parts))
+        keys = tuple(self.field_map.get(label, label) for label in labels)
+        converters = tuple(self.converters.get(key, float) for key in keys)
+        self.layouts.insert(0, (pattern, keys, converters, labels))
+        del self.layouts[self.max_layouts:]
+
+    def parse_batch(self, lines):
+        """Parse many lines in one call and return a ParsedBatch."""
+        rows = []
+        errors = []
+        keys = {}
+        parse = self.parse
+        for index, line in enumerate(lines):
+            parsed = parse(line)
+            if parsed.__class__ is ParseError:
+                parsed.index = index
+                errors.append(parsed)
+            else:
+                rows.append(parsed)
+                if not keys.keys() >= parsed.keys():
+                    keys.update(dict.fromkeys(parsed))
+        columns = {key: array("d", [row.get(key, _NAN) for row in rows]) for key in keys}
+        return ParsedBatch(len(rows), columns, errors)
+
+
+def parse_literal_sample(line, field_map=FIELD_MAP):
+    """Parse a logged sample dict ("{'Vref': 3.3, ...}") as written by older console logs; None if it is not one."""
+    try:
+        value = ast.literal_eval(line)
+    except (ValueError, SyntaxError):
+        return None
+    if not isinstance(value, dict):
+        return None
+    return {field_map.get(k, k): float(v) for k, v in value.items()
+            if isinstance(k, str) and isinstance(v, (int, float))}
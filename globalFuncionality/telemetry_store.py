@@ -0,0 +1,177 @@
+import threading
+import time
+from array import array
+from bisect import bisect_left
+
+
+class SeriesWindow:
+    """Zero-copy view of a time range of one TimeSeries.
+
+    The range may wrap around the end of the ring, so it is exposed as up to
+    two (times, values) memoryview segments. The views alias the ring buffer:
+    read them promptly, before the writer laps the window.
+    """
+
+    __slots__ = ("segments",)
+
+    def __init__(self, segments):
+        self.segments = segments  # List of (times_view, values_view) pairs, oldest first
+
+    def __len__(self):
+        return sum(len(times) for times, _ in self.segments)
+
+    def __iter__(self):
+        for times, values in self.segments:
+            yield from zip(times, values)
+
+    def times(self):
+        """Return the timestamps as a list (copies)."""
+        return [t for times, _ in self.segments for t in times]
+
+    def values(self):
+        """Return the values as a list (copies)."""
+        return [v for _, values in self.segments for v in values]
+
+
+class TimeSeries:
+    """Fixed-capacity ring buffer of (timestamp, value) pairs backed by array('d')."""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.times = array("d", bytes(8 * capacity))
+        self.values = array("d", bytes(8 * capacity))
+        self.head = 0  # Next physical slot to write
+        self.count = 0
+        self.total = 0  # Points ever appended; lets readers ask for "everything after N"
+
+    def append(self, timestamp, value):
+        """Store one point, overwriting the oldest once full. O(1)."""
+        i = self.head
+        self.times[i] = timestamp
+        self.values[i] = value
+        i += 1
+        self.head = 0 if i == self.capacity else i
+        if self.count < self.capacity:
+            self.count += 1
+        self.total += 1
+
+    def latest(self):
+        """Return the newest (timestamp, value) pair, or None if empty."""
+        if not self.count:
+            return None
+        i = self.head - 1
+        return self.times[i], self.values[i]
+
+    def _physical(self, k):
+        """Map a logical index (0 = oldest) to a slot in the ring."""
+        return (self.head - self.count + k) % self.capacity
+
+    def window(self, since):
+        """Return a SeriesWindow of all points with timestamp >= since."""
+        # Timestamps are appended in order, so bisect over the logical (unwrapped) index.
+        k = bisect_left(range(self.count), since, key=lambda j: self.times[self._physical(j)])
+        return self._slice(k)
+
+    def tail(self, after_total):
+        """Return a SeriesWindow of the points appended after the first `after_total` ones."""
+        return self._slice(max(0, self.count - (self.total - after_total)))
+
+    def _slice(self, k):
+        """Return a SeriesWindow from logical index k to the newest point."""
+        if k >= self.count:
+            return SeriesWindow([])
+        start = self._physical(k)
+        stop = self.head if self.head else self.capacity
+        times = memoryview(self.times)
+        values = memoryview(self.values)
+        if start < stop:
+            return SeriesWindow([(times[start:stop], values[start:stop])])
+        return SeriesWindow([(times[start:], values[start:]), (times[:stop], values[:stop])])
+
+
+class TelemetryStore:
+    """Central, bounded history of every telemetry field.
+
+    SerialConnection appends each parsed sample with its host receive time
+    (time.monotonic); tabs read the latest values or a recent window from
+    here instead of keeping their own copies. Each field gets a preallocated
+    ring of `capacity` points, so memory stays fixed for any session length.
+    """
+
+    def __init__(self, capacity=36000, max_series=64):
+        self.capacity = capacity  # Points kept per field (one hour at 10 Hz by default)
+        self.max_series = max_series  # Guard against unbounded growth from unknown labels
+        self.series = {}
+        self.sources = {}  # key -> name of the link that delivered its latest value
+        self.lock = threading.Lock()
+        self.version = 0  # Incremented on every append; cheap "has anything changed" check
+        self.last_update = None
+
+    def append(self, sample, timestamp=None, source=None):
+        """Record a parsed sample dict received at `timestamp` (defaults to now) from link `source`."""
+        if timestamp is None:
+            timestamp = time.monotonic()
+        with self.lock:
+            series = self.series
+            for key, value in sample.items():
+                ring = series.get(key)
+                if ring is None:
+                    if len(series) >= self.max_series:
+                        continue
+                    ring = series[key] = TimeSeries(self.capacity)
+                ring.append(timestamp, value)
+            if source is not None:
+                self.sources.update(dict.fromkeys(sample, source))
+            self.version += 1
+            self.last_update = timestamp
+
+    def latest(self, keys=None):
+        """Return {key: newest value} for the given keys (all fields by default)."""
+        with self.lock:
+            series = self.series
+            if keys is None:
+                keys = list(series)
+            result = {}
+            for key in keys:
+                ring = series.get(key)
+                if ring is not None and ring.count:
+                    result[key] = ring.values[ring.head - 1]
+            return result
+
+    def window(self, key, seconds, now=None):
+        """Return a SeriesWindow with the last `seconds` of `key` (empty if unknown)."""
+        if now is None:
+            now = time.monotonic()
+        return self.since(key, now - seconds)
+
+    def since(self, key, timestamp):
+        """Return a SeriesWindow with every point of `key` at or after `timestamp`."""
+        with self.lock:
+            ring = self.series.get(key)
+            if ring is None:
+                return SeriesWindow([])
+            return ring.window(timestamp)
+
+    def tail(self, key, after_total=0):
+        """Return (window, total): points of `key` appended after `after_total`, and the new total.
+
+        Pass the returned total back on the next call to receive only new points.
+        """
+        with self.lock:
+            ring = self.series.get(key)
+            if ring is None:
+                return SeriesWindow([]), 0
+            return ring.tail(after_total), ring.total
+
+    def keys(self):
+        """Return the names of all recorded fields."""
+        with self.lock:
+            return list(self.series)
+
+    def clear(self):
+        """Drop all history."""
+        with self.lock:
+            self.series.clear()
+            self.sources.clear()
+            self.version += 1
+            self.last_update = None
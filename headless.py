@@ -0,0 +1,143 @@
+from globalFuncionality.startup_timer import StartupTimer  # First, so its clock starts with the process
+import argparse
+import logging
+import signal
+import sys
+import threading
+import time
+from globalFuncionality.command_line import add_connection_arguments, check_connection_arguments, connection_options
+from globalFuncionality.serial_connection import open_serial_connection
+from globalFuncionality.telemetry_store import TelemetryStore
+
+log = logging.getLogger("headless")
+STORE_CAPACITY = 600  # Points kept per field; the relay only reads the latest values
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="H.E.L.I.O.S. ground station relay: read, record and forward "
+                                                 "telemetry without the dashboard")
+    add_connection_arguments(parser)
+    parser.add_argument("--record", metavar="DIR", default="recordings",
+                        help="directory for session recordings (default: recordings)")
+    parser.add_argument("--no-record", action="store_true", help="do not record the session")
+    parser.add_argument("--session-store", metavar="DIR",
+                        help="also write a columnar session (for range queries) under DIR")
+    parser.add_argument("--status-interval", type=float, default=1.0,
+                        help="seconds between status lines on stdout; 0 disables them (default: 1)")
+    return check_connection_arguments(parser, parser.parse_args())
+
+
+def log_status(message):
+    """Status messages go to the log; unparsable lines only at DEBUG level."""
+    if isinstance(message, str):
+        log.info("%s", message)
+    else:
+        log.debug("%s", message)
+
+
+class HeadlessRelay:
+    """Runs a SerialConnection with no UI: the calling thread drains the bus and prints the status line.
+
+    The bus still has to be drained (the ingest process delivers its
+    samples through it). stop() may be called from a signal handler.
+    """
+
+    def __init__(self, serial_connection, status_interval=1.0, out=sys.stdout, drain_interval=0.1):
+        self.serial_connection = serial_connection
+        self.status_interval = status_interval
+        self.out = out
+        self.drain_interval = drain_interval
+        self.started = time.monotonic()
+        self._stop = threading.Event()
+        self._last = (self.started, 0)  # Time and sample count of the previous status line
+
+    @property
+    def samples(self):
+        return self.serial_connection.metrics.counters.get("samples", 0)
+
+    @property
+    def errors(self):
+        return self.serial_connection.metrics.counters.get("parse_failures", 0)
+
+    def stop(self, *_):
+        """Ask run() to return (usable as a signal handler)."""
+        self._stop.set()
+
+    def replay_finished(self):
+        source = self.serial_connection.serial_connection
+        return getattr(source, "finished", False)
+
+    def run(self):
+        """Drain the bus and print status lines until stop() or the end of a replay."""
+        next_status = time.monotonic() + self.status_interval
+        while not self._stop.wait(self.drain_interval):
+            self.serial_connection.bus.drain()
+            now = time.monotonic()
+            if self.status_interval and now >= next_status:
+                next_status += self.status_interval
+                if next_status < now:
+                    next_status = now + self.status_interval  # Skip lines missed while suspended
+                print(self.status_line(now), file=self.out, flush=True)
+            if self.replay_finished():
+                log.info("Replay finished")
+                break
+        self.serial_connection.bus.drain()
+
+    def status_line(self, now=None):
+        """One line: uptime, link, sample rate, parse errors, recording, clients and the latest altitude."""
+        now = time.monotonic() if now is None else now
+        connection = self.serial_connection
+        last_time, last_samples = self._last
+        samples = self.samples
+        rate = (samples - last_samples) / (now - last_time) if now > last_time else 0.0
+        self._last = (now, samples)
+        parts = [f"up {now - self.started:.0f}s", f"link {self.link_name()}",
+                 f"samples {samples} ({rate:.1f}/s)", f"errors {self.errors}"]
+        recorder = connection.recorder
+        if recorder is not None:
+            stats = recorder.stats()
+            parts.append(f"rec {stats['bytes_written'] / 1e6:.1f}MB"
+                         + (f" ({stats['dropped']} dropped)" if stats["dropped"] else ""))
+        if connection.fanout is not None:
+            parts.append(f"clients {len(connection.fanout.clients)}")
+        latest = connection.store.latest(("Avg Altitude", "Avg Velocity"))
+        if latest:
+            parts.append(" ".join(f"{key} {value:g}" for key, value in latest.items()))
+        return time.strftime("%H:%M:%S ") + " | ".join(parts)
+
+    def link_name(self):
+        connection = self.serial_connection
+        if connection.multiplexer is not None:
+            return ",".join(connection.multiplexer.stats())
+        if connection.ingest is not None:
+            return "ingest" if connection.ingest.stats()["alive"] else "ingest (exited)"
+        if connection.supervisor is not None:
+            return connection.supervisor.connected_port or "searching"
+        return "replay" if connection.serial_connection is not None else "none"
+
+
+def main():
+    startup_timer = StartupTimer()
+    startup_timer.mark("imports_main")
+    args = parse_args()
+    logging.basicConfig(level=args.log_level, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    serial_connection = open_serial_connection(startup_timer=startup_timer, **connection_options(args),
+                                               recording=None if args.no_record else args.record,
+                                               session_store=args.session_store, status_callback=log_status,
+                                               store=TelemetryStore(capacity=STORE_CAPACITY))
+    relay = HeadlessRelay(serial_connection, args.status_interval)
+    # Ctrl+C, systemd stop or kill: finish the recording instead of losing its last buffer
+    for name in ("SIGINT", "SIGTERM", "SIGHUP"):
+        if hasattr(signal, name):
+            signal.signal(getattr(signal, name), relay.stop)
+    startup_timer.mark("serial")
+    try:
+        relay.run()
+    finally:
+        log.info("Shutting down")
+        serial_connection.stop()
+        log.info("Stopped after %d samples, %d parse errors", relay.samples, relay.errors)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,32 @@
+from globalFuncionality.startup_timer import StartupTimer  # First, so its clock starts with the process
+import argparse
+import logging
 import tkinter
 from dashwindow.splash_screen import SplashScreen
+from globalFuncionality.command_line import add_connection_arguments, check_connection_arguments, connection_options
 import sv_ttk
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="H.E.L.I.O.S. ground station dashboard")
+    add_connection_arguments(parser)
+    return check_connection_arguments(parser, parser.parse_args())
+
+
 def main():
+    startup_timer = StartupTimer()
+    startup_timer.mark("imports_main")
+    args = parse_args()
+    logging.basicConfig(level=args.log_level, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
     root = tkinter.Tk() #makes the window
 
     root.wm_attributes("-fullscreen", True) #makes the screen fullscreen
     root.wm_attributes("-alpha", 0.0) #Sets initial transparency
     sv_ttk.set_theme('dark')
+    startup_timer.mark("theme")
     # Create the splash screen and start the fade effect
-    splash_screen = SplashScreen(root)
+    splash_screen = SplashScreen(root, dashboard_options=connection_options(args),
+                                 startup_timer=startup_timer)
     splash_screen.fade_out()  # Start the fade-out effect after the splash screen is shown
     # Run the application
     root.mainloop()
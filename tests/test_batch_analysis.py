@@ -0,0 +1,22 @@
+from globalFuncionality.batch_analysis import analyze_text_log
+
+
+def test_text_log_with_sample_dicts(tmp_path):
+    log = tmp_path / "console.txt"
+    lines = ["Connected to COM3"]
+    for i in range(40):
+        altitude = 10.0 * i if i < 30 else 300.0 - 10.0 * (i - 29)
+        lines.append(repr({"Vref": 3.3, "Average Altitude": altitude, "Average Velocity": 20.0 + i}))
+    lines.append("Vref: 3.3, Average Altitude: 5.0, Average Velocity: 1.0")
+    lines.append("Vref: , Average Altitude: m")  # Telemetry that does not parse
+    lines.append("Invalid data received: Vref: 3.3, Vout")  # The dashboard's own parse error message
+    # Status messages are not telemetry and not errors
+    lines += ["Sent: ARM", "Error reading from serial: device reports readiness to read but returned no data",
+              "Detected text telemetry", "Disconnected"]
+    log.write_text("\n".join(lines) + "\n")
+    (flight,) = analyze_text_log(str(log))
+    assert flight["samples"] == 41
+    assert flight["parse_errors"] == 2
+    assert flight["parse_error_rate"] == 2 / 43
+    assert flight["apogee"] == 290.0
+    assert flight["max_velocity"] == 59.0
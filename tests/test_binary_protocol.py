@@ -0,0 +1,73 @@
+import random
+from globalFuncionality.binary_protocol import (BinaryFrameDecoder, TELEMETRY_LAYOUT, cobs_decode, cobs_encode,
+                                                 encode_frame)
+from globalFuncionality.stream_decoder import StreamDecoder
+
+
+def _sample(i):
+    sample = {key: float(i) + 0.5 for key in TELEMETRY_LAYOUT.keys[:8]}
+    sample.update({key: i % 2 for key in TELEMETRY_LAYOUT.keys[8:]})
+    return sample
+
+
+def test_cobs_round_trip():
+    rng = random.Random(3)
+    payloads = [b"", b"\x00", b"\x00" * 300, b"\x01" * 253, b"\x01" * 254, b"\x01" * 255, b"\x01" * 600,
+                b"\x01" * 254 + b"\x00", b"\x00" + b"\x01" * 254 + b"\x00\x00" + b"\x02" * 509]
+    payloads += [bytes(rng.choice([0, 0, 0, rng.randrange(256)]) for _ in range(rng.randrange(1200)))
+                 for _ in range(200)]
+    for payload in payloads:
+        encoded = cobs_encode(payload)
+        assert b"\x00" not in encoded
+        assert cobs_decode(encoded) == payload, payload
+
+
+def test_cobs_rejects_malformed_blocks():
+    for block in (b"\x00\x01", b"\x05ab"):
+        try:
+            cobs_decode(block)
+        except ValueError:
+            continue
+        raise AssertionError(block)
+
+
+def test_frames_round_trip_split_at_every_byte():
+    decoder = BinaryFrameDecoder()
+    stream = b"".join(encode_frame(TELEMETRY_LAYOUT, seq, _sample(seq)) for seq in range(20))
+    out = []
+    for i in range(len(stream)):
+        out += decoder.feed(stream[i:i + 1])
+    assert out == [_sample(seq) for seq in range(20)]
+    assert decoder.stats() == {"frames": 20, "dropped_frames": 0, "corrupt_frames": 0, "unknown_frames": 0}
+
+
+def test_resync_after_garbage_and_sequence_gaps():
+    decoder = BinaryFrameDecoder()
+    frames = [encode_frame(TELEMETRY_LAYOUT, seq, _sample(seq)) for seq in range(6)]
+    damaged = bytearray(frames[2])
+    damaged[5] ^= 0x40
+    # Garbage before a frame spoils that frame only; the decoder is back in sync after the next delimiter
+    stream = b"\x17\x42garbage" + frames[0] + frames[1] + b"\xff" * 7 + b"\x00" + bytes(damaged) + frames[3] + frames[5]
+    assert decoder.feed(stream) == [_sample(1), _sample(3), _sample(5)]
+    stats = decoder.stats()
+    assert stats["frames"] == 3
+    assert stats["corrupt_frames"] == 3  # Garbage with frame 0, the 0xff run and the damaged frame
+    assert stats["dropped_frames"] == 2  # Sequence numbers 2 and 4
+
+
+def test_oversized_garbage_without_delimiter_is_discarded():
+    decoder = BinaryFrameDecoder(max_frame=64)
+    assert decoder.feed(b"\x01" * 100) == []
+    assert decoder.corrupt_frames == 1 and not decoder.buffer
+    assert decoder.feed(encode_frame(TELEMETRY_LAYOUT, 7, _sample(7))) == [_sample(7)]
+
+
+def test_stream_decoder_detects_protocol():
+    binary = StreamDecoder(parse=lambda line: {"line": line})
+    assert binary.feed(encode_frame(TELEMETRY_LAYOUT, 1, _sample(1))) == [_sample(1)]
+    assert binary.active_protocol == "binary"
+    text = StreamDecoder(parse=lambda line: {"line": line})
+    assert text.feed(b"Vref: 3") == []
+    assert text.active_protocol is None
+    assert text.feed(b".3\nVout: 1\n") == [{"line": "Vref: 3.3"}, {"line": "Vout: 1"}]
+    assert text.active_protocol == "text"
@@ -0,0 +1,34 @@
+from globalFuncionality.flight_events import LAUNCH, RECOVERY1, RECOVERY2, FlightEventDetector
+
+
+def _feed(detector, samples):
+    events = []
+    for i, sample in enumerate(samples):
+        events += detector.feed(sample, float(i))
+    return events
+
+
+def test_status_levels_already_on_do_not_fire():
+    # Connected mid-flight: thruster on and first stage deployed from the first sample
+    detector = FlightEventDetector()
+    events = _feed(detector, [{"ThrustSTS": 1.0, "RecSTS": 1.0}] * 5)
+    assert events == []
+    events = _feed(detector, [{"RecSTS": 2.0}] * 2)
+    assert [event.name for event in events] == [RECOVERY2]
+
+
+def test_transitions_fire_once_debounced():
+    detector = FlightEventDetector(status_debounce=2)
+    samples = [{"ThrustSTS": 0.0, "RecSTS": 0.0}, {"ThrustSTS": 1.0}, {"ThrustSTS": 0.0}, {"ThrustSTS": 1.0},
+               {"ThrustSTS": 1.0}, {"RecSTS": 1.0}, {"RecSTS": 1.0}, {"RecSTS": 2.0}, {"RecSTS": 2.0}]
+    events = _feed(detector, samples)
+    assert [(event.name, event.timestamp, event.decided) for event in events] == [
+        (LAUNCH, 3.0, 4.0), (RECOVERY1, 5.0, 6.0), (RECOVERY2, 7.0, 8.0)]
+
+
+def test_climb_still_detects_launch_without_status():
+    detector = FlightEventDetector(debounce=3)
+    samples = [{"Avg Altitude": 100.0, "Avg Velocity": 0.0}] * 3
+    samples += [{"Avg Altitude": 100.0 + 40.0 * i, "Avg Velocity": 50.0} for i in range(1, 5)]
+    events = _feed(detector, samples)
+    assert [(event.name, event.timestamp) for event in events] == [(LAUNCH, 3.0)]
@@ -0,0 +1,31 @@
+import sys
+import threading
+from globalFuncionality.instrumentation import PipelineMetrics
+
+
+def test_counts_from_several_threads_add_up():
+    metrics = PipelineMetrics()
+
+    def report():
+        for i in range(5000):
+            metrics.count("lines")
+            metrics.count("bytes", 20)
+            metrics.observe("parse", 1e-6 * (i % 50))
+            metrics.peak("port_buffer", i)
+
+    threads = [threading.Thread(target=report) for _ in range(4)]
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # Switch threads as often as possible to provoke lost updates
+    try:
+        for thread in threads:
+            thread.start()
+        for _ in range(20):
+            metrics.snapshot()  # Snapshots run concurrently with the producers
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"] == {"lines": 4 * 5000, "bytes": 4 * 5000 * 20}
+    assert snapshot["stages"]["parse"]["count"] == 4 * 5000
+    assert snapshot["peaks"] == {"port_buffer": 4999}
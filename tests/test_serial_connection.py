@@ -0,0 +1,100 @@
+import time
+import pytest
+
+pytest.importorskip("serial")
+from globalFuncionality.serial_connection import SerialConnection
+
+
+def test_restarting_the_session_store_within_a_second_uses_a_new_directory(tmp_path):
+    connection = SerialConnection()
+    directories = []
+    for _ in range(3):
+        writer = connection.start_session_store(str(tmp_path))
+        connection._publish_sample({"Avg Altitude": 1.0}, 1.0)
+        directories.append(writer.directory)
+        connection.stop_session_store()
+    assert len(set(directories)) == 3
+
+
+def test_store_and_events_follow_one_link():
+    connection = SerialConnection(derived_metrics=False)
+    connection.primary_link = "avionics"
+    connection._primary_seen = 0.0
+    for i in range(20):
+        t = i * 0.1
+        connection._publish_sample({"Avg Altitude": 100.0 + i, "ThrustSTS": float(i >= 10)}, t, "avionics")
+        connection._publish_sample({"Avg Altitude": 500.0, "ThrustSTS": 0.0}, t + 0.05, "radio")
+    assert connection.store.since("Avg Altitude", 0.0).values() == [100.0 + i for i in range(20)]
+    assert list(connection.event_detector.events) == ["launch"]
+    assert connection.event_detector.events["launch"].timestamp == 1.0
+    # The avionics link falls silent: the radio takes over after failover_seconds
+    for i in range(40):
+        connection._publish_sample({"Avg Altitude": 600.0 + i}, 2.0 + i * 0.1, "radio")
+    assert connection.primary_link == "radio"
+    assert connection.store.latest(["Avg Altitude"]) == {"Avg Altitude": 639.0}
+    assert connection.store.since("Avg Altitude", 2.0).values() == [600.0 + i for i in range(20, 40)]
+
+
+def test_replay_starts_derived_metrics_and_events_over(tmp_path):
+    connection = SerialConnection()
+    connection._publish_sample({"Avg Altitude": 1000.0}, 1.0)
+    connection.event_detector.phase = "descent"  # Left over from the previous flight
+    log = tmp_path / "flight.txt"
+    log.write_text("".join(f"Average Altitude: {10.0 * i}\n" for i in range(1, 6)))
+    connection.replay([str(log)], speed=None)
+    deadline = time.monotonic() + 5
+    while connection.store.latest(["Avg Altitude"]) != {"Avg Altitude": 50.0} and time.monotonic() < deadline:
+        time.sleep(0.01)
+    connection.stop()
+    assert connection.store.latest(["Avg Altitude", "Max Altitude"]) == {"Avg Altitude": 50.0, "Max Altitude": 50.0}
+    assert connection.event_detector.phase == "pad"
+
+
+def test_seek_drops_the_partial_line_read_before_it(tmp_path):
+    from globalFuncionality.session_replay import ReplaySerial
+    log = tmp_path / "flight.txt"
+    log.write_text("Average Altitude: 12\n34\n")
+    connection = SerialConnection(protocol="text", derived_metrics=False)
+    source = connection.serial_connection = ReplaySerial([str(log)], speed=None, line_period=1.0)
+    connection._feed(source.read(19), 1.0)  # "Average Altitude: 1"
+    source.seek(1.0)
+    connection._feed(source.read(100), 2.0)  # "34\n" must not complete the stale line as 134
+    assert connection.store.latest(["Avg Altitude"]) == {}
+
+
+class _BytesSource:
+    """Serial-like object returning a fixed byte string, then nothing."""
+
+    def __init__(self, data):
+        self.data = bytearray(data)
+        self.is_open = True
+
+    @property
+    def in_waiting(self):
+        return len(self.data)
+
+    def read(self, size=1):
+        time.sleep(0.001 if not self.data else 0)
+        chunk = bytes(self.data[:size])
+        del self.data[:size]
+        return chunk
+
+    def close(self):
+        self.is_open = False
+
+
+@pytest.mark.parametrize("read_mode", ["blocking", "polling"])
+def test_binary_frames_are_decoded_in_every_read_mode(read_mode):
+    from globalFuncionality.binary_protocol import TELEMETRY_LAYOUT, encode_frame
+    values = dict.fromkeys(TELEMETRY_LAYOUT.keys, 1)
+    values["Avg Altitude"] = 42.0
+    connection = SerialConnection(read_mode=read_mode, derived_metrics=False)
+    connection.open_source(_BytesSource(b"".join(encode_frame(TELEMETRY_LAYOUT, seq, values) for seq in range(5))),
+                           "frames")
+    deadline = time.monotonic() + 5
+    while connection.metrics.counters.get("samples", 0) < 5 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    connection.stop()
+    assert connection.decoder.active_protocol == "binary"
+    assert connection.store.latest(["Avg Altitude"]) == {"Avg Altitude": 42.0}
+    assert connection.metrics.counters["samples"] == 5
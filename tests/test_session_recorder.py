@@ -0,0 +1,37 @@
+import sys
+import threading
+from globalFuncionality.session_recorder import STATUS, SessionRecorder, read_records
+
+
+def test_drop_count_is_exact_with_several_producers(tmp_path):
+    recorder = SessionRecorder(str(tmp_path), max_pending=100)  # Not started, so nothing is written
+
+    def produce():
+        for i in range(20000):
+            recorder.record_status("status", float(i))
+
+    threads = [threading.Thread(target=produce) for _ in range(4)]
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # Switch threads as often as possible to provoke lost updates
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+    assert len(recorder.queue) == 100
+    assert recorder.dropped == 4 * 20000 - 100
+
+
+def test_restarted_recorder_does_not_overwrite_the_previous_file(tmp_path):
+    paths = []
+    for message in ("first", "second"):  # Both start within the same second
+        recorder = SessionRecorder(str(tmp_path))
+        recorder.start()
+        recorder.record_status(message, 1.0)
+        recorder.stop()
+        paths += recorder.files
+    assert len(set(paths)) == 2
+    statuses = [[payload for kind, _, payload in read_records(path) if kind == STATUS] for path in paths]
+    assert statuses == [["first"], ["second"]]
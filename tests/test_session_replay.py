@@ -0,0 +1,32 @@
+from globalFuncionality.session_recorder import SessionRecorder
+from globalFuncionality.session_replay import ReplaySerial
+
+
+def _record(directory, chunks):
+    recorder = SessionRecorder(str(directory))
+    recorder.start()
+    for received, data in chunks:
+        recorder.record_raw(data, received)
+    recorder.stop()
+    return recorder.files
+
+
+def test_mixed_recordings_and_text_logs_play_in_order(tmp_path):
+    recording = _record(tmp_path / "a", [(50.0, b"Vref: 1\n"), (52.0, b"Vref: 2\n")])
+    log = tmp_path / "b-serial_log.txt"
+    log.write_bytes(b"Vref: 3\nVref: 4\n")
+    replay = ReplaySerial(recording + [str(log)], speed=None, line_period=0.5)
+    assert list(replay._records()) == [(0.0, b"Vref: 1\n"), (2.0, b"Vref: 2\n"), (2.0, b"Vref: 3\n"),
+                                       (2.5, b"Vref: 4\n")]
+    assert replay.read(100) == b"Vref: 1\nVref: 2\nVref: 3\nVref: 4\n"
+
+
+def test_seek_starts_a_new_read_generation(tmp_path):
+    log = tmp_path / "serial_log.txt"
+    log.write_bytes(b"".join(b"Vref: %d\n" % i for i in range(10)))
+    replay = ReplaySerial([str(log)], speed=None, line_period=1.0)
+    assert replay.read(4) == b"Vref"
+    assert replay.read_generation == 0
+    replay.seek(5.0)
+    assert replay.read(100) == b"".join(b"Vref: %d\n" % i for i in range(5, 10))
+    assert replay.read_generation == 1
@@ -0,0 +1,59 @@
+import threading
+import time
+from collections import deque
+from globalFuncionality.session_store import ColumnarSession, ColumnarSessionWriter
+
+
+def _write(directory, background):
+    writer = ColumnarSessionWriter(str(directory), fields=["Avg Altitude", "Avg Velocity"], chunk_rows=100,
+                                   background=background)
+    for i in range(1050):
+        sample = {"Avg Altitude": float(i % 700)}
+        if i % 3:
+            sample["Avg Velocity"] = float(i)
+        writer.append(sample, 10.0 + i * 0.02)
+    writer.close()
+    return writer
+
+
+def test_background_writer_matches_synchronous_writer(tmp_path):
+    direct = _write(tmp_path / "direct", background=False)
+    threaded = _write(tmp_path / "threaded", background=True)
+    assert threaded.thread is not None and not threaded.thread.is_alive()
+    assert (threaded.rows, threaded.chunks, threaded.dropped_rows) == (direct.rows, direct.chunks, 0) == (1050, 11, 0)
+    for name in ("direct", "threaded"):
+        with open(tmp_path / name / "c000.f64", "rb") as f:
+            assert len(f.read()) == 1050 * 8
+    session = ColumnarSession(str(tmp_path / "threaded"))
+    assert len(session) == 1050
+    assert session.max("Avg Altitude")[1] == 699.0
+    session.close()
+
+
+class _CloseWhenDrained(deque):
+    """Pending queue that lets close() run right after the writer thread found it empty."""
+
+    def __init__(self, writer):
+        super().__init__()
+        self.writer = writer
+        self.drained = threading.Event()
+        self.armed = True
+
+    def __bool__(self):
+        if len(self) or not self.armed or not self.writer.rows:
+            return bool(len(self))
+        self.armed = False
+        self.drained.set()
+        while not self.writer.closed:  # Hold the writer thread until close() has queued the last chunk
+            time.sleep(0.001)
+        return False
+
+
+def test_close_writes_the_last_chunk_queued_while_the_writer_was_idle(tmp_path):
+    writer = ColumnarSessionWriter(str(tmp_path / "s"), fields=["Avg Altitude"], chunk_rows=2, background=True)
+    writer.pending = _CloseWhenDrained(writer)
+    for i in range(3):
+        writer.append({"Avg Altitude": float(i)}, float(i))
+    assert writer.pending.drained.wait(2)
+    writer.close()
+    assert (writer.rows, writer.chunks) == (3, 2)
@@ -0,0 +1,49 @@
+from globalFuncionality.shared_ring import SharedRingReader, SharedRingWriter
+
+FIELDS = ["Vref", "Avg Altitude", "RecSTS"]
+
+
+def test_round_trip_with_presence_mask():
+    reader = SharedRingReader(FIELDS, capacity=16)
+    writer = SharedRingWriter(reader.name, FIELDS)
+    try:
+        writer.append({"Vref": 3.3, "Avg Altitude": 12.5}, 1.0)
+        writer.append({"RecSTS": 1.0, "Label": 2.0}, 2.0)
+        assert reader.pending() == 2
+        assert reader.read() == [(1.0, {"Vref": 3.3, "Avg Altitude": 12.5}), (2.0, {"RecSTS": 1.0})]
+        assert writer.unknown_fields == 1
+        assert reader.read() == [] and reader.pending() == 0
+    finally:
+        writer.close()
+        reader.close()
+
+
+def test_wrap_and_overrun():
+    reader = SharedRingReader(FIELDS, capacity=8)
+    writer = SharedRingWriter(reader.name, FIELDS)
+    try:
+        for i in range(5):
+            writer.append({"Vref": float(i)}, float(i))
+        assert [t for t, _ in reader.read(max_records=3)] == [0.0, 1.0, 2.0]
+        for i in range(5, 12):
+            writer.append({"Vref": float(i)}, float(i))
+        # Records 3..11 are pending but only 8 fit; the reader skips the one that was overwritten
+        records = reader.read()
+        assert [sample["Vref"] for _, sample in records] == [float(i) for i in range(5, 12)]
+        assert reader.overruns == 2  # Record 3 was lapped, record 4 may be half-overwritten
+        assert reader.cursor == 12
+    finally:
+        writer.close()
+        reader.close()
+
+
+def test_writer_rejects_other_layouts():
+    reader = SharedRingReader(FIELDS, capacity=4)
+    try:
+        SharedRingWriter(reader.name, FIELDS[:2])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("writer attached with the wrong field count")
+    finally:
+        reader.close()
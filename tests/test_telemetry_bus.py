@@ -0,0 +1,41 @@
+import sys
+import threading
+from globalFuncionality.telemetry_bus import SAMPLE, STATUS, TelemetryBus
+
+
+def _run_threads(target, n):
+    threads = [threading.Thread(target=target) for _ in range(n)]
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # Switch threads as often as possible to provoke lost updates
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+
+def test_counters_with_concurrent_publishers():
+    bus = TelemetryBus()
+    received = []
+    immediate = bus.subscribe(received.append, kinds=(STATUS,), immediate=True)
+    queued = bus.subscribe(lambda message: None, kinds=(SAMPLE,), maxlen=100000)
+
+    def failing(message):
+        raise RuntimeError("consumer bug")
+
+    bus.subscribe(failing, kinds=(STATUS,), immediate=True)
+
+    def publish():
+        for i in range(2000):
+            bus.publish({"Vref": float(i)}, SAMPLE)
+            bus.publish("status", STATUS)
+
+    _run_threads(publish, 4)
+    assert bus.drain() == 4 * 2000
+    stats = bus.stats()
+    assert stats["published"] == 4 * 2 * 2000
+    assert stats["callback_errors"] == 4 * 2000
+    assert immediate.delivered == len(received) == 4 * 2000
+    assert queued.delivered == 4 * 2000
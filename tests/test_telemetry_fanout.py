@@ -0,0 +1,92 @@
+from globalFuncionality.telemetry_fanout import FanoutDecoder, FanoutEncoder, TelemetryFanout, _Client
+
+
+class _Selector:
+    def modify(self, sock, events, data):
+        pass
+
+
+class _PartialSocket:
+    """Accepts a few bytes per send and lets the publisher run while the send is in progress."""
+
+    def __init__(self, per_send, during_send):
+        self.per_send = per_send
+        self.during_send = during_send
+        self.received = bytearray()
+
+    def send(self, data):
+        self.during_send()
+        sent = min(self.per_send, len(data))
+        self.received += data[:sent]
+        return sent
+
+
+def _fanout(max_client_buffer):
+    fanout = TelemetryFanout(connection=None, port=None, max_client_buffer=max_client_buffer)
+    fanout._wake_pending = True  # No server thread to wake
+    fanout._selector = _Selector()
+    return fanout
+
+
+def test_encode_decode_round_trip():
+    encoder = FanoutEncoder()
+    decoder = FanoutDecoder()
+    stream = bytearray()
+    samples = [{"Vref": 3.3, "Avg Altitude": float(i)} for i in range(5)]
+    samples.append({"Vref": 3.3, "Avg Altitude": 5.0, "RecSTS": 1.0})
+    for sample in samples:
+        for message in encoder.encode_sample(sample, "radio", sent=1.5):
+            stream += message
+    stream += encoder.encode_text("status", "Connected to COM3")
+    # Byte by byte, so every message is split at every possible point
+    out = []
+    for i in range(len(stream)):
+        out += decoder.feed(stream[i:i + 1])
+    assert [m.payload for m in out[:-1]] == samples
+    assert all(m.source == "radio" and m.sent == 1.5 for m in out[:-1])
+    assert (out[-1].kind, out[-1].payload) == ("status", "Connected to COM3")
+    assert decoder.gaps == 0 and decoder.unknown_fields == 0
+
+
+def test_decoder_counts_sequence_gaps():
+    encoder = FanoutEncoder()
+    decoder = FanoutDecoder()
+    messages = [encoder.encode_sample({"Vref": float(i)}) for i in range(4)]
+    decoder.feed(b"".join(messages[0]))  # Dictionary and first sample
+    decoder.feed(messages[3][0])
+    assert decoder.gaps == 2
+
+
+def test_drops_during_partial_send_keep_the_stream_decodable():
+    fanout = _fanout(max_client_buffer=300)
+    encoder = fanout.encoder
+    client = _Client(None, ("127.0.0.1", 1))
+    fanout.clients[1] = client
+    published = {}  # seq -> (source, sample)
+
+    def publish():
+        # The publishing thread keeps queuing (and dropping) while the server thread is in send()
+        for _ in range(3):
+            i = len(published)
+            source = "link" * (i % 4)  # Messages of different lengths
+            sample = {"Avg Altitude": float(i), "Vref": 3.3}
+            fanout._broadcast(encoder.encode_sample(sample, source))
+            published[encoder.seq] = (source or None, sample)
+
+    sock = _PartialSocket(per_send=37, during_send=publish)
+    client.sock = sock
+    publish()
+    for _ in range(200):
+        fanout._flush(client)
+    sock.during_send = lambda: None
+    while client.queue:
+        fanout._flush(client)
+    assert client.dropped > 0
+
+    decoder = FanoutDecoder()
+    received = decoder.feed(bytes(sock.received))
+    assert not decoder.buffer  # Every byte belonged to a whole message
+    assert decoder.unknown_fields == 0
+    assert len(received) + client.dropped == len(published)
+    for message in received:
+        assert (message.source, message.payload) == published[message.seq]
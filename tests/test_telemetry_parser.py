@@ -0,0 +1,64 @@
+import random
+import re
+from globalFuncionality.telemetry_parser import FIELD_MAP, ParseError, TelemetryParser
+
+
+def baseline_parse(raw_data, field_map=FIELD_MAP):
+    """The original SerialConnection.parse_serial_data, kept as the reference."""
+    result = {}
+    for part in raw_data.split(","):
+        part = part.strip()
+        m = re.match(r"(.+?):\s*([-+]?\d*\.?\d+)", part)
+        if m:
+            label = m.group(1).strip()
+            try:
+                value = float(m.group(2).strip())
+            except ValueError:
+                continue
+            result[field_map.get(label, label)] = value
+    if result:
+        return result
+    return f"Invalid data received: {raw_data}"
+
+
+def _random_line(rng):
+    if rng.random() < 0.5:
+        # Mostly well-formed board lines, sometimes damaged
+        labels = list(FIELD_MAP)[:rng.randint(1, 6)]  # The board's order, so layouts repeat
+        line = ", ".join(f"{label}: {rng.uniform(-1000, 1000):.{rng.randint(0, 3)}f}{rng.choice(['', ' m', ' %'])}"
+                         for label in labels)
+        if rng.random() < 0.3:
+            i = rng.randrange(len(line) + 1)
+            line = line[:i] + rng.choice([",", ":", " ", "\t", "", "x"]) + line[i + 1:]
+        return line
+    return "".join(rng.choice(" \t,:.+-0123456789abV%") for _ in range(rng.randint(0, 16)))
+
+
+def _same(parsed, expected):
+    if isinstance(parsed, ParseError):
+        return expected == str(parsed)
+    return parsed == expected
+
+
+def test_matches_baseline_parser_on_fuzzed_lines():
+    rng = random.Random(2024)
+    parser = TelemetryParser(FIELD_MAP)  # One instance, so learned layouts (the fast path) are exercised too
+    for _ in range(10000):
+        line = _random_line(rng)
+        parsed = parser.parse(line)
+        assert _same(parsed, baseline_parse(line)), line
+
+
+def test_blank_labels_are_rejected():
+    parser = TelemetryParser(FIELD_MAP)
+    assert isinstance(parser.parse("\t:+06,1"), ParseError)
+    assert parser.parse("Vref: 3.3, : 5") == {"Vref": 3.3}
+
+
+def test_parse_batch_columns():
+    parser = TelemetryParser(FIELD_MAP)
+    batch = parser.parse_batch(["Vref: 1, Vout: 2", "junk", "Vref: 3"])
+    assert batch.rows == 2
+    assert list(batch.columns["Vref"]) == [1.0, 3.0]
+    assert batch.columns["Vout"][0] == 2.0 and batch.columns["Vout"][1] != batch.columns["Vout"][1]
+    assert [e.index for e in batch.errors] == [1]
@@ -0,0 +1,44 @@
+from globalFuncionality.telemetry_store import TelemetryStore, TimeSeries
+
+
+def test_ring_wraps_at_capacity():
+    ring = TimeSeries(8)
+    for i in range(8):
+        ring.append(float(i), i * 10.0)
+    assert (ring.count, ring.total, ring.head) == (8, 8, 0)
+    assert len(ring.window(0.0).segments) == 1  # Exactly full, not yet wrapped
+    for i in range(8, 13):
+        ring.append(float(i), i * 10.0)
+    assert (ring.count, ring.total, ring.head) == (8, 13, 5)
+    assert ring.latest() == (12.0, 120.0)
+    everything = ring.window(-1.0)
+    assert len(everything.segments) == 2  # The window crosses the end of the ring
+    assert everything.times() == [float(i) for i in range(5, 13)]
+    assert everything.values() == [i * 10.0 for i in range(5, 13)]
+    assert list(ring.window(7.5)) == [(float(i), i * 10.0) for i in range(8, 13)]
+    assert ring.window(13.0).segments == []
+
+
+def test_tail_after_wrap():
+    ring = TimeSeries(4)
+    for i in range(3):
+        ring.append(float(i), float(i))
+    seen = ring.total
+    for i in range(3, 6):
+        ring.append(float(i), float(i))
+    assert ring.tail(seen).values() == [3.0, 4.0, 5.0]
+    # A reader that fell more than `capacity` points behind only gets what is left
+    assert ring.tail(0).values() == [2.0, 3.0, 4.0, 5.0]
+    assert len(ring.tail(ring.total)) == 0
+
+
+def test_store_keeps_capacity_points_per_field():
+    store = TelemetryStore(capacity=5, max_series=2)
+    for i in range(12):
+        store.append({"Vref": float(i), "Avg Altitude": i * 2.0, "Unknown": 1.0}, timestamp=100.0 + i)
+    assert store.keys() == ["Vref", "Avg Altitude"]
+    assert store.latest() == {"Vref": 11.0, "Avg Altitude": 22.0}
+    assert store.since("Avg Altitude", 0.0).values() == [14.0, 16.0, 18.0, 20.0, 22.0]
+    assert store.window("Vref", 2.0, now=111.0).times() == [109.0, 110.0, 111.0]
+    window, total = store.tail("Vref", after_total=10)
+    assert (window.values(), total) == ([10.0, 11.0], 12)